@@ -77,6 +77,7 @@ from mimiqcircuits.operations.losschannel import (
 from mimiqcircuits.operations.gates.gate import Gate
 
 from mimiqcircuits.operations.gates.custom import GateCustom
+from mimiqcircuits.operations.gates.diagonal import GateDiagonal
 
 from mimiqcircuits.operations.gates.standard.u import GateU
 from mimiqcircuits.operations.gates.standard.id import GateID
@@ -239,6 +240,7 @@ from mimiqcircuits.hamiltonian import (
     push_lietrotter,
     push_yoshidatrotter,
 )
+from mimiqcircuits.paulisum import PauliSum
 from mimiqcircuits.operations.gates.generalized.rpauli import RPauli
 from mimiqcircuits.optimization import (
     OptimizationExperiment,
@@ -269,6 +271,9 @@ from mimiqcircuits.noisemodel import (
     SetQubitReadoutNoise,
     NoiseModel,
     apply_noise_model,
+    insert_idle_delays,
+    iter_noisy_instructions,
+    NoiseModelPass,
     IdleNoise,
     CustomNoiseRule,
     OperationInstanceNoise,
@@ -288,6 +293,7 @@ from mimiqcircuits.lossmodel import (
     resolve_losses,
     sample_loss_scenario,
     lossmodel_rewrite,
+    LossSampler,
 )
 from mimiqcircuits.circuit_extras import remove_unused, remove_swaps
 from mimiqcircuits.symbolics import unwrapvalue, listsymbols, UndefinedValue
@@ -318,8 +324,10 @@ from mimiqcircuits.decomposition import (
     DecomposeIterator,
 )
 
-from mimiqcircuits.fusion import FusePass, fuse_circuit
+from mimiqcircuits.mixedunitaries import MixedUnitarySampler, RandomizedCircuitFamily
+from mimiqcircuits.fusion import FusePass, FusionCostModel, eachfused, fuse_circuit
 from mimiqcircuits.backends.concrete_passes import CanonicalDecomposePass
+from mimiqcircuits.detectorerrormodel import DetectorErrorModel, detector_error_model
 
 # needed to initialize the registers
 import mimiqcircuits.proto.circuitproto
@@ -420,6 +428,7 @@ __all__ = [
     "MeasureResetZ",
     "Gate",
     "GateCustom",
+    "GateDiagonal",
     "GateU",
     "GateID",
     "GateX",
@@ -556,6 +565,7 @@ __all__ = [
     "GATES",
     "Hamiltonian",
     "HamiltonianTerm",
+    "PauliSum",
     "push_expval",
     "push_suzukitrotter",
     "push_lietrotter",
@@ -585,6 +595,9 @@ __all__ = [
     "SetQubitReadoutNoise",
     "NoiseModel",
     "apply_noise_model",
+    "insert_idle_delays",
+    "iter_noisy_instructions",
+    "NoiseModelPass",
     "IdleNoise",
     "CustomNoiseRule",
     "OperationInstanceNoise",
@@ -602,6 +615,7 @@ __all__ = [
     "resolve_losses",
     "sample_loss_scenario",
     "lossmodel_rewrite",
+    "LossSampler",
     "SetBit1",
     "SetBit0",
     "And",
@@ -639,6 +653,13 @@ __all__ = [
     "DecomposeIterator",
     # Gate fusion
     "FusePass",
+    "MixedUnitarySampler",
+    "RandomizedCircuitFamily",
+    "FusionCostModel",
     "CanonicalDecomposePass",
     "fuse_circuit",
+    "eachfused",
+    # Detector error models
+    "DetectorErrorModel",
+    "detector_error_model",
 ]
@@ -28,6 +28,7 @@ Module map:
     CompiledCircuit subclasses + bind  -> .compiled
     AbstractPass + PassPipeline  -> .passes
     Concrete passes (RemoveSwapsPass, …)  -> .concrete_passes
+    StabilizerBackend, PauliFrameSampler  -> .stabilizer
 
 Recommended import:
 
@@ -136,6 +137,11 @@ from mimiqcircuits.backends.progress import (
 from mimiqcircuits.backends.remote import (
     MimiqRemoteBackend,
 )
+from mimiqcircuits.backends.stabilizer import (
+    StabilizerBackend,
+    StabilizerState,
+    PauliFrameSampler,
+)
 from mimiqcircuits.backends._rng_utils import (
     normalize_seed,
     derive_grid_seeds,
@@ -209,6 +215,10 @@ __all__ = [
     "to_progress",
     # remote
     "MimiqRemoteBackend",
+    # stabilizer
+    "StabilizerBackend",
+    "StabilizerState",
+    "PauliFrameSampler",
     # rng helpers
     "normalize_seed",
     "derive_grid_seeds",
@@ -662,6 +662,50 @@ def _next_loss_segment(insts, start, ls):
     return seg, None, n
 
 
+def _final_sampling_plan(circuit):
+    """Split a loss-free variant for sampling shots from one final state.
+
+    Trailing ``SetBit0`` / ``SetBit1`` whose bit nothing later touches are
+    set aside as constants, and the final measurements are split off with
+    :func:`extract_projection`. Returns ``(quantum_circuit, projection,
+    constants)``, or ``None`` when the quantum part is not unitary or still
+    writes classical bits, so its shots are not identically distributed
+    samples of a single final state.
+    """
+    import mimiqcircuits as mc
+    from mimiqcircuits.backends.measure_analysis import (
+        extract_projection,
+        needs_trajectories,
+    )
+
+    constants = {}
+    touched = set()
+    kept = []
+    for inst in reversed(circuit.instructions):
+        op = inst.operation
+        if (
+            isinstance(op, (mc.SetBit0, mc.SetBit1))
+            and inst.bits[0] not in touched
+        ):
+            constants[inst.bits[0]] = isinstance(op, mc.SetBit1)
+            continue
+        touched.update(inst.bits)
+        kept.append(inst)
+
+    rest = mc.Circuit()
+    for inst in reversed(kept):
+        rest.push(inst)
+    quantum_circuit, projection = extract_projection(rest)
+    if rest.num_bits() == 0:
+        # extract_projection reads every qubit when there is no register
+        projection = mc.Circuit()
+    if needs_trajectories(quantum_circuit):
+        return None
+    if any(inst.bits for inst in quantum_circuit.instructions):
+        return None
+    return quantum_circuit, projection, constants
+
+
 class LocalBackend(Backend):
     """Base class for simulators that run in the local process.
 
@@ -687,6 +731,9 @@ class LocalBackend(Backend):
     - :meth:`recompile_per_trajectory` — predicate; default returns
       ``True`` iff the circuit contains a mixed-unitary Kraus
       channel.
+    - :meth:`group_loss_patterns` — predicate; default ``True``:
+      shots sharing a loss pattern share one evolution when the
+      variant allows it.
     - :meth:`bind` — substitute parameters into a parametric
       compile artifact (default: re-compile after substitution).
     """
@@ -728,6 +775,18 @@ class LocalBackend(Backend):
         from mimiqcircuits.backends.measure_analysis import any_mixed_unitary
         return any_mixed_unitary(circuit)
 
+    def group_loss_patterns(self) -> bool:
+        """Whether loss sampling groups shots by loss pattern.
+
+        When ``True`` (the default), :meth:`execute` draws the loss
+        pattern of every shot first, and evolves each distinct variant
+        once, drawing all of its shots from the final state, whenever
+        the variant has no non-unitary operation before its final
+        measurements. Override to return ``False`` to evolve every shot
+        separately.
+        """
+        return True
+
     def bind(self, compiled: CompiledParametricCircuit, params: dict
              ) -> CompiledCircuit:
         """Substitute ``params`` into a parametric compiled circuit.
@@ -1239,12 +1298,25 @@ class LocalBackend(Backend):
             else self.compile_progress(processed_circuit, progress)
         )
 
+        # A per-shot recompile exists to expose fresh mixed-unitary
+        # branches. Draw the branches of every shot up front in one batch
+        # and compile each shot's resolved circuit, so `compile` sees no
+        # mixed-unitary channel left to sample.
+        sampler = choices = None
+        if recompile:
+            from mimiqcircuits.mixedunitaries import MixedUnitarySampler
+            sampler = MixedUnitarySampler(processed_circuit)
+            if sampler.num_channels:
+                choices = sampler.sample(nsamples, rng=rngs.trajectory)
+
         # The trajectory loop owns the only live bar; the per-shot
         # execution detail is left unwrapped to keep it the single bar.
         bar = progress.stage("trajectories", total=nsamples)
         t_apply_total = 0.0
-        for _ in range(nsamples):
-            if recompile:
+        for k in range(nsamples):
+            if choices is not None:
+                compiled = self.compile(sampler.circuit_for(choices[k]))
+            elif recompile:
                 compiled = self.compile(processed_circuit)
             prepared = self.prepare_trajectory(compiled, rngs.trajectory)
             state = self.build_state(nq, nb, nz)
@@ -1271,8 +1343,16 @@ class LocalBackend(Backend):
     ):
         """Method-1 loss resolution: a fresh loss pattern per shot, resolved
         into a primitive (loss-free) circuit variant, then evolved.
+
+        The loss structure is compiled once into a :class:`LossSampler`, so
+        a shot only draws its loss pattern. Variants and their compiled
+        artifacts are cached by pattern, unless :meth:`recompile_per_trajectory`
+        asks for a fresh compilation every trajectory. With
+        :meth:`group_loss_patterns`, the patterns of all shots are drawn up
+        front and shots sharing a pattern share one evolution, see
+        :meth:`_execute_loss_groups`.
         """
-        from mimiqcircuits import resolve_losses
+        from mimiqcircuits import LossSampler
 
         progress = progress if progress is not None else NoProgress()
         nq = max(processed_circuit.num_qubits(), num_qubits or 0)
@@ -1280,11 +1360,29 @@ class LocalBackend(Backend):
         nz = processed_circuit.num_zvars()
         num_2q = self._count_two_qubit_gates(processed_circuit)
 
+        sampler = LossSampler(processed_circuit)
+        recompile = self.recompile_per_trajectory(processed_circuit)
+
         bar = progress.stage("trajectories", total=nsamples)
+        if self.group_loss_patterns() and not recompile:
+            self._execute_loss_groups(
+                sampler, nsamples, rngs, callback, stopped,
+                (nq, nb, nz), num_2q, results, bar,
+            )
+            bar.finish()
+            return
+
+        compiled_variants = {}
         t_apply_total = 0.0
         for _ in range(nsamples):
-            sampled = resolve_losses(processed_circuit, rng=rngs.trajectory)
-            compiled = self.compile(sampled)
+            pattern = sampler.sample_pattern(rngs.trajectory)
+            if recompile:
+                compiled = self.compile(sampler.variant(pattern, rngs.trajectory))
+            else:
+                compiled = compiled_variants.get(pattern)
+                if compiled is None:
+                    compiled = self.compile(sampler.variant(pattern, rngs.trajectory))
+                    compiled_variants[pattern] = compiled
             prepared = self.prepare_trajectory(compiled, rngs.trajectory)
             state = self.build_state(nq, nb, nz)
             t0 = time.time()
@@ -1304,6 +1402,91 @@ class LocalBackend(Backend):
         bar.finish()
         results.timings["apply"] = t_apply_total
 
+    def _execute_loss_groups(
+        self, sampler, nsamples, rngs, callback, stopped,
+        dims, num_2q, results, bar,
+    ):
+        """Loss sampling with one evolution per distinct loss pattern.
+
+        Shots are grouped by pattern. A variant whose quantum part is
+        unitary up to its final measurements (see
+        :func:`_final_sampling_plan`) is evolved once and its shots are
+        sampled from the final state; any other variant is evolved once
+        per shot. Results are reported in shot order.
+        """
+        from mimiqcircuits.backends.measure_analysis import evaluate_projection
+        import mimiqcircuits as mc
+
+        nq, nb, nz = dims
+        groups = {}
+        for k in range(nsamples):
+            groups.setdefault(sampler.sample_pattern(rngs.trajectory), []).append(k)
+
+        fidelities = [None] * nsamples
+        cstates = [None] * nsamples
+        zstates = [None] * nsamples
+        t_apply_total = 0.0
+        for pattern, shots in groups.items():
+            variant = sampler.variant(pattern, rngs.trajectory)
+            plan = _final_sampling_plan(variant) if len(shots) > 1 else None
+            if plan is None:
+                compiled = self.compile(variant)
+                for k in shots:
+                    prepared = self.prepare_trajectory(compiled, rngs.trajectory)
+                    state = self.build_state(nq, nb, nz)
+                    t0 = time.time()
+                    state, fid = self.evolve(
+                        state, prepared,
+                        rng=rngs.noise, callback=callback, stopped=stopped,
+                    )
+                    t_apply_total += time.time() - t0
+                    fidelities[k] = as_lower_bound(_to_fidelity(fid))
+                    if nb > 0:
+                        cstates[k] = state.classical_bits
+                    if nz > 0:
+                        zstates[k] = state.complex_values
+                    bar.step()
+                continue
+
+            quantum_circuit, projection, constants = plan
+            compiled = self.compile(quantum_circuit)
+            prepared = self.prepare_trajectory(compiled, rngs.trajectory)
+            state = self.build_state(
+                max(nq, projection.num_qubits()),
+                max(nb, projection.num_bits()), nz,
+            )
+            t0 = time.time()
+            state, fid = self.evolve(
+                state, prepared,
+                rng=rngs.noise, callback=callback, stopped=stopped,
+            )
+            t_apply_total += time.time() - t0
+            scalar = as_lower_bound(_to_fidelity(fid))
+            samples = state.sample(len(shots), rngs.shot) if nb > 0 else ()
+            zs = state.complex_values if nz > 0 else None
+            for i, k in enumerate(shots):
+                fidelities[k] = scalar
+                if nb > 0:
+                    raw = evaluate_projection(projection, samples[i])
+                    cstate = mc.BitString(nb)
+                    for b in range(min(nb, len(raw))):
+                        cstate[b] = raw[b]
+                    for b, value in constants.items():
+                        cstate[b] = value
+                    cstates[k] = cstate
+                if nz > 0:
+                    zstates[k] = zs
+            bar.step(len(shots))
+
+        for scalar in fidelities:
+            results.fidelities.append(scalar)
+            results.avggateerrors.append(self._avg_gate_error(scalar, num_2q))
+        if nb > 0:
+            results.cstates.extend(cstates)
+        if nz > 0:
+            results.zstates.extend(zstates)
+        results.timings["apply"] = t_apply_total
+
     def _execute_runtime_loss(
         self, processed_circuit, nsamples, rngs,
         callback, stopped, num_qubits, results, progress=None,
@@ -475,6 +475,19 @@ class MimiqRemoteBackend(RemoteBackend):
                         "ApplyNoiseModelPass in passes=, not both."
                     )
 
+        # A pass whose spec cannot be serialized (e.g. a NoiseModelPass
+        # with callable durations) cannot be described to the server.
+        if passes is not None:
+            for p in passes:
+                spec = p.spec()
+                serializable = dict(spec.parameters).get("serializable")
+                if serializable is not None and not serializable.value:
+                    raise ValueError(
+                        f"Pass {spec.name!r} cannot be sent to a remote "
+                        "backend: its parameters are not serializable "
+                        "(e.g. callable durations; use a dict instead)."
+                    )
+
         # Re-run the strict-order check inside submit() so direct
         # `submit()` callers (bypassing `execute()`) cannot smuggle
         # an ordered pipeline past the guard.
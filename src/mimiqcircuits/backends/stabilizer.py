@@ -0,0 +1,844 @@
+#
+# Copyright © 2023-2025 QPerfect. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""Stabilizer simulation of Clifford circuits with Pauli noise.
+
+Two engines share one compiled program:
+
+- :class:`StabilizerState` holds an Aaronson–Gottesman tableau and runs one
+  shot at a time; it backs :meth:`StabilizerBackend.evolve`.
+- :class:`PauliFrameSampler` runs the noiseless circuit once on a tableau to
+  get a reference sample, then propagates the Pauli-frame difference of every
+  shot at once. Frames are bit-packed, 64 shots per ``uint64`` word, so a
+  Clifford gate is a few word-wise XORs over all shots and a noise channel
+  only touches the shots it hits.
+
+Clifford gates are not listed by hand: the action of any gate on the Pauli
+group is read off its matrix once and cached, so every gate of
+:class:`~mimiqcircuits.decomposition.StimBasis` (and any other Clifford gate)
+is supported. Noise channels must be mixed unitaries of Pauli operators, such
+as ``PauliX``, ``Depolarizing1`` or ``PauliNoise``.
+"""
+
+from __future__ import annotations
+
+import random
+import time
+import numpy as np
+
+import mimiqcircuits as mc
+from mimiqcircuits.backends.backend import LocalBackend, State
+from mimiqcircuits.backends.compiled import DefaultCompiledCircuit
+from mimiqcircuits.backends.fidelity import ExactFidelity
+
+
+# ── Pauli and Clifford tables ─────────────────────────────────────────────────
+#
+# A k-qubit Pauli is encoded as the integer e with bit 2j = x_j and bit 2j+1 =
+# z_j for the j-th qubit of the gate; (x, z) = (1, 1) stands for Y, so every
+# encoded Pauli is Hermitian.
+
+_PAULI_1Q = {
+    (0, 0): np.eye(2, dtype=complex),
+    (1, 0): np.array([[0, 1], [1, 0]], dtype=complex),
+    (1, 1): np.array([[0, -1j], [1j, 0]], dtype=complex),
+    (0, 1): np.array([[1, 0], [0, -1]], dtype=complex),
+}
+
+_PAULI_LETTERS = {"I": (0, 0), "X": (1, 0), "Y": (1, 1), "Z": (0, 1)}
+
+# Largest gate whose Pauli action is tabulated from its matrix.
+_MAX_TABLE_QUBITS = 4
+
+_MASK64 = np.uint64(0xFFFFFFFFFFFFFFFF)
+
+
+def _pauli_matrix(e, k):
+    """Matrix of the encoded ``k``-qubit Pauli ``e`` (first qubit most significant)."""
+    m = np.ones((1, 1), dtype=complex)
+    for j in range(k):
+        m = np.kron(m, _PAULI_1Q[(e >> 2 * j) & 1, (e >> 2 * j + 1) & 1])
+    return m
+
+
+def _identify_pauli(m, k):
+    """``(e, phase)`` with ``m == phase * P_e``, or ``None`` if ``m`` is no Pauli."""
+    dim = 1 << k
+    for e in range(1 << 2 * k):
+        overlap = np.vdot(_pauli_matrix(e, k), m) / dim
+        if abs(abs(overlap) - 1.0) < 1e-8:
+            if np.allclose(m, overlap * _pauli_matrix(e, k), atol=1e-8):
+                return e, overlap
+            return None
+    return None
+
+
+def _numeric_matrix(op):
+    try:
+        return np.asarray(op.unwrappedmatrix(), dtype=complex)
+    except Exception:
+        try:
+            return np.array(op.matrix().tolist(), dtype=complex)
+        except (TypeError, RuntimeError) as e:
+            raise ValueError(f"{op} has no numeric matrix") from e
+
+
+class _CliffordTable:
+    """Action of a ``k``-qubit Clifford ``U`` on the Pauli group.
+
+    ``image[e]`` and ``sign[e]`` give ``U P_e U^dagger = (-1)^sign P_image``.
+    ``rows[o]`` lists the input bits whose images carry output bit ``o``; the
+    map is linear over GF(2) once signs are dropped, which is all a Pauli
+    frame needs.
+    """
+
+    def __init__(self, matrix, k):
+        n = 1 << 2 * k
+        image = np.zeros(n, dtype=np.int64)
+        sign = np.zeros(n, dtype=bool)
+        dag = matrix.conj().T
+        for e in range(n):
+            found = _identify_pauli(matrix @ _pauli_matrix(e, k) @ dag, k)
+            if found is None or abs(found[1].imag) > 1e-8:
+                raise ValueError("not a Clifford gate")
+            image[e] = found[0]
+            sign[e] = found[1].real < 0
+
+        self.k = k
+        self.sign = sign
+        self.newx = np.array([[(v >> 2 * j) & 1 for j in range(k)] for v in image], dtype=bool)
+        self.newz = np.array([[(v >> 2 * j + 1) & 1 for j in range(k)] for v in image], dtype=bool)
+        self.rows = [
+            [i for i in range(2 * k) if (image[1 << i] >> o) & 1]
+            for o in range(2 * k)
+        ]
+
+
+_TABLES = {}
+
+_STANDARD_GATES = "mimiqcircuits.operations.gates.standard."
+
+
+def _clifford_table(op, inverse=False):
+    """Cached :class:`_CliffordTable` of ``op`` (or of its inverse); raises
+    ``ValueError`` if ``op`` is not Clifford."""
+    # Only a parameterless standard gate is fixed by its type and size;
+    # custom, diagonal and wrapper gates (Control, Power, ...) carry their
+    # action in their arguments and are keyed by their matrix.
+    if type(op).__module__.startswith(_STANDARD_GATES) and not op.getparams():
+        key = (type(op), op.num_qubits, inverse)
+    else:
+        matrix = _numeric_matrix(op)
+        key = (type(op), inverse, matrix.shape, np.round(matrix, 12).tobytes())
+    table = _TABLES.get(key)
+    if table is None:
+        k = op.num_qubits
+        if k > _MAX_TABLE_QUBITS:
+            raise ValueError(f"{op} is too large to tabulate")
+        matrix = _numeric_matrix(op)
+        if inverse:
+            matrix = matrix.conj().T
+        table = _TABLES[key] = _CliffordTable(matrix, k)
+    return table
+
+
+def _pauli_bits(gate):
+    """``(x, z)`` bit tuples of a Pauli gate, or ``None``."""
+    k = gate.num_qubits
+    if isinstance(gate, mc.PauliString):
+        bits = [_PAULI_LETTERS[c] for c in gate.pauli]
+    else:
+        try:
+            found = _identify_pauli(_numeric_matrix(gate), k)
+        except ValueError:
+            return None
+        if found is None:
+            return None
+        e = found[0]
+        bits = [((e >> 2 * j) & 1, (e >> 2 * j + 1) & 1) for j in range(k)]
+    return tuple(x for x, _ in bits), tuple(z for _, z in bits)
+
+
+class _PauliChannel:
+    """A mixed-unitary channel whose branches are all Pauli operators.
+
+    ``p_hit`` is the probability of a non-identity branch; ``cum_hit`` the
+    cumulative probabilities of the non-identity branches given a hit, and
+    ``hx``/``hz`` their ``(branch, qubit)`` flip bits.
+    """
+
+    def __init__(self, op):
+        try:
+            cum = np.asarray(op.unwrappedcumprobabilities(), dtype=np.float64)
+        except (TypeError, RuntimeError) as e:
+            raise ValueError(f"{op} has symbolic probabilities") from e
+        probs = np.diff(cum, prepend=0.0)
+        xs, zs, ps = [], [], []
+        for p, gate in zip(probs, op.unitarygates()):
+            bits = _pauli_bits(gate)
+            if bits is None:
+                raise ValueError(f"{op} is not a Pauli channel")
+            if any(bits[0]) or any(bits[1]):
+                xs.append(bits[0])
+                zs.append(bits[1])
+                ps.append(p)
+
+        self.cum = cum
+        self.gates = [_pauli_bits(g) for g in op.unitarygates()]
+        ps = np.asarray(ps, dtype=np.float64)
+        total = float(ps.sum())
+        self.p_hit = min(total, 1.0)
+        self.cum_hit = np.cumsum(ps) / total if total > 0 else ps
+        k = op.num_qubits
+        self.hx = np.asarray(xs, dtype=bool).reshape(-1, k)
+        self.hz = np.asarray(zs, dtype=bool).reshape(-1, k)
+
+
+# ── compilation ───────────────────────────────────────────────────────────────
+
+_BASES = None
+
+
+def _bases():
+    """Bases of the measurement, measure-reset and reset types, by type."""
+    global _BASES
+    if _BASES is None:
+        _BASES = (
+            {mc.Measure: "Z", mc.MeasureZ: "Z", mc.MeasureX: "X", mc.MeasureY: "Y"},
+            {
+                mc.MeasureReset: "Z", mc.MeasureResetZ: "Z",
+                mc.MeasureResetX: "X", mc.MeasureResetY: "Y",
+            },
+            {mc.Reset: "Z", mc.ResetZ: "Z", mc.ResetX: "X", mc.ResetY: "Y"},
+        )
+    return _BASES
+
+
+class StabilizerProgram:
+    """A circuit lowered to stabilizer steps, as returned by
+    :meth:`StabilizerBackend.compile`.
+
+    Each step is a tuple whose first entry is its kind:
+    ``("gate", qubits, table, op)``, ``("noise", qubits, channel)``,
+    ``("measure", basis, qubit, bit)``, ``("reset", basis, qubit)``,
+    ``("detector", bits)`` and ``("observable", index, bits)``.
+
+    Raises:
+        ValueError: If the circuit has an operation that is not a Clifford
+            gate, a Pauli channel, a Pauli-basis measurement or reset, or an
+            annotation.
+    """
+
+    def __init__(self, circuit):
+        self.steps = []
+        self.num_qubits = circuit.num_qubits()
+        self.num_bits = circuit.num_bits()
+        self.num_measurements = 0
+        self.num_detectors = 0
+        self.num_observables = 0
+        self._channels = {}
+        for inst in circuit:
+            self._lower(inst)
+
+    def _lower(self, inst):
+        op = inst.operation
+        qubits = tuple(inst.qubits)
+        kind = type(op)
+        measures, measureresets, resets = _bases()
+
+        basis = measures.get(kind) or measureresets.get(kind)
+        if basis is not None:
+            self.steps.append(("measure", basis, qubits[0], inst.bits[0]))
+            self.num_measurements += 1
+            if kind in measureresets:
+                self.steps.append(("reset", basis, qubits[0]))
+            return
+        if kind in resets:
+            self.steps.append(("reset", resets[kind], qubits[0]))
+            return
+        if isinstance(op, mc.Detector):
+            self.steps.append(("detector", tuple(inst.bits)))
+            self.num_detectors += 1
+            return
+        if isinstance(op, mc.ObservableInclude):
+            index = op.notes[0] if op.notes else 0
+            self.steps.append(("observable", index, tuple(inst.bits)))
+            self.num_observables = max(self.num_observables, index + 1)
+            return
+        if isinstance(op, (mc.AbstractAnnotation, mc.Barrier)):
+            return
+
+        if isinstance(op, mc.Gate):
+            if op.isidentity():
+                return
+            if op.num_qubits <= _MAX_TABLE_QUBITS:
+                try:
+                    table = _clifford_table(op)
+                except ValueError:
+                    table = None
+                if table is not None:
+                    self.steps.append(("gate", qubits, table, op))
+                    return
+            if not op.iswrapper():
+                raise ValueError(f"{op} is not a Clifford gate")
+
+        if isinstance(op, mc.krauschannel) and op.ismixedunitary():
+            channel = self._channels.get(id(op))
+            if channel is None:
+                channel = self._channels[id(op)] = (op, _PauliChannel(op))
+            if channel[1].p_hit > 0:
+                self.steps.append(("noise", qubits, channel[1]))
+            return
+
+        # Classical control reports itself as a wrapper, but decomposes to
+        # another IfStatement and would be lowered forever.
+        if isinstance(op, mc.IfStatement):
+            raise ValueError(f"Stabilizer simulation does not support {op}")
+
+        if op.iswrapper() or isinstance(op, mc.Block):
+            decomposed = list(inst.decompose())
+            if (
+                len(decomposed) == 1
+                and type(decomposed[0].operation) is type(op)
+                and str(decomposed[0]) == str(inst)
+            ):
+                raise ValueError(f"Stabilizer simulation does not support {op}")
+            for sub in decomposed:
+                self._lower(sub)
+            return
+
+        raise ValueError(f"Stabilizer simulation does not support {op}")
+
+
+# ── tableau ───────────────────────────────────────────────────────────────────
+
+
+def _phase_sum(x1, z1, x2, z2):
+    """Sum over qubits of the Aaronson–Gottesman ``g`` exponent, for
+    multiplying Pauli ``(x1, z1)`` onto ``(x2, z2)``."""
+    x1 = x1.astype(np.int8)
+    z1 = z1.astype(np.int8)
+    x2 = x2.astype(np.int8)
+    z2 = z2.astype(np.int8)
+    g = (
+        x1 * z1 * (z2 - x2)
+        + x1 * (1 - z1) * z2 * (2 * x2 - 1)
+        + (1 - x1) * z1 * x2 * (1 - 2 * z2)
+    )
+    return g.sum(axis=-1, dtype=np.int64)
+
+
+class _Tableau:
+    """Aaronson–Gottesman tableau: rows ``0..n-1`` destabilizers, ``n..2n-1``
+    stabilizers, each a signed Pauli string."""
+
+    def __init__(self, n):
+        self.n = n
+        self.x = np.zeros((2 * n, n), dtype=bool)
+        self.z = np.zeros((2 * n, n), dtype=bool)
+        self.r = np.zeros(2 * n, dtype=bool)
+        idx = np.arange(n)
+        self.x[idx, idx] = True
+        self.z[n + idx, idx] = True
+
+    def copy(self):
+        other = _Tableau.__new__(_Tableau)
+        other.n = self.n
+        other.x = self.x.copy()
+        other.z = self.z.copy()
+        other.r = self.r.copy()
+        return other
+
+    def apply(self, table, qubits):
+        qubits = list(qubits)
+        e = np.zeros(2 * self.n, dtype=np.int64)
+        for j, q in enumerate(qubits):
+            e |= self.x[:, q].astype(np.int64) << 2 * j
+            e |= self.z[:, q].astype(np.int64) << 2 * j + 1
+        self.x[:, qubits] = table.newx[e]
+        self.z[:, qubits] = table.newz[e]
+        self.r ^= table.sign[e]
+
+    def measure_z(self, a, draw):
+        """Measure qubit ``a`` in the Z basis; ``draw()`` picks a random outcome."""
+        n = self.n
+        x, z, r = self.x, self.z, self.r
+        hits = np.flatnonzero(x[n:, a])
+        if hits.size:
+            p = n + hits[0]
+            rows = np.flatnonzero(x[:, a])
+            rows = rows[rows != p]
+            if rows.size:
+                phase = 2 * r[rows] + 2 * r[p] + _phase_sum(x[p], z[p], x[rows], z[rows])
+                r[rows] = phase % 4 == 2
+                x[rows] ^= x[p]
+                z[rows] ^= z[p]
+            x[p - n] = x[p]
+            z[p - n] = z[p]
+            r[p - n] = r[p]
+            x[p] = False
+            z[p] = False
+            z[p, a] = True
+            outcome = bool(draw())
+            r[p] = outcome
+            return outcome
+
+        sx = np.zeros(n, dtype=bool)
+        sz = np.zeros(n, dtype=bool)
+        sr = 0
+        for i in np.flatnonzero(x[:n, a]):
+            row = n + i
+            sr = (2 * sr + 2 * r[row] + _phase_sum(x[row], z[row], sx, sz)) % 4 // 2
+            sx ^= x[row]
+            sz ^= z[row]
+        return bool(sr)
+
+    def measure(self, basis, a, draw):
+        if basis == "Z":
+            return self.measure_z(a, draw)
+        before, after = _BASIS_CHANGE[basis]
+        for table in before():
+            self.apply(table, (a,))
+        outcome = self.measure_z(a, draw)
+        for table in after():
+            self.apply(table, (a,))
+        return outcome
+
+    def reset(self, basis, a, draw):
+        if self.measure_z(a, draw):
+            self.apply(_clifford_table(mc.GateX()), (a,))
+        if basis != "Z":
+            for table in _BASIS_CHANGE[basis][1]():
+                self.apply(table, (a,))
+
+
+# Gates mapping the X / Y eigenbasis to Z (before) and back (after).
+_BASIS_CHANGE = {
+    "X": (
+        lambda: [_clifford_table(mc.GateH())],
+        lambda: [_clifford_table(mc.GateH())],
+    ),
+    "Y": (
+        lambda: [_clifford_table(mc.GateSDG()), _clifford_table(mc.GateH())],
+        lambda: [_clifford_table(mc.GateH()), _clifford_table(mc.GateS())],
+    ),
+}
+
+
+def _run_tableau(tableau, program, bits, draw, pick):
+    """Run ``program`` on ``tableau``; ``pick(channel)`` returns the branch
+    bits of a noise channel or ``None`` to skip noise. Returns the outcome of
+    every measurement in order."""
+    outcomes = []
+    for step in program.steps:
+        kind = step[0]
+        if kind == "gate":
+            tableau.apply(step[2], step[1])
+        elif kind == "measure":
+            outcome = tableau.measure(step[1], step[2], draw)
+            outcomes.append(outcome)
+            if bits is not None:
+                bits[step[3]] = outcome
+        elif kind == "reset":
+            tableau.reset(step[1], step[2], draw)
+        elif kind == "noise":
+            branch = pick(step[2])
+            if branch is None:
+                continue
+            for q, bx, bz in zip(step[1], *branch):
+                if bx or bz:
+                    tableau.apply(_clifford_table(_PAULI_GATE[bx, bz]()), (q,))
+    return outcomes
+
+
+_PAULI_GATE = {
+    (1, 0): lambda: mc.GateX(),
+    (1, 1): lambda: mc.GateY(),
+    (0, 1): lambda: mc.GateZ(),
+}
+
+
+class StabilizerState(State):
+    """Stabilizer state of :class:`StabilizerBackend`: a tableau plus the
+    classical register."""
+
+    def __init__(self, nq, nb=0, nz=0):
+        self._tableau = _Tableau(nq)
+        self._bits = [False] * nb
+        self._nz = nz
+
+    @property
+    def num_qubits(self):
+        return self._tableau.n
+
+    @property
+    def num_bits(self):
+        return len(self._bits)
+
+    @property
+    def num_zvars(self):
+        return self._nz
+
+    @property
+    def classical_bits(self):
+        return mc.BitString(list(self._bits))
+
+    @property
+    def complex_values(self):
+        return [complex(0)] * self._nz
+
+    def amplitude(self, bs):
+        raise NotImplementedError("StabilizerState does not compute amplitudes")
+
+    def sample(self, nsamples, rng=None, *, seed=None):
+        if rng is not None and seed is not None:
+            raise TypeError("`rng` and `seed` are mutually exclusive")
+        if rng is None:
+            rng = random.Random(seed) if seed is not None else random.Random()
+        n = self._tableau.n
+        samples = []
+        for _ in range(nsamples):
+            t = self._tableau.copy()
+            samples.append(
+                mc.BitString([t.measure_z(q, lambda: rng.random() < 0.5) for q in range(n)])
+            )
+        return samples
+
+
+# ── Pauli-frame sampler ───────────────────────────────────────────────────────
+
+
+def _random_words(gen, shape):
+    return gen.integers(0, _MASK64, size=shape, dtype=np.uint64, endpoint=True)
+
+
+def _sample_hits(gen, n, p):
+    """Sorted indices of the shots in ``range(n)`` hit with probability ``p``.
+
+    Small probabilities draw the gaps between hits instead of one number per
+    shot.
+    """
+    if p <= 0.0 or n == 0:
+        return np.empty(0, dtype=np.int64)
+    if p >= 0.2:
+        return np.flatnonzero(gen.random(n) < p)
+    chunks = []
+    pos = -1
+    while True:
+        gaps = gen.geometric(p, size=int(p * (n - pos) * 1.2) + 16)
+        idx = pos + np.cumsum(gaps)
+        if idx[-1] >= n:
+            chunks.append(idx[idx < n])
+            break
+        chunks.append(idx)
+        pos = int(idx[-1])
+    return np.concatenate(chunks)
+
+
+def _flip(words, shots):
+    """XOR bit ``s`` of ``words`` for every shot ``s`` in ``shots`` (unique)."""
+    if shots.size:
+        np.bitwise_xor.at(
+            words, shots >> 6, np.left_shift(np.uint64(1), (shots & 63).astype(np.uint64))
+        )
+
+
+def _propagate(fx, fz, table, qubits):
+    """Conjugate packed Pauli frames ``(fx, fz)`` by the gate of ``table``."""
+    src = []
+    for q in qubits:
+        src.append(fx[q])
+        src.append(fz[q])
+    out = []
+    for inputs in table.rows:
+        acc = np.zeros(fx.shape[1], dtype=np.uint64)
+        for i in inputs:
+            acc ^= src[i]
+        out.append(acc)
+    for j, q in enumerate(qubits):
+        fx[q] = out[2 * j]
+        fz[q] = out[2 * j + 1]
+
+
+def _unpack(words, shots):
+    """``(m, W)`` packed words as an ``(shots, m)`` boolean array."""
+    if words.shape[0] == 0:
+        return np.zeros((shots, 0), dtype=bool)
+    raw = np.ascontiguousarray(words, dtype="<u8").view(np.uint8)
+    bits = np.unpackbits(raw, axis=1, bitorder="little")[:, :shots]
+    return bits.T.astype(bool)
+
+
+class PauliFrameSampler:
+    """Sample many shots of a Clifford circuit with Pauli noise at once.
+
+    The noiseless circuit is simulated once on a tableau to fix a reference
+    outcome for every measurement. Each shot then only tracks the Pauli
+    frame by which its noisy run differs from the reference, as bit-packed
+    X and Z masks per qubit; a measurement reports the reference outcome
+    flipped by the frame. Random measurement outcomes come out right
+    because the Z part of the frame is randomized at the start and after
+    every measurement and reset.
+
+    Detectors and observables are reported, as in Stim, relative to the
+    reference: a detector fires when the parity of its bits differs from
+    the noiseless parity.
+
+    Args:
+        circuit: Circuit of Clifford gates, Pauli channels, Pauli-basis
+            measurements and resets, and annotations, or a compiled
+            :class:`StabilizerProgram`.
+
+    Examples:
+        >>> import numpy as np
+        >>> from mimiqcircuits import *
+        >>> from mimiqcircuits.backends.stabilizer import PauliFrameSampler
+        >>> c = Circuit()
+        >>> _ = c.push(GateH(), 0)
+        >>> _ = c.push(GateCX(), 0, 1)
+        >>> _ = c.push(Measure(), 0, 0)
+        >>> _ = c.push(Measure(), 1, 1)
+        >>> _ = c.push(Detector(2), 0, 1)
+        >>> sampler = PauliFrameSampler(c)
+        >>> bits = sampler.sample(1000, rng=np.random.default_rng(1))
+        >>> bool((bits[:, 0] == bits[:, 1]).all()), bool(400 < bits[:, 0].sum() < 600)
+        (True, True)
+        >>> detectors, observables = sampler.sample_detectors(1000)
+        >>> int(detectors.sum()), observables.shape
+        (0, (1000, 0))
+    """
+
+    def __init__(self, circuit):
+        program = circuit if isinstance(circuit, StabilizerProgram) else StabilizerProgram(circuit)
+        self.program = program
+        self.reference = _run_tableau(
+            _Tableau(program.num_qubits), program, None, lambda: False, lambda ch: None
+        )
+
+    @property
+    def num_detectors(self):
+        return self.program.num_detectors
+
+    @property
+    def num_observables(self):
+        return self.program.num_observables
+
+    def _run(self, shots, rng):
+        from mimiqcircuits.mixedunitaries import _as_generator
+
+        gen = _as_generator(rng)
+        prog = self.program
+        words = (shots + 63) // 64
+        n = prog.num_qubits
+        fx = np.zeros((n, words), dtype=np.uint64)
+        fz = _random_words(gen, (n, words))
+        flips = np.zeros((prog.num_bits, words), dtype=np.uint64)
+        refbits = np.zeros(prog.num_bits, dtype=bool)
+        detectors = []
+        observables = np.zeros((prog.num_observables, words), dtype=np.uint64)
+        m = 0
+
+        for step in prog.steps:
+            kind = step[0]
+            if kind == "gate":
+                _propagate(fx, fz, step[2], step[1])
+            elif kind == "noise":
+                channel = step[2]
+                hits = _sample_hits(gen, shots, channel.p_hit)
+                if not hits.size:
+                    continue
+                branch = np.searchsorted(channel.cum_hit, gen.random(hits.size), side="right")
+                branch = np.minimum(branch, channel.cum_hit.size - 1)
+                for j, q in enumerate(step[1]):
+                    _flip(fx[q], hits[channel.hx[branch, j]])
+                    _flip(fz[q], hits[channel.hz[branch, j]])
+            elif kind == "measure":
+                basis, q, b = step[1], step[2], step[3]
+                if basis == "Z":
+                    flips[b] = fx[q]
+                    fz[q] = _random_words(gen, words)
+                elif basis == "X":
+                    flips[b] = fz[q]
+                    fx[q] = _random_words(gen, words)
+                else:
+                    flips[b] = fx[q] ^ fz[q]
+                    r = _random_words(gen, words)
+                    fx[q] ^= r
+                    fz[q] ^= r
+                refbits[b] = self.reference[m]
+                m += 1
+            elif kind == "reset":
+                basis, q = step[1], step[2]
+                r = _random_words(gen, words)
+                if basis == "Z":
+                    fx[q] = 0
+                    fz[q] = r
+                elif basis == "X":
+                    fx[q] = r
+                    fz[q] = 0
+                else:
+                    fx[q] = r
+                    fz[q] = r
+            elif kind == "detector":
+                acc = np.zeros(words, dtype=np.uint64)
+                for b in step[1]:
+                    acc ^= flips[b]
+                detectors.append(acc)
+            elif kind == "observable":
+                for b in step[2]:
+                    observables[step[1]] ^= flips[b]
+
+        detectors = np.array(detectors, dtype=np.uint64).reshape(-1, words)
+        return flips, refbits, detectors, observables
+
+    def sample(self, shots, rng=None):
+        """Classical bits of ``shots`` shots.
+
+        Args:
+            shots: Number of shots.
+            rng (optional): ``numpy.random.Generator``, ``random.Random`` or
+                seed.
+
+        Returns:
+            numpy.ndarray: ``(shots, num_bits)`` boolean array.
+        """
+        flips, refbits, _, _ = self._run(int(shots), rng)
+        return _unpack(flips, int(shots)) ^ refbits
+
+    def sample_detectors(self, shots, rng=None):
+        """Detector and observable flips of ``shots`` shots.
+
+        Returns:
+            tuple: ``(detectors, observables)`` boolean arrays of shapes
+            ``(shots, num_detectors)`` and ``(shots, num_observables)``.
+        """
+        _, _, detectors, observables = self._run(int(shots), rng)
+        return _unpack(detectors, int(shots)), _unpack(observables, int(shots))
+
+
+# ── backend ───────────────────────────────────────────────────────────────────
+
+
+class StabilizerBackend(LocalBackend):
+    """Local stabilizer simulator for Clifford circuits with Pauli noise.
+
+    :meth:`execute` samples all shots at once with a
+    :class:`PauliFrameSampler`, whatever the mix of mid-circuit measurements,
+    resets and noise. :meth:`evolve` runs a single shot on a tableau, for the
+    generic drivers. :meth:`sample_detectors` returns the detector and
+    observable flips of QEC circuits as arrays.
+
+    Examples:
+        >>> from mimiqcircuits import *
+        >>> from mimiqcircuits.backends import StabilizerBackend
+        >>> c = Circuit()
+        >>> _ = c.push(GateX(), 0)
+        >>> _ = c.push(Measure(), 0, 0)
+        >>> res = StabilizerBackend().execute(c, nsamples=3, seed=1)
+        >>> res.cstates
+        [bs"1", bs"1", bs"1"]
+    """
+
+    @property
+    def name(self):
+        return "Stabilizer"
+
+    @property
+    def version(self):
+        return mc.__version__
+
+    def capabilities(self):
+        return {
+            "sampling", "classical_bits", "midcircuit_measure",
+            "midcircuit_reset", "reset_after_measure", "noise",
+        }
+
+    def build_state(self, nq, nb=0, nz=0, **kwargs):
+        return StabilizerState(nq, nb, nz)
+
+    def compile(self, circuit):
+        return DefaultCompiledCircuit(StabilizerProgram(circuit))
+
+    def recompile_per_trajectory(self, circuit):
+        # noise branches are drawn inside evolve
+        return False
+
+    def evolve(self, state, compiled, *, rng=None, callback=None, stopped=None):
+        rng = rng if rng is not None else random.Random()
+
+        def pick(channel):
+            i = int(np.searchsorted(channel.cum, rng.random(), side="right"))
+            return channel.gates[min(i, len(channel.gates) - 1)]
+
+        _run_tableau(
+            state._tableau, compiled.source, state._bits,
+            lambda: rng.random() < 0.5, pick,
+        )
+        return state, ExactFidelity()
+
+    def sample_detectors(self, circuit, nsamples=1000, *, seed=None, rng=None):
+        """Detector and observable flips of ``nsamples`` shots of ``circuit``.
+
+        Returns:
+            tuple: ``(detectors, observables)`` boolean arrays, see
+            :meth:`PauliFrameSampler.sample_detectors`.
+        """
+        rngs = self._resolve_rngs(seed, rng)
+        return PauliFrameSampler(circuit).sample_detectors(nsamples, rngs.noise)
+
+    # ── routing: every circuit goes through the frame sampler ─────────────
+
+    def _execute_sampling(
+        self, quantum_circuit, projection, processed_circuit,
+        nsamples, rngs, callback, stopped, num_qubits, results,
+        progress=None,
+    ):
+        self._execute_frames(processed_circuit, nsamples, rngs, num_qubits, results)
+
+    def _execute_trajectories(
+        self, processed_circuit, nsamples, rngs,
+        callback, stopped, num_qubits, results, progress=None,
+    ):
+        self._execute_frames(processed_circuit, nsamples, rngs, num_qubits, results)
+
+    def _execute_frames(self, circuit, nsamples, rngs, num_qubits, results):
+        # Without a classical register, report every qubit, as the
+        # sampling driver does.
+        if circuit.num_bits() == 0:
+            circuit = circuit.copy()
+            for q in range(max(circuit.num_qubits(), num_qubits or 0)):
+                circuit.push(mc.Measure(), q, q)
+
+        t_compile = time.time()
+        sampler = PauliFrameSampler(circuit)
+        results.timings["compile"] = time.time() - t_compile
+
+        t_sample = time.time()
+        bits = sampler.sample(nsamples, rngs.noise)
+        results.timings["sample"] = time.time() - t_sample
+
+        results.fidelities.append(1.0)
+        results.avggateerrors.append(0.0)
+        for row in bits:
+            results.cstates.append(mc.BitString(row.tolist()))
+
+
+__all__ = [
+    "StabilizerBackend",
+    "StabilizerState",
+    "StabilizerProgram",
+    "PauliFrameSampler",
+]
@@ -22,6 +22,7 @@ from __future__ import (
 import mimiqcircuits as mc
 from mimiqcircuits.instruction import Instruction
 import copy
+from bisect import bisect_right
 from collections.abc import Iterable
 from itertools import repeat
 import shutil
@@ -263,6 +264,7 @@ class Circuit:
         self._instructions = instructions
         self._graph = None
         self._graph_valid = False
+        self._layers = {}
         self._nq = 0
         self._nb = 0
         self._nz = 0
@@ -283,6 +285,7 @@ class Circuit:
 
     def _invalidate_cache(self):
         self._graph_valid = False
+        self._layers = {}
         self._resources_valid = False
 
     def _append_raw(self, instruction):
@@ -325,6 +328,68 @@ class Circuit:
             self._graph_valid = True
         return self._graph
 
+    def layers(self, alap=False):
+        """Instruction indices grouped into layers of the dependency graph.
+
+        Instructions in the same layer act on disjoint qubits, bits and
+        z-variables, so they can be applied simultaneously. By default every
+        instruction is scheduled as soon as possible (ASAP); with
+        ``alap=True`` it is scheduled as late as possible instead, keeping the
+        same number of layers.
+
+        The result is cached alongside :meth:`dag` and invalidated by any
+        structural change to the circuit.
+
+        Args:
+            alap (bool): Use as-late-as-possible scheduling.
+
+        Returns:
+            tuple: One read-only ``int32`` array of instruction indices per
+            layer, each in ascending order.
+
+        Examples:
+            >>> from mimiqcircuits import *
+            >>> c = Circuit()
+            >>> c.push(GateH(), 0)
+            1-qubit circuit with 1 instruction:
+            └── H @ q[0]
+            <BLANKLINE>
+            >>> c.push(GateCX(), 0, 1)
+            2-qubit circuit with 2 instructions:
+            ├── H @ q[0]
+            └── CX @ q[0], q[1]
+            <BLANKLINE>
+            >>> c.push(GateX(), 2)
+            3-qubit circuit with 3 instructions:
+            ├── H @ q[0]
+            ├── CX @ q[0], q[1]
+            └── X @ q[2]
+            <BLANKLINE>
+            >>> [layer.tolist() for layer in c.layers()]
+            [[0, 2], [1]]
+            >>> [layer.tolist() for layer in c.layers(alap=True)]
+            [[0], [1, 2]]
+        """
+        key = bool(alap)
+        if key not in self._layers:
+            self._layers[key] = self.dag().layers(alap=key)
+        return self._layers[key]
+
+    def moments(self, alap=False):
+        """Instructions grouped into layers, as lists of :class:`Instruction`.
+
+        Same grouping as :meth:`layers`, with the instructions in place of
+        their indices.
+
+        Args:
+            alap (bool): Use as-late-as-possible scheduling.
+
+        Returns:
+            list: One list of instructions per layer.
+        """
+        instructions = self._instructions
+        return [[instructions[i] for i in layer] for layer in self.layers(alap)]
+
     def traverse_by_bfs(self):
         """Iterate the instructions in breadth-first topological order.
 
@@ -936,7 +1001,18 @@ class Circuit:
     def depth(self):
         """
         Computes the depth of the quantum circuit, including qubits, bits, and z-registers.
+
+        Unlike ``len(self.layers())``, barriers neither count as a layer nor
+        synchronize the qubits they span, and every instruction only depends
+        on the wires it declares, so the depth is computed on its own. It is
+        cached with :meth:`layers` and invalidated by the same structural
+        changes.
         """
+        if "depth" not in self._layers:
+            self._layers["depth"] = self._depth()
+        return self._layers["depth"]
+
+    def _depth(self):
         if self.empty() or self.num_qubits() == 0:
             return 0
 
@@ -1135,6 +1211,10 @@ class Circuit:
             The current state of the ASCII canvas, either incrementally after each operation if space runs out, or
             entirely at the end of processing all instructions.
 
+        Instructions are drawn one after the other in circuit order, each in
+        its own columns, rather than grouped by :meth:`moments`, so the
+        drawing follows the instruction list exactly.
+
         Returns:
             None
         """
@@ -1736,20 +1816,23 @@ class Circuit:
         """
 
         if rng is None:
-            rng = random()
+            rng = random.Random()
 
         scirc = Circuit()
+        tables = {}
 
         for inst in self.instructions:
             op = inst.get_operation()
 
             if isinstance(op, mc.krauschannel) and op.ismixedunitary():
-                cumulative_probs = op.unwrappedcumprobabilities()
+                cumulative_probs = tables.get(id(op))
+                if cumulative_probs is None:
+                    cumulative_probs = tables[id(op)] = op.unwrappedcumprobabilities()
 
                 r = rng.random()
 
-                # Use `next` to find the index of the first cumulative probability greater than `r`
-                index = next(i for i, p in enumerate(cumulative_probs) if p > r)
+                # First cumulative probability greater than `r`.
+                index = min(bisect_right(cumulative_probs, r), len(cumulative_probs) - 1)
 
                 gate = op.unitarygates()[index]
 
@@ -1768,6 +1851,34 @@ class Circuit:
 
         return scirc
 
+    def sample_mixedunitary_choices(self, ntraj, rng=None):
+        """Sample the branch of every mixed unitary channel for many trajectories.
+
+        Batch counterpart of :meth:`sample_mixedunitaries`: all the choices are
+        drawn at once, with one NumPy call, and returned as an array instead of
+        one circuit per trajectory. Use :class:`MixedUnitarySampler` directly
+        to replay a row of choices as the instructions of a trajectory.
+
+        Args:
+            ntraj: Number of trajectories.
+            rng (optional): ``numpy.random.Generator``, ``random.Random`` or
+                seed.
+
+        Returns:
+            numpy.ndarray: ``(ntraj, nchannels)`` integer array with the index
+            of the sampled unitary gate (as in ``op.unitarygates()``) of each
+            mixed unitary channel, in circuit order.
+
+        Examples:
+            >>> from mimiqcircuits import *
+            >>> c = Circuit().push(Depolarizing1(0.1), 0).push(PauliZ(0.2), 1)
+            >>> c.sample_mixedunitary_choices(1000, rng=1).shape
+            (1000, 2)
+        """
+        from mimiqcircuits.mixedunitaries import MixedUnitarySampler
+
+        return MixedUnitarySampler(self).sample(ntraj, rng=rng)
+
     def sample_losses(self, rng=None):
         """Resolve the random qubit-loss events in this circuit.
 
@@ -30,6 +30,80 @@ depends on the most recent earlier instruction ``u`` acting on a shared wire.
 
 from __future__ import annotations
 
+import numpy as np
+
+# Vertex ids, CSR offsets and CSR indices are all stored with this dtype.
+_INDEX = np.int32
+
+
+def _csr(n, major, minor):
+    """CSR ``(indptr, indices)`` of edges already sorted by ``(major, minor)``."""
+    indptr = np.zeros(n + 1, dtype=_INDEX)
+    np.cumsum(np.bincount(major, minlength=n), out=indptr[1:])
+    return indptr, minor.astype(_INDEX, copy=False)
+
+
+def _gather(indptr, indices, rows):
+    """Concatenation of the CSR rows ``rows``, without a Python loop."""
+    starts = indptr[rows]
+    lens = indptr[rows + 1] - starts
+    total = int(lens.sum())
+    if total == 0:
+        return indices[:0]
+    # Position j of the output reads indices[starts[r] + (j - offset[r])],
+    # where offset[r] is where row r begins in the output.
+    offsets = np.cumsum(lens) - lens
+    return indices[np.repeat(starts - offsets, lens) + np.arange(total)]
+
+
+# Below this many vertices a layer is peeled in plain Python: for the narrow
+# layers of deep circuits the fixed cost of the NumPy calls dominates.
+_SMALL_LAYER = 32
+
+
+def _peel(n, indptr, indices, indeg):
+    """Level of every vertex when peeling sources layer by layer.
+
+    Level 0 holds the vertices with in-degree 0; level ``l + 1`` those whose
+    last remaining predecessor sits on level ``l``. Wide layers are processed
+    with a handful of vectorized NumPy calls and narrow ones in plain Python,
+    so the cost is linear in the edges. Raises :class:`ValueError` if a cycle
+    leaves vertices unpeeled.
+    """
+    indeg = indeg.copy()
+    level = np.full(n, -1, dtype=_INDEX)
+    ptr = idx = deg = None
+    frontier = np.flatnonzero(indeg == 0).astype(_INDEX)
+    seen = 0
+    l = 0
+    while frontier.size:
+        level[frontier] = l
+        seen += frontier.size
+        l += 1
+        if frontier.size < _SMALL_LAYER:
+            if ptr is None:
+                ptr, idx = indptr.tolist(), indices.tolist()
+            if deg is None:
+                deg = indeg.tolist()
+            nxt = []
+            for u in frontier.tolist():
+                for v in idx[ptr[u] : ptr[u + 1]]:
+                    deg[v] -= 1
+                    if deg[v] == 0:
+                        nxt.append(v)
+            frontier = np.asarray(nxt, dtype=_INDEX)
+            continue
+        if deg is not None:
+            indeg = np.asarray(deg, dtype=indeg.dtype)
+            deg = None
+        succ = _gather(indptr, indices, frontier)
+        succ, counts = np.unique(succ, return_counts=True)
+        indeg[succ] -= counts.astype(indeg.dtype)
+        frontier = succ[indeg[succ] == 0]
+    if seen != n:
+        raise ValueError("The circuit DAG contains a cycle.")
+    return level
+
 
 class CircuitDAG:
     """Dependency graph of a circuit's instructions.
@@ -41,6 +115,12 @@ class CircuitDAG:
     each wire is linked, so the graph is the transitive reduction along wires
     rather than a dense reachability graph.
 
+    Both directions are stored in compressed sparse row (CSR) form: the
+    successors of ``v`` are ``indices[indptr[v]:indptr[v + 1]]``, sorted and
+    duplicate-free, in ``int32`` NumPy arrays. Neighbor queries return views
+    into those arrays, and whole-graph queries (:meth:`asap_levels`,
+    :meth:`alap_levels`, :meth:`critical_path`) run as vectorized passes.
+
     The graph is normally obtained from :meth:`Circuit.dag`, which builds it
     lazily and caches it; construct one directly only when working with the
     graph in isolation.
@@ -54,11 +134,43 @@ class CircuitDAG:
                 "circuit.dag()."
             )
         self._n = n
-        # Adjacency lists are kept sorted and duplicate-free so that traversals
-        # are deterministic and in-degree counts match the number of distinct
-        # predecessors (Kahn's algorithm relies on the latter).
-        self._out = [[] for _ in range(n)]
-        self._in = [[] for _ in range(n)]
+        self._set_edges(np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64))
+
+    @classmethod
+    def from_edges(cls, n, src, dst):
+        """Build a graph on ``n`` vertices from parallel edge arrays.
+
+        Duplicate edges and self-loops are dropped.
+        """
+        dag = cls(n)
+        dag._set_edges(
+            np.asarray(src, dtype=np.int64).ravel(),
+            np.asarray(dst, dtype=np.int64).ravel(),
+        )
+        return dag
+
+    def _set_edges(self, src, dst):
+        n = self._n
+        keep = src != dst
+        src, dst = src[keep], dst[keep]
+        out_keys = np.unique(src * n + dst)
+        src, dst = out_keys // n, out_keys % n
+        self._out_ptr, self._out_idx = _csr(n, src, dst)
+        order = np.argsort(dst * n + src, kind="stable")
+        self._in_ptr, self._in_idx = _csr(n, dst[order], src[order])
+        self._levels = None
+        self._pending = []
+
+    def _flush(self):
+        # Edges added one by one through `_add_edge` are buffered and merged
+        # into the CSR arrays on the next query.
+        if self._pending:
+            extra = np.asarray(self._pending, dtype=np.int64).reshape(-1, 2)
+            src = np.repeat(np.arange(self._n, dtype=np.int64), np.diff(self._out_ptr))
+            self._set_edges(
+                np.concatenate([src, extra[:, 0]]),
+                np.concatenate([self._out_idx.astype(np.int64), extra[:, 1]]),
+            )
 
     def __repr__(self):
         return f"CircuitDAG(vertices={self._n}, edges={self.num_edges()})"
@@ -69,47 +181,147 @@ class CircuitDAG:
 
     def num_edges(self):
         """Number of dependency edges."""
-        return sum(len(o) for o in self._out)
+        self._flush()
+        return int(self._out_idx.size)
 
     def vertices(self):
         """Range over all vertex indices."""
         return range(self._n)
 
+    def edge_arrays(self):
+        """``(src, dst)`` arrays of all edges, sorted by source then target."""
+        self._flush()
+        src = np.repeat(np.arange(self._n, dtype=_INDEX), np.diff(self._out_ptr))
+        return src, self._out_idx
+
     def edges(self):
         """List of ``(u, v)`` dependency edges with ``u`` before ``v``."""
-        return [(u, v) for u in range(self._n) for v in self._out[u]]
+        src, dst = self.edge_arrays()
+        return list(zip(src.tolist(), dst.tolist()))
 
-    def out_neighbors(self, v):
-        """Instructions that depend directly on ``v`` (its successors)."""
-        return self._out[v]
+    def csr(self, reverse=False):
+        """``(indptr, indices)`` arrays of the successor lists.
 
-    def in_neighbors(self, v):
-        """Instructions that ``v`` depends on directly (its predecessors)."""
-        return self._in[v]
+        With ``reverse=True``, those of the predecessor lists.
+        """
+        self._flush()
+        if reverse:
+            return self._in_ptr, self._in_idx
+        return self._out_ptr, self._out_idx
+
+    def out_neighbors(self, v):
+        """Instructions that depend directly on ``v`` (its successors).
 
-    def in_degree(self, v):
-        """Number of direct predecessors of ``v``."""
-        return len(self._in[v])
+        Returns an ``int32`` view into the edge arrays rather than a list, so
+        do not write to it; compare with ``.tolist()`` and test emptiness
+        with ``.size``.
+        """
+        self._flush()
+        return self._out_idx[self._out_ptr[v] : self._out_ptr[v + 1]]
 
-    def out_degree(self, v):
-        """Number of direct successors of ``v``."""
-        return len(self._out[v])
+    def in_neighbors(self, v):
+        """Instructions that ``v`` depends on directly (its predecessors).
+
+        Returns an ``int32`` view into the edge arrays rather than a list, so
+        do not write to it; compare with ``.tolist()`` and test emptiness
+        with ``.size``.
+        """
+        self._flush()
+        return self._in_idx[self._in_ptr[v] : self._in_ptr[v + 1]]
+
+    def in_degree(self, v=None):
+        """Number of direct predecessors of ``v``, or of every vertex."""
+        self._flush()
+        if v is None:
+            return np.diff(self._in_ptr)
+        return int(self._in_ptr[v + 1] - self._in_ptr[v])
+
+    def out_degree(self, v=None):
+        """Number of direct successors of ``v``, or of every vertex."""
+        self._flush()
+        if v is None:
+            return np.diff(self._out_ptr)
+        return int(self._out_ptr[v + 1] - self._out_ptr[v])
 
     def has_vertex(self, v):
         return 0 <= v < self._n
 
     def has_edge(self, u, v):
-        return v in self._out[u]
+        row = self.out_neighbors(u)
+        i = np.searchsorted(row, v)
+        return bool(i < row.size and row[i] == v)
 
     def _add_edge(self, u, v):
-        # During a build all edges added for a given target ``v`` are emitted
-        # consecutively and ``v`` only ever grows, so a single tail check keeps
-        # each adjacency list sorted and free of the duplicate that arises when
-        # two wires share the same immediate predecessor.
-        if self._out[u] and self._out[u][-1] == v:
-            return
-        self._out[u].append(v)
-        self._in[v].append(u)
+        self._pending.append((u, v))
+
+    def asap_levels(self):
+        """As-soon-as-possible layer of every instruction, as an array.
+
+        Level 0 holds the instructions with no predecessor and every other
+        instruction sits one level after its latest predecessor, so
+        instructions on the same level touch disjoint wires. Cached on the
+        graph.
+        """
+        self._flush()
+        if self._levels is None:
+            self._levels = _peel(
+                self._n, self._out_ptr, self._out_idx, np.diff(self._in_ptr)
+            )
+            self._levels.flags.writeable = False
+        return self._levels
+
+    def depth(self):
+        """Number of ASAP layers, i.e. the length of the longest path."""
+        levels = self.asap_levels()
+        return int(levels.max()) + 1 if levels.size else 0
+
+    def alap_levels(self):
+        """As-late-as-possible layer of every instruction, as an array.
+
+        Every instruction is pushed to the last layer its successors allow,
+        using the same number of layers as :meth:`asap_levels`. Instructions
+        whose two levels agree lie on a critical path.
+        """
+        self._flush()
+        height = _peel(self._n, self._in_ptr, self._in_idx, np.diff(self._out_ptr))
+        return (self.depth() - 1 - height).astype(_INDEX, copy=False)
+
+    def layers(self, alap=False):
+        """Vertices grouped by layer, as a tuple of ``int32`` arrays.
+
+        Layer ``k`` holds, in ascending index order, the instructions whose
+        :meth:`asap_levels` (or :meth:`alap_levels` when ``alap`` is true)
+        equal ``k``.
+        """
+        levels = self.alap_levels() if alap else self.asap_levels()
+        if levels.size == 0:
+            return ()
+        order = np.argsort(levels, kind="stable").astype(_INDEX, copy=False)
+        bounds = np.cumsum(np.bincount(levels))[:-1]
+        groups = tuple(np.split(order, bounds))
+        for g in groups:
+            g.flags.writeable = False
+        return groups
+
+    def critical_path(self):
+        """Instructions along one longest dependency chain, in order.
+
+        Ties are broken towards the lowest index, so the result is
+        deterministic.
+        """
+        levels = self.asap_levels()
+        if levels.size == 0:
+            return np.empty(0, dtype=_INDEX)
+        v = int(np.argmax(levels))
+        path = [v]
+        while levels[v] > 0:
+            preds = self.in_neighbors(v)
+            v = int(preds[np.argmax(levels[preds] == levels[v] - 1)])
+            path.append(v)
+        return np.asarray(path[::-1], dtype=_INDEX)
+
+
+_GLOBAL_OBSERVABLES = None
 
 
 def _dag_qubits(inst, nq):
@@ -129,16 +341,20 @@ def _dag_qubits(inst, nq):
     follows all earlier gates and precedes all later ones — a full-register
     synchronisation point.
     """
-    from mimiqcircuits.operations.amplitude import Amplitude
-    from mimiqcircuits.operations.entanglement import (
-        BondDim,
-        SchmidtRank,
-        VonNeumannEntropy,
-    )
-
-    if isinstance(
-        inst.operation, (Amplitude, BondDim, SchmidtRank, VonNeumannEntropy)
-    ):
+    global _GLOBAL_OBSERVABLES
+    if _GLOBAL_OBSERVABLES is None:
+        # Imported lazily (the operations import this module indirectly) and
+        # only once: build_dag calls this for every instruction.
+        from mimiqcircuits.operations.amplitude import Amplitude
+        from mimiqcircuits.operations.entanglement import (
+            BondDim,
+            SchmidtRank,
+            VonNeumannEntropy,
+        )
+
+        _GLOBAL_OBSERVABLES = (Amplitude, BondDim, SchmidtRank, VonNeumannEntropy)
+
+    if isinstance(inst.operation, _GLOBAL_OBSERVABLES):
         return range(nq)
     return inst.qubits
 
@@ -146,43 +362,34 @@ def _dag_qubits(inst, nq):
 def build_dag(circuit):
     """Build the :class:`CircuitDAG` of ``circuit``.
 
-    Walks the instructions in order, remembering the last instruction seen on
-    each qubit, bit, and z-variable, and links every instruction to those last
-    writers. The result encodes exactly the orderings that must be preserved
-    for the circuit to remain equivalent. The global state observables depend
-    on every qubit (see :func:`_dag_qubits`).
+    Gathers every ``(wire, instruction)`` incidence of the circuit into flat
+    arrays — qubits, bits and z-variables numbered into one wire space — in a
+    single walk over the instructions. A stable sort by wire then lines up the
+    instructions of each wire in circuit order, and every consecutive pair is a
+    dependency edge, so the last-writer bookkeeping happens in NumPy rather
+    than in per-wire dictionaries. The result encodes exactly the orderings
+    that must be preserved for the circuit to remain equivalent. The global
+    state observables depend on every qubit (see :func:`_dag_qubits`).
     """
     n = len(circuit)
     nq = circuit.num_qubits()
-    dag = CircuitDAG(n)
-
-    last_q = {}
-    last_b = {}
-    last_z = {}
-
-    for i, inst in enumerate(circuit):
-        for q in _dag_qubits(inst, nq):
-            prev = last_q.get(q)
-            if prev is not None:
-                dag._add_edge(prev, i)
-            last_q[q] = i
-        for b in inst.bits:
-            prev = last_b.get(b)
-            if prev is not None:
-                dag._add_edge(prev, i)
-            last_b[b] = i
-        for z in inst.zvars:
-            prev = last_z.get(z)
-            if prev is not None:
-                dag._add_edge(prev, i)
-            last_z[z] = i
-
-    # Predecessors may be discovered out of order (a later wire can point back
-    # to an earlier instruction); sort so in-neighbor lists are deterministic.
-    for preds in dag._in:
-        preds.sort()
-
-    return dag
+    nb = circuit.num_bits()
+
+    wires = []
+    counts = []
+    for inst in circuit:
+        start = len(wires)
+        wires.extend(_dag_qubits(inst, nq))
+        wires.extend(nq + b for b in inst.bits)
+        wires.extend(nq + nb + z for z in inst.zvars)
+        counts.append(len(wires) - start)
+
+    wires = np.asarray(wires, dtype=np.int64)
+    owner = np.repeat(np.arange(n, dtype=np.int64), counts)
+    order = np.argsort(wires, kind="stable")
+    wires, owner = wires[order], owner[order]
+    same = wires[1:] == wires[:-1]
+    return CircuitDAG.from_edges(n, owner[:-1][same], owner[1:][same])
 
 
 def _require_dag(dag):
@@ -198,27 +405,13 @@ def topological_sort_by_bfs(dag):
 
     Independent instructions — those at the same dependency depth — come out
     grouped together, which is the order the MPS simulator uses to fuse gates.
-    Vertices with no remaining predecessor are visited in ascending index
-    order, making the result deterministic.
+    Each layer is visited in ascending index order, making the result
+    deterministic. Returns an ``int32`` NumPy array of vertex indices; it
+    used to be a list, so ``order == [...]`` and ``if order:`` no longer
+    work as before, use ``order.tolist()`` or ``order.size`` instead.
     """
     _require_dag(dag)
-    n = dag.num_vertices()
-    in_degree = [dag.in_degree(v) for v in range(n)]
-
-    queue = [v for v in range(n) if in_degree[v] == 0]
-
-    order = []
-    idx = 0
-    while idx < len(queue):
-        u = queue[idx]
-        idx += 1
-        order.append(u)
-        for v in dag.out_neighbors(u):
-            in_degree[v] -= 1
-            if in_degree[v] == 0:
-                queue.append(v)
-
-    return order
+    return np.argsort(dag.asap_levels(), kind="stable").astype(_INDEX, copy=False)
 
 
 def topological_sort_by_dfs(dag):
@@ -226,13 +419,21 @@ def topological_sort_by_dfs(dag):
 
     Follows one dependency chain as deep as possible before backtracking, so a
     gate and its downstream cone tend to stay close together in the output.
-    Raises :class:`ValueError` if the graph contains a cycle, which for a
-    well-formed circuit should never happen.
+    Returns an ``int32`` NumPy array of vertex indices rather than a list,
+    see :func:`topological_sort_by_bfs`. Raises
+    :class:`ValueError` if the graph contains a cycle, which for a well-formed
+    circuit should never happen.
     """
     _require_dag(dag)
     n = dag.num_vertices()
+    indptr, indices = dag.csr()
+    indptr = indptr.tolist()
+    indices = indices.tolist()
     WHITE, GRAY, BLACK = 0, 1, 2
     color = [WHITE] * n
+    # Next successor slot to try for each vertex on the stack, so each edge
+    # is inspected once over the whole traversal.
+    cursor = indptr[:-1]
     order = []
 
     for source in range(n):
@@ -243,7 +444,10 @@ def topological_sort_by_dfs(dag):
         while stack:
             u = stack[-1]
             nxt = -1
-            for v in dag.out_neighbors(u):
+            end = indptr[u + 1]
+            while cursor[u] < end:
+                v = indices[cursor[u]]
+                cursor[u] += 1
                 if color[v] == GRAY:
                     raise ValueError("The circuit DAG contains a cycle.")
                 if color[v] == WHITE:
@@ -258,7 +462,7 @@ def topological_sort_by_dfs(dag):
                 stack.pop()
 
     order.reverse()
-    return order
+    return np.asarray(order, dtype=_INDEX)
 
 
 def traverse_by_bfs(circuit):
@@ -270,7 +474,7 @@ def traverse_by_bfs(circuit):
     """
     dag = circuit.dag()
     instructions = circuit.instructions
-    for i in topological_sort_by_bfs(dag):
+    for i in topological_sort_by_bfs(dag).tolist():
         yield instructions[i]
 
 
@@ -278,7 +482,7 @@ def traverse_by_dfs(circuit):
     """Yield the instructions of ``circuit`` in depth-first topological order."""
     dag = circuit.dag()
     instructions = circuit.instructions
-    for i in topological_sort_by_dfs(dag):
+    for i in topological_sort_by_dfs(dag).tolist():
         yield instructions[i]
 
 
@@ -0,0 +1,343 @@
+#
+# Copyright © 2022-2024 University of Strasbourg. All Rights Reserved.
+# Copyright © 2023-2025 QPerfect. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""Detector error models of annotated Clifford circuits.
+
+A detector error model lists the independent error mechanisms of a noisy
+circuit, each with its probability and the detectors and logical observables
+it flips. :func:`detector_error_model` builds it with one backward sweep: the
+Pauli whose sign each detector and observable measures is propagated from the
+end of the circuit to the start, for all of them at once as bit-packed masks,
+and a Pauli error flips exactly the detectors whose Pauli it anticommutes with
+at the point where it occurs.
+"""
+
+import numpy as np
+import scipy.sparse as sp
+
+
+class DetectorErrorModel:
+    """Independent error mechanisms of a circuit and what they flip.
+
+    Attributes:
+        probabilities: ``(num_errors,)`` array of mechanism probabilities.
+        detectors: ``(num_errors, num_detectors)`` sparse CSR incidence
+            matrix; entry ``[e, d]`` is 1 when mechanism ``e`` flips
+            detector ``d``.
+        observables: ``(num_errors, num_observables)`` sparse CSR incidence
+            matrix for the logical observables.
+
+    ``str()`` gives the model in the Stim text format, one
+    ``error(p) D... L...`` line per mechanism.
+    """
+
+    def __init__(self, probabilities, detectors, observables):
+        self.probabilities = np.asarray(probabilities, dtype=np.float64)
+        self.detectors = sp.csr_matrix(detectors, dtype=np.uint8)
+        self.observables = sp.csr_matrix(observables, dtype=np.uint8)
+
+    @property
+    def num_errors(self):
+        return self.probabilities.size
+
+    @property
+    def num_detectors(self):
+        return self.detectors.shape[1]
+
+    @property
+    def num_observables(self):
+        return self.observables.shape[1]
+
+    def __len__(self):
+        return self.num_errors
+
+    def __repr__(self):
+        return (
+            f"DetectorErrorModel with {self.num_errors} errors, "
+            f"{self.num_detectors} detectors, {self.num_observables} observables"
+        )
+
+    def __str__(self):
+        lines = []
+        for e, p in enumerate(self.probabilities):
+            targets = [f"D{d}" for d in self.detectors[e].indices]
+            targets += [f"L{k}" for k in self.observables[e].indices]
+            lines.append(f"error({p:.12g}) " + " ".join(targets))
+        return "\n".join(lines)
+
+    def sample(self, shots, rng=None):
+        """Sample detector and observable flips directly from the model.
+
+        Every mechanism fires independently in each shot with its
+        probability, and the flips of the fired mechanisms are added modulo
+        2. Much cheaper than simulating the circuit.
+
+        Args:
+            shots: Number of shots.
+            rng (optional): ``numpy.random.Generator``, ``random.Random`` or
+                seed.
+
+        Returns:
+            tuple: ``(detectors, observables)`` boolean arrays of shapes
+            ``(shots, num_detectors)`` and ``(shots, num_observables)``.
+        """
+        from mimiqcircuits.backends.stabilizer import _sample_hits
+        from mimiqcircuits.mixedunitaries import _as_generator
+
+        gen = _as_generator(rng)
+        shots = int(shots)
+        rows = []
+        cols = []
+        for e, p in enumerate(self.probabilities):
+            hits = _sample_hits(gen, shots, p)
+            rows.append(hits)
+            cols.append(np.full(hits.size, e, dtype=np.int64))
+        rows = np.concatenate(rows) if rows else np.empty(0, dtype=np.int64)
+        cols = np.concatenate(cols) if cols else np.empty(0, dtype=np.int64)
+        fired = sp.csr_matrix(
+            (np.ones(rows.size, dtype=np.int32), (rows, cols)),
+            shape=(shots, self.num_errors),
+        )
+        detectors = (fired @ self.detectors.astype(np.int32)).toarray() & 1
+        observables = (fired @ self.observables.astype(np.int32)).toarray() & 1
+        return detectors.astype(bool), observables.astype(bool)
+
+
+def _measurement_targets(program):
+    """For every measurement, the detectors and observables that read it.
+
+    A detector reads the measurement last written to each of its bits when
+    it is declared; observables accumulate over all their
+    ``ObservableInclude``. Targets are numbered detectors first, then
+    observables.
+    """
+    ndet = program.num_detectors
+    last = {}
+    targets = [set() for _ in range(program.num_measurements)]
+    m = 0
+    d = 0
+    for step in program.steps:
+        kind = step[0]
+        if kind == "measure":
+            last[step[3]] = m
+            m += 1
+        elif kind == "detector":
+            for b in step[1]:
+                if b in last:
+                    targets[last[b]] ^= {d}
+            d += 1
+        elif kind == "observable":
+            for b in step[2]:
+                if b in last:
+                    targets[last[b]] ^= {ndet + step[1]}
+    return targets
+
+
+def _pack_targets(indices, words):
+    mask = np.zeros(words, dtype=np.uint64)
+    for t in indices:
+        mask[t >> 6] |= np.uint64(1) << np.uint64(t & 63)
+    return mask
+
+
+def _anticommuting(basis, sx, sz):
+    """Targets whose Pauli anticommutes with the single-qubit ``basis``."""
+    if basis == "Z":
+        return sx
+    if basis == "X":
+        return sz
+    return sx ^ sz
+
+
+def _symplectic_signs(k):
+    """``(-1)^<P, Q>`` for all pairs of ``k``-qubit Paulis, as encoded by
+    :func:`~mimiqcircuits.backends.stabilizer._pauli_matrix`."""
+    # one qubit, e = x + 2z: I, X, Z, Y
+    one = np.array(
+        [[1, 1, 1, 1], [1, 1, -1, -1], [1, -1, 1, -1], [1, -1, -1, 1]],
+        dtype=np.float64,
+    )
+    signs = np.ones((1, 1))
+    for _ in range(k):
+        signs = np.kron(one, signs)
+    return signs
+
+
+def _independent_errors(channel):
+    """``(pauli, probability)`` of independent errors equivalent to ``channel``.
+
+    A Pauli channel is fixed by its Pauli fidelities ``f_P``, and ``n``
+    independent errors ``Q`` of probabilities ``q_Q`` give
+    ``f_P = prod(1 - 2 q_Q)`` over the ``Q`` anticommuting with ``P``. Taking
+    logarithms makes this linear, and it is inverted with the symplectic
+    Walsh-Hadamard transform. Negative solutions, from channels that are no
+    such product, are clipped to zero.
+    """
+    k = channel.hx.shape[1]
+    signs = _symplectic_signs(k)
+    weights = 1 << 2 * np.arange(k)
+    paulis = channel.hx.astype(np.int64) @ weights + channel.hz.astype(np.int64) @ (2 * weights)
+    disjoint = np.zeros(signs.shape[0])
+    np.add.at(disjoint, paulis, np.diff(channel.cum_hit, prepend=0.0) * channel.p_hit)
+    disjoint[0] = 1.0 - disjoint[1:].sum()
+
+    fidelities = signs @ disjoint
+    if np.any(fidelities <= 1e-12):
+        raise ValueError(
+            "Pauli channel is too noisy to be written as independent errors"
+        )
+    logs = -2.0 * (signs @ np.log(fidelities)) / signs.shape[0]
+    probs = (1.0 - np.exp(np.minimum(logs, 0.0))) / 2.0
+    return [(e, p) for e, p in enumerate(probs) if e and p > 0]
+
+
+def detector_error_model(circuit):
+    """Detector error model of a Clifford circuit with Pauli noise.
+
+    Every Pauli noise channel is rewritten as independent Pauli errors, as
+    Stim does: ``Depolarizing1(p)`` becomes independent ``X``, ``Y`` and
+    ``Z`` errors of probability ``(1 - sqrt(1 - 4p/3)) / 2`` each. The
+    rewrite is exact whenever the channel is such a product; otherwise
+    (e.g. ``X`` or ``Z`` but never both) it is correct to first order in the
+    probabilities. Each independent error is an error mechanism. Mechanisms
+    with the same detectors and observables are merged, combining their
+    probabilities as independent events, and mechanisms that flip nothing
+    are dropped.
+
+    Args:
+        circuit: Circuit of Clifford gates, Pauli channels, Pauli-basis
+            measurements and resets, ``Detector`` and ``ObservableInclude``
+            annotations.
+
+    Returns:
+        DetectorErrorModel: The error mechanisms of the circuit.
+
+    Raises:
+        ValueError: If the circuit has an unsupported operation, a channel
+            too noisy to be written as independent Pauli errors, or a
+            detector or observable that is not deterministic without noise.
+
+    Examples:
+        >>> from mimiqcircuits import *
+        >>> c = Circuit()
+        >>> _ = c.push(PauliX(0.1), 0)
+        >>> _ = c.push(GateCX(), 0, 1)
+        >>> _ = c.push(Measure(), 1, 0)
+        >>> _ = c.push(Measure(), 0, 1)
+        >>> _ = c.push(Detector(1), 0)
+        >>> _ = c.push(ObservableInclude(1, [0]), 1)
+        >>> dem = detector_error_model(c)
+        >>> dem
+        DetectorErrorModel with 1 errors, 1 detectors, 1 observables
+        >>> print(dem)
+        error(0.1) D0 L0
+    """
+    from mimiqcircuits.backends.stabilizer import (
+        StabilizerProgram,
+        _clifford_table,
+        _propagate,
+        _unpack,
+    )
+
+    if isinstance(circuit, StabilizerProgram):
+        program = circuit
+    else:
+        program = StabilizerProgram(circuit)
+    ndet = program.num_detectors
+    nobs = program.num_observables
+    ntargets = ndet + nobs
+    words = max((ntargets + 63) // 64, 1)
+
+    masks = [_pack_targets(t, words) for t in _measurement_targets(program)]
+
+    n = program.num_qubits
+    sx = np.zeros((n, words), dtype=np.uint64)
+    sz = np.zeros((n, words), dtype=np.uint64)
+    random = np.zeros(words, dtype=np.uint64)
+    errors = {}
+    channels = {}
+
+    m = program.num_measurements
+    for step in reversed(program.steps):
+        kind = step[0]
+        if kind == "gate":
+            _propagate(sx, sz, _clifford_table(step[3], inverse=True), step[1])
+        elif kind == "measure":
+            m -= 1
+            basis, q = step[1], step[2]
+            # a target anticommuting with the measured Pauli is random
+            random |= _anticommuting(basis, sx[q], sz[q])
+            if basis in "ZY":
+                sz[q] ^= masks[m]
+            if basis in "XY":
+                sx[q] ^= masks[m]
+        elif kind == "reset":
+            basis, q = step[1], step[2]
+            random |= _anticommuting(basis, sx[q], sz[q])
+            sx[q] = 0
+            sz[q] = 0
+        elif kind == "noise":
+            channel = step[2]
+            qubits = step[1]
+            independent = channels.get(id(channel))
+            if independent is None:
+                independent = channels[id(channel)] = _independent_errors(channel)
+            for e, p in independent:
+                flips = np.zeros(words, dtype=np.uint64)
+                for j, q in enumerate(qubits):
+                    if (e >> 2 * j) & 1:
+                        flips ^= sz[q]
+                    if (e >> 2 * j + 1) & 1:
+                        flips ^= sx[q]
+                if not flips.any():
+                    continue
+                key = flips.tobytes()
+                prev = errors.get(key, 0.0)
+                errors[key] = prev + p - 2 * prev * p
+
+    for q in range(n):
+        random |= sx[q]
+    if random.any():
+        bad = np.flatnonzero(_unpack(random[None, :], ntargets)[:, 0])
+        names = [f"D{t}" if t < ndet else f"L{t - ndet}" for t in bad]
+        raise ValueError(
+            f"Detectors or observables {', '.join(names)} are not deterministic"
+        )
+
+    return _build_model(errors, words, ndet, nobs)
+
+
+def _build_model(errors, words, ndet, nobs):
+    ntargets = ndet + nobs
+    rows = []
+    cols = []
+    probs = np.fromiter(errors.values(), dtype=np.float64, count=len(errors))
+    for e, key in enumerate(errors):
+        flips = np.frombuffer(key, dtype=np.uint64)
+        bits = np.unpackbits(flips.astype("<u8").view(np.uint8), bitorder="little")
+        targets = np.flatnonzero(bits[:ntargets])
+        rows.append(np.full(targets.size, e, dtype=np.int64))
+        cols.append(targets)
+    rows = np.concatenate(rows) if rows else np.empty(0, dtype=np.int64)
+    cols = np.concatenate(cols) if cols else np.empty(0, dtype=np.int64)
+    incidence = sp.csr_matrix(
+        (np.ones(rows.size, dtype=np.uint8), (rows, cols)),
+        shape=(len(errors), ntargets),
+    )
+    return DetectorErrorModel(probs, incidence[:, :ndet], incidence[:, ndet:])
+
+
+__all__ = ["DetectorErrorModel", "detector_error_model"]
@@ -22,18 +22,53 @@ the ordered product of the run. Non-unitary or opaque operations
 (measurements, resets, noise channels, ``Barrier``, control flow, and gates
 with symbolic parameters) are emitted unchanged and act as fusion boundaries:
 no gate fuses across one on a shared wire.
+
+Whether a gate joins a cluster is decided by a :class:`FusionCostModel`, which
+weighs the arithmetic of a wider block against the extra pass over the state
+that a separate block would cost. Runs made only of diagonal gates can be
+emitted as :class:`GateDiagonal` blocks, whose cost does not grow with width.
 """
 
+from collections import deque
+from dataclasses import dataclass
+
+import numpy as np
+
 from mimiqcircuits.circuit import Circuit
+from mimiqcircuits.instruction import Instruction
 from mimiqcircuits.dag import _dag_qubits
-from mimiqcircuits.matrices import reorder_qubits_matrix
 from mimiqcircuits.operations.gates.gate import Gate
 from mimiqcircuits.operations.gates.custom import GateCustom
+from mimiqcircuits.operations.gates.diagonal import GateDiagonal
 from mimiqcircuits.backends.passes import AbstractPass, PassSpec, PassResult
 
 
-def _is_fusible(inst, n):
-    """Whether ``inst`` is a plain unitary gate with a concrete numeric matrix.
+@dataclass(frozen=True)
+class FusionCostModel:
+    """Estimated cost of applying a fused block to a statevector.
+
+    Costs are per amplitude, since every block sweeps the whole state once
+    and the ``2^n`` factor cancels in every comparison. A dense ``k``-qubit
+    block does ``2^k`` complex multiply-adds per amplitude, a diagonal block
+    one; each block also pays ``sweep_cost`` for streaming the state through
+    memory. A large ``sweep_cost`` favours few wide blocks, a small one keeps
+    blocks narrow. With the default, dense blocks stop growing around five
+    qubits.
+    """
+
+    sweep_cost: float = 16.0
+
+    def block_cost(self, k, diagonal=False):
+        """Cost of one ``k``-qubit block, dense or diagonal."""
+        return (1.0 if diagonal else float(2**k)) + self.sweep_cost
+
+
+def _is_diagonal(m):
+    return not np.any(m - np.diag(np.diagonal(m)))
+
+
+def _fusible_matrix(inst, n):
+    """Numeric matrix of ``inst`` if it is a plain fusible gate, else ``None``.
 
     Requiring a :class:`Gate` already excludes barriers, measurements, resets,
     noise channels and control flow (none subclass it), so we never rely on
@@ -43,36 +78,372 @@ def _is_fusible(inst, n):
     """
     op = inst.operation
     if not isinstance(op, Gate):
-        return False
+        return None
     if len(inst.qubits) > n:
-        return False
+        return None
     if not op.isunitary():
-        return False
+        return None
     try:
-        op.unwrappedmatrix()
+        return op.unwrappedmatrix()
     except Exception:
-        return False  # symbolic or no concrete matrix -> treat as a boundary
-    return True
+        return None  # symbolic or no concrete matrix -> treat as a boundary
+
+
+def _apply_local(acc, g, axes):
+    """Contract the ``m``-qubit matrix ``g`` into ``acc`` along ``axes``.
+
+    ``acc`` is the accumulated block reshaped to one length-2 axis per support
+    qubit (plus a trailing column axis). Only the ``2^m x 2^m`` gate is ever
+    formed, so each member costs ``O(4^m 2^k)`` per column instead of the
+    ``O(8^k)`` dense product of an embedded matrix.
+    """
+    m = len(axes)
+    g = g.reshape((2,) * (2 * m))
+    out = np.tensordot(g, acc, axes=(list(range(m, 2 * m)), list(axes)))
+    # tensordot puts the gate's output axes first; move them back in place.
+    return np.moveaxis(out, list(range(m)), list(axes))
+
+
+def _diag_local(d, axes, k):
+    """Broadcastable view of the diagonal ``d`` of a gate acting on ``axes``."""
+    m = len(axes)
+    order = np.argsort(axes)
+    d = d.reshape((2,) * m).transpose(order)
+    shape = [1] * k
+    for a in axes:
+        shape[a] = 2
+    return d.reshape(shape)
+
+
+def _synthesize(members, support, diag=False):
+    """Matrix of a cluster on the sorted ``support``.
+
+    ``members`` are ``(instruction, matrix)`` pairs in circuit order, each
+    matrix fetched once while clustering. They are applied as small tensor
+    contractions on an accumulator with one axis per support qubit, the first
+    support qubit being the most significant as in
+    :func:`reorder_qubits_matrix`. Qubit positions come from a precomputed map
+    rather than a search of ``support``. For an all-diagonal cluster
+    (``diag=True``) the accumulator is the diagonal vector itself and each
+    member is a broadcast product.
+
+    Members are numeric by construction — ``_fusible_matrix`` rejects symbolic
+    gates — so everything runs in NumPy rather than through SymEngine.
+    """
+    k = len(support)
+    pos = {q: i for i, q in enumerate(support)}
+    if diag:
+        acc = np.ones((2,) * k, dtype=np.complex128)
+        for inst, m in members:
+            axes = [pos[q] for q in inst.qubits]
+            acc = acc * _diag_local(np.diagonal(m), axes, k)
+        return acc.reshape(2**k)
+
+    dim = 2**k
+    acc = np.eye(dim, dtype=np.complex128).reshape((2,) * k + (dim,))
+    for inst, m in members:
+        axes = [pos[q] for q in inst.qubits]
+        acc = _apply_local(acc, m, axes)
+    return acc.reshape(dim, dim)
+
+
+class _Clusterer:
+    """Greedy clustering state shared by :func:`fuse_circuit` and
+    :func:`eachfused`.
+
+    Instructions are fed one at a time through :meth:`add`. Each becomes part
+    of a cluster: a "PASS" cluster holding a single boundary instruction, or a
+    "FUSE" cluster of gates that will become one block. The cluster-level
+    dependency graph is reported edge by edge through :meth:`_link` as wires
+    change hands, so the instruction DAG is never built; subclasses decide
+    what to do with the edges.
+
+    A cluster stays "open" until a later operation takes one of its wires,
+    i.e. while nothing depends on it; only open clusters can be merged. A
+    cluster is "final" once no instruction can join it any more: a boundary
+    at once, a fusible cluster when it has lost all of its wires.
+    """
+
+    def __init__(self, nq, max_support, cost_model, diagonal):
+        self.nq = nq
+        self.max_support = max_support
+        self.cost_model = FusionCostModel() if cost_model is None else cost_model
+        self.diagonal = diagonal
+        self.clusters = {}
+        self.nclusters = 0
+        self.owner = {}  # qubit -> cluster id (a boundary owns its wires too)
+        self.last_b = {}
+        self.last_z = {}
+        # Structured circuits (layers of a repeated ansatz, Trotter steps)
+        # produce the same block many times over. Blocks are keyed by the
+        # member operations and their positions within the support, so each
+        # distinct block is synthesized — and wrapped in a gate — only once and
+        # then shared.
+        self.blocks = {}
+
+    # Hooks for the cluster graph.
+    def _link(self, prev, cid):
+        pass
+
+    def _merged(self, h, g):
+        pass
+
+    def _finalized(self, cid):
+        pass
+
+    def _new(self, i, inst, m, kind, diag=False):
+        cid = self.nclusters
+        self.nclusters += 1
+        self.clusters[cid] = {
+            "members": [(i, inst, m)],
+            "support": set(inst.qubits),
+            "kind": kind,
+            "diag": diag,
+            "open": True,
+            "owned": 0,
+        }
+        return cid
+
+    def _take(self, cid, wires, last):
+        """Make ``cid`` the last cluster on ``wires`` of the ``last`` map."""
+        qubits = last is self.owner
+        for w in wires:
+            prev = last.get(w)
+            if prev == cid:
+                continue
+            last[w] = cid
+            if qubits:
+                self.clusters[cid]["owned"] += 1
+            if prev is None:
+                continue
+            self._link(prev, cid)
+            cp = self.clusters.get(prev)
+            if qubits and cp is not None:  # None: already emitted
+                cp["open"] = False
+                cp["owned"] -= 1
+                if cp["owned"] == 0 and cp["kind"] == "FUSE":
+                    self._finalized(prev)
+
+    def _cost(self, cluster):
+        # a diagonal cluster is only emitted as diagonal with `diagonal=True`
+        return self.cost_model.block_cost(
+            len(cluster["support"]), cluster["diag"] and self.diagonal
+        )
+
+    def add(self, i, inst):
+        m = _fusible_matrix(inst, self.max_support)
+        if m is None:
+            cid = self._new(i, inst, None, "PASS")
+            # The boundary owns every wire it depends on, so a later gate on one
+            # of those wires cannot fuse back into a cluster sitting before it.
+            # A few global observables synchronise the whole register, hence
+            # `_dag_qubits` rather than `inst.qubits`.
+            self._take(cid, _dag_qubits(inst, self.nq), self.owner)
+            self._take(cid, inst.bits, self.last_b)
+            self._take(cid, inst.zvars, self.last_z)
+            self._finalized(cid)
+            return
+
+        clusters = self.clusters
+        qs = inst.qubits
+        isdiag = _is_diagonal(m)
+        owners = {self.owner[q] for q in qs if q in self.owner}
+        # A streamed boundary is emitted while it still owns its wires; such
+        # an owner is gone from `clusters` but keeps blocking like any other.
+        live = sorted(g for g in owners if g in clusters)
+        # Join the fusible clusters that own the immediate predecessor on the
+        # gate's wires; fresh wires carry no owner. A cluster that already has
+        # a dependent (no longer "open") may only grow on wires it owns
+        # entirely: joining it to anything else could put that dependent on a
+        # path from the cluster back into itself, making the union non-convex
+        # and the contracted graph cyclic. Open clusters have no dependents,
+        # so any number of them can merge, and the gate's remaining wires
+        # simply make the merged block depend on their owners.
+        if len(owners) == 1 and live and clusters[live[0]]["kind"] == "FUSE":
+            targets = live
+        else:
+            targets = [
+                g for g in live if clusters[g]["kind"] == "FUSE" and clusters[g]["open"]
+            ]
+        if targets:
+            support = set(qs).union(*(clusters[g]["support"] for g in targets))
+            diag = isdiag and all(clusters[g]["diag"] for g in targets)
+            apart = sum(self._cost(clusters[g]) for g in targets)
+            apart += self.cost_model.block_cost(len(qs), isdiag and self.diagonal)
+            if (
+                len(support) <= self.max_support
+                and self.cost_model.block_cost(len(support), diag and self.diagonal)
+                <= apart
+            ):
+                g = max(targets, key=lambda c: len(clusters[c]["members"]))
+                for h in targets:
+                    if h == g:
+                        continue
+                    ch = clusters.pop(h)
+                    clusters[g]["members"].extend(ch["members"])
+                    clusters[g]["owned"] += ch["owned"]
+                    for q in ch["support"]:
+                        self.owner[q] = g
+                    self._merged(h, g)
+                clusters[g]["members"].append((i, inst, m))
+                clusters[g]["support"] = support
+                clusters[g]["diag"] = diag
+                self._take(g, qs, self.owner)
+                return
+
+        cid = self._new(i, inst, m, "FUSE", isdiag)
+        self._take(cid, qs, self.owner)
+
+    def finish(self):
+        """Finalize every cluster still open to growth."""
+        for cid, cluster in list(self.clusters.items()):
+            if cluster["kind"] == "FUSE" and cluster["owned"] > 0:
+                self._finalized(cid)
+
+    def instructions(self, cid):
+        """Instructions emitted for cluster ``cid``, which is then dropped."""
+        cluster = self.clusters.pop(cid)
+        members = cluster["members"]
+        if cluster["kind"] == "PASS" or len(members) == 1:
+            # verbatim: keeps qubits, bits and zvars
+            return [inst for _, inst, _ in members]
+
+        members.sort(key=lambda x: x[0])
+        support = sorted(cluster["support"])
+        pos = {q: j for j, q in enumerate(support)}
+        key = (len(support),) + tuple(
+            (inst.operation, tuple(pos[q] for q in inst.qubits))
+            for _, inst, _ in members
+        )
+        try:
+            op = self.blocks.get(key)
+        except (TypeError, ValueError):  # an operation without a usable hash
+            key = None
+            op = None
+        if op is None:
+            diag = cluster["diag"]
+            u = _synthesize([(inst, m) for _, inst, m in members], support, diag)
+            if diag and self.diagonal:
+                op = GateDiagonal(u)
+            else:
+                op = GateCustom(np.diag(u) if diag else u)
+            if key is not None:
+                self.blocks[key] = op
+        return [Instruction(op, tuple(support))]
+
+
+class _BatchClusterer(_Clusterer):
+    """Collects the cluster graph as edge arrays and orders it at the end."""
+
+    def __init__(self, *args):
+        super().__init__(*args)
+        self.src = []
+        self.dst = []
+        self.alias = {}
+
+    def _link(self, prev, cid):
+        self.src.append(prev)
+        self.dst.append(cid)
+
+    def _merged(self, h, g):
+        self.alias[h] = g
 
+    def order(self):
+        """Cluster ids in breadth-first topological order.
 
-def _synthesize(circuit, members, support):
-    """Dense matrix of a cluster on the sorted ``support``.
+        Edge endpoints are redirected through merges, self-loops and
+        duplicates dropped, and the rest packed into CSR arrays (``indptr``
+        offsets into the ``indices`` of successors, sorted per row) in a few
+        vectorized NumPy passes. Kahn's algorithm then walks the CSR arrays
+        with a deque, visiting ready clusters in ascending id, so the whole
+        ordering is linear in the number of clusters and edges.
+        """
+        nc = self.nclusters
+        final = np.arange(nc, dtype=np.int64)
+        # A cluster absorbed by merges points at its survivor; survivors are
+        # created earlier or later, so follow chains to their end.
+        for h in self.alias:
+            g = self.alias[h]
+            while g in self.alias:
+                g = self.alias[g]
+            final[h] = g
 
-    Each member is embedded at its local position within ``support`` and the
-    embeddings are multiplied in circuit order (the later gate on the left).
-    Members are numeric by construction — ``_is_fusible`` rejects symbolic
-    gates — so the product runs in NumPy rather than through SymEngine.
+        src = final[np.asarray(self.src, dtype=np.int64)]
+        dst = final[np.asarray(self.dst, dtype=np.int64)]
+        keep = src != dst
+        pairs = np.unique(src[keep] * nc + dst[keep])
+        src, dst = pairs // nc, pairs % nc
+
+        indptr = np.zeros(nc + 1, dtype=np.int64)
+        np.cumsum(np.bincount(src, minlength=nc), out=indptr[1:])
+        indices = dst.tolist()
+        indptr = indptr.tolist()
+        indeg = np.bincount(dst, minlength=nc).tolist()
+
+        queue = deque(c for c in sorted(self.clusters) if indeg[c] == 0)
+        order = []
+        while queue:
+            c = queue.popleft()
+            order.append(c)
+            for d in indices[indptr[c]:indptr[c + 1]]:
+                indeg[d] -= 1
+                if indeg[d] == 0:
+                    queue.append(d)
+        return order
+
+
+class _StreamClusterer(_Clusterer):
+    """Releases clusters as soon as they are final and their predecessors out.
+
+    Only clusters still waiting to be emitted are kept, together with their
+    pending predecessors, so memory follows the width of the active frontier
+    rather than the length of the circuit.
     """
-    u = None
-    for i in sorted(members):
-        inst = circuit[i]
-        localq = [support.index(q) for q in inst.qubits]
-        e = reorder_qubits_matrix(inst.operation.unwrappedmatrix(), localq, len(support))
-        u = e if u is None else e @ u
-    return u
+
+    def __init__(self, *args):
+        super().__init__(*args)
+        self.preds = {}  # cluster -> predecessors not yet emitted
+        self.succs = {}  # cluster -> successors, possibly merged away since
+        self.alias = {}
+        self.final = set()
+        self.ready = deque()
+
+    def _resolve(self, c):
+        while c in self.alias:
+            c = self.alias[c]
+        return c
+
+    def _link(self, prev, cid):
+        if prev in self.clusters:  # emitted predecessors impose nothing
+            self.preds.setdefault(cid, set()).add(prev)
+            self.succs.setdefault(prev, []).append(cid)
+
+    def _merged(self, h, g):
+        self.alias[h] = g
+        ph = self.preds.pop(h, None)
+        if ph:
+            self.preds.setdefault(g, set()).update(ph)
+
+    def _finalized(self, cid):
+        self.final.add(cid)
+        if not self.preds.get(cid):
+            self.ready.append(cid)
+
+    def emit(self, cid):
+        self.final.discard(cid)
+        self.preds.pop(cid, None)
+        for s in self.succs.pop(cid, ()):
+            s = self._resolve(s)
+            ps = self.preds.get(s)
+            if ps is None or cid not in ps:
+                continue
+            ps.discard(cid)
+            if not ps and s in self.final:
+                self.ready.append(s)
+        return self.instructions(cid)
 
 
-def fuse_circuit(circuit, max_support=2):
+def fuse_circuit(circuit, max_support=2, cost_model=None, diagonal=False):
     """Fuse runs of adjacent gates in ``circuit`` into ``GateCustom`` blocks.
 
     Returns a new circuit implementing the same unitary. See the module
@@ -80,6 +451,14 @@ def fuse_circuit(circuit, max_support=2):
     original instruction (never rewrapped as a one-qubit ``GateCustom``), and
     qubit indices are never relabeled.
 
+    A gate joins the cluster(s) owning its wires only when the fused block
+    fits in ``max_support`` qubits and ``cost_model`` (a
+    :class:`FusionCostModel`, default-constructed when ``None``) estimates it
+    no more expensive than keeping the blocks apart. A gate bridging two
+    clusters merges them when neither has yet been cut off by a later
+    operation. With ``diagonal=True`` a block made only of diagonal gates is
+    emitted as a :class:`GateDiagonal`.
+
     Examples:
         >>> import mimiqcircuits as mc
         >>> c = mc.Circuit()
@@ -91,95 +470,57 @@ def fuse_circuit(circuit, max_support=2):
         >>> isinstance(fused[0].operation, mc.GateCustom)
         True
     """
-    n = len(circuit)
-    nq = circuit.num_qubits()
+    c = _BatchClusterer(circuit.num_qubits(), max_support, cost_model, diagonal)
+    for i, inst in enumerate(circuit):
+        c.add(i, inst)
 
-    owner = {}  # qubit -> cluster id (a boundary owns its wires too)
-    clusters = []  # {"members": [...], "support": set(), "kind": "FUSE" | "PASS"}
-    cluster_of = [None] * n
+    # Any topological order of the cluster graph is a valid, equivalent circuit
+    # (independent clusters commute). Every cluster is kept convex, so the
+    # graph is acyclic.
+    out = Circuit()
+    for cid in c.order():
+        for inst in c.instructions(cid):
+            out.push(inst)
+    return out
 
-    def new_cluster(i, qs, kind):
-        cid = len(clusters)
-        clusters.append({"members": [i], "support": set(qs), "kind": kind})
-        return cid
 
-    for i, inst in enumerate(circuit):
-        qs = list(inst.qubits)
-        if not _is_fusible(inst, max_support):
-            cid = new_cluster(i, qs, "PASS")
-            # The boundary owns every wire it depends on, so a later gate on one
-            # of those wires cannot fuse back into a cluster sitting before it.
-            # A few global observables synchronise the whole register, hence
-            # `_dag_qubits` rather than `inst.qubits`.
-            for q in _dag_qubits(inst, nq):
-                owner[q] = cid
-            cluster_of[i] = cid
-            continue
-
-        live = {owner[q] for q in qs if q in owner}
-        if len(live) == 1:
-            g = next(iter(live))
-            # Join only a fusible cluster that already owns the immediate
-            # predecessor on each shared wire. A boundary-owned wire is "PASS"
-            # and so blocks the join; fresh wires carry no owner.
-            if (
-                clusters[g]["kind"] == "FUSE"
-                and len(clusters[g]["support"] | set(qs)) <= max_support
-            ):
-                clusters[g]["members"].append(i)
-                clusters[g]["support"].update(qs)
-                for q in qs:
-                    owner[q] = g
-                cluster_of[i] = g
-                continue
+def eachfused(circuit, max_support=2, cost_model=None, diagonal=False):
+    """Yield the instructions of :func:`fuse_circuit` as they become available.
 
-        cid = new_cluster(i, qs, "FUSE")
-        for q in qs:
-            owner[q] = cid
-        cluster_of[i] = cid
-
-    # Contract the instruction DAG by cluster id and topologically sort it: any
-    # topological order is a valid, equivalent circuit (independent clusters
-    # commute). Single-owner greedy keeps every cluster convex, so this is a DAG.
-    dag = circuit.dag()
-    succ = {c: set() for c in range(len(clusters))}
-    indeg = [0] * len(clusters)
-    for u in range(dag.num_vertices()):
-        cu = cluster_of[u]
-        for v in dag.out_neighbors(u):
-            cv = cluster_of[v]
-            if cu != cv and cv not in succ[cu]:
-                succ[cu].add(cv)
-                indeg[cv] += 1
-
-    queue = sorted(c for c in range(len(clusters)) if indeg[c] == 0)
-    order = []
-    while queue:
-        c = queue.pop(0)
-        order.append(c)
-        for d in sorted(succ[c]):
-            indeg[d] -= 1
-            if indeg[d] == 0:
-                queue.append(d)
+    Streaming counterpart of :func:`fuse_circuit` with the same arguments and
+    fusion decisions. A block is yielded as soon as nothing more can join it
+    and everything it depends on has been yielded, so only the active
+    frontier of clusters is held in memory and neither the fused circuit nor
+    its dependency graph is materialized. The yielded order is a valid
+    topological order but generally differs from that of :func:`fuse_circuit`.
 
-    out = Circuit()
-    for cid in order:
-        cluster = clusters[cid]
-        if cluster["kind"] == "PASS" or len(cluster["members"]) == 1:
-            for i in cluster["members"]:
-                out.push(circuit[i])  # verbatim: keeps qubits, bits and zvars
-        else:
-            support = sorted(cluster["support"])
-            out.push(GateCustom(_synthesize(circuit, cluster["members"], support)), *support)
-    return out
+    Examples:
+        >>> import mimiqcircuits as mc
+        >>> c = mc.Circuit()
+        >>> _ = c.push(mc.GateH(), 0)
+        >>> _ = c.push(mc.GateCX(), 0, 1)
+        >>> _ = c.push(mc.Measure(), 0, 0)
+        >>> [str(inst.operation) for inst in mc.eachfused(c)]
+        ['Custom(...)', 'M']
+    """
+    c = _StreamClusterer(circuit.num_qubits(), max_support, cost_model, diagonal)
+    for i, inst in enumerate(circuit):
+        c.add(i, inst)
+        while c.ready:
+            yield from c.emit(c.ready.popleft())
+    c.finish()
+    while c.ready:
+        yield from c.emit(c.ready.popleft())
 
 
 class FusePass(AbstractPass):
     """Pass that fuses adjacent gates into ``GateCustom`` blocks.
 
     Wraps :func:`fuse_circuit`; ``max_support`` caps the block width (default
-    ``2``). Runs through :class:`PassPipeline` like any other pass and does not
-    relabel qubits, so :attr:`PassResult.qubit_permutation` is ``None``.
+    ``2``), ``sweep_cost`` parametrises the :class:`FusionCostModel` and
+    ``diagonal`` emits all-diagonal blocks as :class:`GateDiagonal`. Runs
+    through :class:`PassPipeline` like any other pass and does not relabel
+    qubits, so :attr:`PassResult.qubit_permutation` is ``None``.
 
     Fusion runs only when the circuit has at least ``qubit_threshold`` qubits;
     smaller circuits pass through unchanged, since fusing does not pay off until
@@ -187,20 +528,38 @@ class FusePass(AbstractPass):
     ``qubit_threshold = 0`` (the default) always fuses.
     """
 
-    def __init__(self, max_support=2, qubit_threshold=0):
+    def __init__(
+        self,
+        max_support=2,
+        qubit_threshold=0,
+        sweep_cost=FusionCostModel.sweep_cost,
+        diagonal=False,
+    ):
         self.max_support = int(max_support)
         self.qubit_threshold = int(qubit_threshold)
+        self.sweep_cost = float(sweep_cost)
+        self.diagonal = bool(diagonal)
 
     def spec(self):
         return PassSpec.from_dict(
             "fuse_gates",
-            {"max_support": self.max_support, "qubit_threshold": self.qubit_threshold},
+            {
+                "max_support": self.max_support,
+                "qubit_threshold": self.qubit_threshold,
+                "sweep_cost": self.sweep_cost,
+                "diagonal": self.diagonal,
+            },
         )
 
     def apply(self, ctx, circuit):
         if circuit.num_qubits() < self.qubit_threshold:
             return circuit, PassResult()
-        fused = fuse_circuit(circuit, self.max_support)
+        fused = fuse_circuit(
+            circuit,
+            self.max_support,
+            cost_model=FusionCostModel(self.sweep_cost),
+            diagonal=self.diagonal,
+        )
         result = PassResult(
             qubit_permutation=None,
             metadata={"pass": "fuse_gates", "before": len(circuit), "after": len(fused)},
@@ -19,6 +19,7 @@
 import mimiqcircuits as mc
 import symengine as se
 from mimiqcircuits.matrices import kronecker
+from functools import reduce
 from typing import Union
 import numpy as np
 
@@ -96,6 +97,9 @@ class Hamiltonian:
         - `push(...)`: Add a term by specifying its components.
         - `add_terms(...)`: Add a `HamiltonianTerm` object.
         - `num_qubits()`: Total number of qubits this Hamiltonian acts on.
+        - `sparse_matrix()`: Numeric sparse matrix.
+        - `linear_operator()`: Matrix-free operator for `H @ psi`.
+        - `expectation(state)`: Expectation value on a state vector.
         - `saveproto(...)`: Save to protobuf format.
         - `loadproto(...)`: Load from protobuf.
 
@@ -227,6 +231,208 @@ class Hamiltonian:
 
         return H
 
+    def _pauli_masks(self, num_qubits=None):
+        """Bit-mask form of the terms on ``num_qubits`` qubits.
+
+        Qubit ``q`` is bit ``num_qubits - 1 - q`` of a basis-state index, so
+        qubit 0 is the most significant bit, as in :meth:`matrix`. A term
+        maps ``|j>`` to ``coefficient * (-1)^popcount(j & z) |j ^ x>``, where
+        ``coefficient`` includes the ``i`` of every ``Y``.
+
+        Returns:
+            tuple: ``(x, z, coefficients)`` arrays, one entry per term.
+        """
+        n = self.num_qubits() if num_qubits is None else num_qubits
+        if n > 62:
+            raise ValueError(f"Too many qubits for a bit-mask representation: {n}")
+        x = np.zeros(len(self.terms), dtype=np.int64)
+        z = np.zeros(len(self.terms), dtype=np.int64)
+        coefficients = np.zeros(len(self.terms), dtype=np.complex128)
+        for t, term in enumerate(self.terms):
+            try:
+                c = complex(term.get_coefficient())
+            except (TypeError, RuntimeError):
+                raise ValueError(
+                    f"Coefficient {term.get_coefficient()} is symbolic; "
+                    "substitute its symbols with evaluate() first"
+                ) from None
+            ny = 0
+            for p, q in zip(term.get_operation().pauli, term.get_qubits()):
+                if q >= n:
+                    raise ValueError(f"Term {term} acts outside {n} qubits")
+                bit = 1 << (n - 1 - q)
+                if p in "XY":
+                    x[t] |= bit
+                if p in "ZY":
+                    z[t] |= bit
+                ny += p == "Y"
+            coefficients[t] = c * 1j**ny
+        return x, z, coefficients
+
+    def _xmask_groups(self, num_qubits=None):
+        """The terms grouped by X mask: a list of ``(x, z, coefficients)``,
+        one entry per distinct X mask."""
+        x, z, coefficients = self._pauli_masks(num_qubits)
+        order = np.argsort(x, kind="stable")
+        x, z, coefficients = x[order], z[order], coefficients[order]
+        starts = np.flatnonzero(np.r_[True, x[1:] != x[:-1]]) if x.size else []
+        bounds = list(starts) + [x.size]
+        return [
+            (int(x[a]), z[a:b], coefficients[a:b]) for a, b in zip(bounds, bounds[1:])
+        ]
+
+    def sparse_matrix(self, num_qubits=None):
+        """Numeric sparse matrix of the Hamiltonian.
+
+        Built directly from the bit masks of the Pauli strings: the terms
+        with the same X mask share one nonzero per column, at row
+        ``column ^ x``. Unlike :meth:`matrix` it needs no symbolic algebra
+        and scales to 20 qubits and more.
+
+        Args:
+            num_qubits (int, optional): Number of qubits of the matrix.
+                Defaults to :meth:`num_qubits`.
+
+        Returns:
+            scipy.sparse.csr_matrix: The ``2^n x 2^n`` complex matrix, with
+            qubit 0 as the most significant bit of the index, as in
+            :meth:`matrix`.
+
+        Raises:
+            ValueError: If a coefficient is symbolic.
+
+        Examples:
+            >>> from mimiqcircuits import *
+            >>> h = Hamiltonian()
+            >>> h.push(1.0, PauliString("ZZ"), 0, 1)
+            2-qubit Hamiltonian with 1 terms:
+            └── 1.0 * ZZ @ q[0,1]
+            >>> h.push(0.5, PauliString("X"), 1)
+            2-qubit Hamiltonian with 2 terms:
+            ├── 1.0 * ZZ @ q[0,1]
+            └── 0.5 * X @ q[1]
+            >>> h.sparse_matrix().toarray().real
+            array([[ 1. ,  0.5,  0. ,  0. ],
+                   [ 0.5, -1. ,  0. ,  0. ],
+                   [ 0. ,  0. , -1. ,  0.5],
+                   [ 0. ,  0. ,  0.5,  1. ]])
+        """
+        import scipy.sparse as sp
+
+        n = self.num_qubits() if num_qubits is None else num_qubits
+        dim = 1 << n
+        cols = np.arange(dim, dtype=np.int64)
+        rows = [np.empty(0, dtype=np.int64)]
+        columns = [np.empty(0, dtype=np.int64)]
+        data = [np.empty(0, dtype=np.complex128)]
+        for x, z, coefficients in self._xmask_groups(n):
+            values = _phases(cols, z, coefficients)
+            keep = np.flatnonzero(values)
+            rows.append(keep ^ x)
+            columns.append(keep)
+            data.append(values[keep])
+        return sp.csr_matrix(
+            (np.concatenate(data), (np.concatenate(rows), np.concatenate(columns))),
+            shape=(dim, dim),
+        )
+
+    def linear_operator(self, num_qubits=None):
+        """Matrix-free operator applying the Hamiltonian to state vectors.
+
+        ``H @ psi`` costs ``O(terms * 2^n)`` time and ``O(2^n)`` extra
+        memory: for every X mask, the vector is multiplied by the summed
+        signs of the terms and permuted by ``index ^ x``.
+
+        Args:
+            num_qubits (int, optional): Number of qubits of the vectors.
+                Defaults to :meth:`num_qubits`.
+
+        Returns:
+            scipy.sparse.linalg.LinearOperator: A ``2^n x 2^n`` operator,
+            usable with ``scipy.sparse.linalg.eigsh`` for exact ground state
+            energies.
+
+        Raises:
+            ValueError: If a coefficient is symbolic.
+        """
+        from scipy.sparse.linalg import LinearOperator
+
+        n = self.num_qubits() if num_qubits is None else num_qubits
+        dim = 1 << n
+        groups = self._xmask_groups(n)
+        index = np.arange(dim, dtype=np.int64)
+
+        def matvec(psi):
+            psi = np.asarray(psi).reshape(dim)
+            out = np.zeros(dim, dtype=np.complex128)
+            for x, z, coefficients in groups:
+                # (H psi)[k] = sum over the group of phase(k ^ x) psi[k ^ x]
+                out += (_phases(index, z, coefficients) * psi)[index ^ x]
+            return out
+
+        return LinearOperator((dim, dim), matvec=matvec, dtype=np.complex128)
+
+    def expectation(self, state):
+        r"""Expectation value :math:`\langle \psi | H | \psi \rangle` on a
+        state vector.
+
+        Evaluated without building the matrix, in ``O(terms * 2^n)`` time:
+        the terms are batched by X mask, each batch pairs ``psi[k ^ x]`` with
+        ``psi[k]`` and weighs the pair by the summed signs of its Z masks.
+        Diagonal terms only need ``|psi|^2``.
+
+        Args:
+            state (numpy.ndarray): The ``2^n`` amplitudes, with qubit 0 as
+                the most significant bit of the index, as in :meth:`matrix`.
+                ``n`` may exceed :meth:`num_qubits`. The state is not
+                normalized.
+
+        Returns:
+            float: The expectation value, or ``complex`` if a coefficient is
+            complex.
+
+        Raises:
+            ValueError: If a coefficient is symbolic, or the length of
+                ``state`` is not a power of two covering the Hamiltonian.
+
+        Examples:
+            >>> import numpy as np
+            >>> from mimiqcircuits import *
+            >>> h = Hamiltonian()
+            >>> _ = h.push(1.0, PauliString("ZZ"), 0, 1)
+            >>> _ = h.push(0.5, PauliString("X"), 0)
+            >>> psi = np.array([1, 0, 1, 0]) / np.sqrt(2)
+            >>> round(h.expectation(psi), 12)
+            0.5
+        """
+        psi = np.asarray(state, dtype=np.complex128).reshape(-1)
+        dim = psi.size
+        n = dim.bit_length() - 1
+        if dim != 1 << n or n < self.num_qubits():
+            raise ValueError(
+                f"State of length {dim} is not a {self.num_qubits()}-qubit or "
+                "larger state vector"
+            )
+
+        index = np.arange(dim, dtype=np.int64)
+        value = 0
+        for x, z, coefficients in self._xmask_groups(n):
+            # <psi|H|psi> sums conj(psi[k ^ x]) psi[k] (-1)^popcount(k & z)
+            if x == 0:
+                pairs = np.abs(psi) ** 2
+            else:
+                pairs = np.conj(psi[index ^ x]) * psi
+            if len(z) > n // 4:
+                # all the signed sums at once: the Walsh-Hadamard transform
+                value += np.dot(coefficients, _walsh_hadamard(pairs)[z])
+            else:
+                value += np.dot(_phases(index, z, coefficients), pairs)
+
+        hermitian = all(
+            complex(term.get_coefficient()).imag == 0 for term in self.terms
+        )
+        return float(np.real(value)) if hermitian else complex(value)
+
     def evaluate(self, d: dict):
         """
         Evaluate the symbolic coefficients of each term using the substitution dictionary `d`.
@@ -250,7 +456,112 @@ class Hamiltonian:
         return Hamiltonian(evaluated_terms)
 
 
-def push_expval(self, hamiltonian: Hamiltonian, *qubits: int, firstzvar=None):
+def _parity(a):
+    """Parity of the number of set bits of every entry of an int64 array."""
+    a = a ^ (a >> 32)
+    a ^= a >> 16
+    a ^= a >> 8
+    a ^= a >> 4
+    a ^= a >> 2
+    a ^= a >> 1
+    return a & 1
+
+
+def _walsh_hadamard(f):
+    """Walsh-Hadamard transform ``W[z] = sum_k (-1)^popcount(k & z) f[k]``
+    of a vector of length ``2^n``."""
+    h = 1
+    while h < f.size:
+        f = f.reshape(-1, 2, h)
+        f = np.stack((f[:, 0] + f[:, 1], f[:, 0] - f[:, 1]), axis=1)
+        h *= 2
+    return f.reshape(-1)
+
+
+def _phases(index, z, coefficients):
+    """Summed phase ``sum_t c_t (-1)^popcount(index & z_t)`` of terms that
+    share an X mask, for every basis state in ``index``."""
+    out = np.zeros(index.shape, dtype=np.complex128)
+    for zt, c in zip(z, coefficients):
+        if zt == 0:
+            out += c
+        else:
+            out += c * (1 - 2 * _parity(index & zt))
+    return out
+
+
+def _expval_groups(hamiltonian: Hamiltonian):
+    """Terms of a Hamiltonian merged for :func:`push_expval`.
+
+    Returns:
+        tuple: ``(constant, operators, strings)``. ``constant`` is the sum of
+        the identity terms. ``operators`` maps every support of at most two
+        qubits to the matrix of the numeric terms acting within it, one-qubit
+        terms being absorbed into a two-qubit support when one covers them.
+        ``strings`` maps every remaining coefficient to the Pauli strings that
+        share it, as ``(pauli, qubits)`` pairs.
+    """
+    reduced = {}
+    for term in hamiltonian:
+        key = tuple(
+            sorted(
+                (q, p)
+                for p, q in zip(term.get_operation().pauli, term.get_qubits())
+                if p != "I"
+            )
+        )
+        reduced[key] = reduced.get(key, 0) + term.get_coefficient()
+
+    constant = reduced.pop((), 0.0)
+    local, strings = {}, {}
+    for key, coeff in reduced.items():
+        if coeff == 0:
+            continue
+        try:
+            numeric = complex(coeff)
+        except (TypeError, RuntimeError):
+            numeric = None
+        if numeric is not None and len(key) <= 2:
+            local[key] = numeric
+        else:
+            qubits = tuple(q for q, _ in key)
+            pauli = mc.PauliString("".join(p for _, p in key))
+            strings.setdefault(coeff, []).append((pauli, qubits))
+
+    supports = {}
+    for key in local:
+        if len(key) == 2:
+            supports.setdefault(tuple(q for q, _ in key), [])
+    for key, coeff in local.items():
+        qs = [q for q, _ in key]
+        support = next(
+            (s for s in supports if len(s) == 2 and len(qs) == 1 and qs[0] in s),
+            tuple(qs),
+        )
+        supports.setdefault(support, []).append((dict(key), coeff))
+
+    operators = {}
+    for support, terms in supports.items():
+        mat = 0
+        for paulis, coeff in terms:
+            mat = mat + coeff * reduce(
+                np.kron, [_PAULI_MATRICES[paulis.get(q, "I")] for q in support]
+            )
+        operators[support] = mat
+    return constant, operators, strings
+
+
+_PAULI_MATRICES = {
+    "I": np.eye(2),
+    "X": np.array([[0, 1], [1, 0]]),
+    "Y": np.array([[0, -1j], [1j, 0]]),
+    "Z": np.array([[1, 0], [0, -1]]),
+}
+
+
+def push_expval(
+    self, hamiltonian: Hamiltonian, *qubits: int, firstzvar=None, group=False
+):
     r"""Push an expectation value estimation circuit for a given Hamiltonian.
 
     This operation measures the expectation value of a Hamiltonian and stores
@@ -267,6 +578,17 @@ def push_expval(self, hamiltonian: Hamiltonian, *qubits: int, firstzvar=None):
         hamiltonian (Hamiltonian): The Hamiltonian to evaluate.
         qubits (int): The qubit mapping to use.
         firstzvar (int, optional): Index of the first Z-register to use.
+        group (bool, optional): Merge terms before measuring them. Terms
+            that act within the same one or two qubits are summed into a
+            single :class:`Operator` with the coefficients folded in,
+            identity terms become the constant of the final :class:`Add`,
+            and longer Pauli strings that share a coefficient are summed
+            before a single :class:`Multiply`. The result is the same.
+            Only local Hamiltonians (Ising, Heisenberg, ...) get much
+            shorter: a Pauli string on more than two qubits with a
+            coefficient of its own still takes an :class:`ExpectationValue`
+            and a :class:`Multiply`, so most terms of a chemistry
+            Hamiltonian are not merged. Defaults to ``False``.
 
     Returns:
         Circuit: The modified circuit.
@@ -285,6 +607,27 @@ def push_expval(self, hamiltonian: Hamiltonian, *qubits: int, firstzvar=None):
         └── z[0] = 0.0 + z[0]
         <BLANKLINE>
 
+    With ``group=True``, the two-qubit term and the field on either qubit
+    are measured together:
+
+        >>> h = Hamiltonian()
+        >>> _ = h.push(0.5, PauliString("I"), 0)
+        >>> _ = h.push(1.0, PauliString("ZZ"), 0, 1)
+        >>> _ = h.push(1.0, PauliString("X"), 0)
+        >>> _ = h.push(1.0, PauliString("X"), 1)
+        >>> _ = h.push(0.25, PauliString("XXX"), 0, 1, 2)
+        >>> _ = h.push(0.25, PauliString("YYY"), 0, 1, 2)
+        >>> c = Circuit()
+        >>> c.push_expval(h, 0, 1, 2, group=True)
+        3-qubit, 3-zvar circuit with 6 instructions:
+        ├── ⟨Operator(...)⟩ @ q[0:1], z[0]
+        ├── ⟨XXX⟩ @ q[0:2], z[1]
+        ├── ⟨YYY⟩ @ q[0:2], z[2]
+        ├── z[1] = 0.0 + z[1] + z[2]
+        ├── z[1] = 0.25 * z[1]
+        └── z[0] = 0.5 + z[0] + z[1]
+        <BLANKLINE>
+
     See Also:
         :class:`ExpectationValue`, :class:`Multiply`, :class:`Add`
 
@@ -296,6 +639,9 @@ def push_expval(self, hamiltonian: Hamiltonian, *qubits: int, firstzvar=None):
     if firstzvar is None:
         firstzvar = self.num_zvars()
 
+    if group:
+        return _push_grouped_expval(self, hamiltonian, qubits, firstzvar)
+
     zvar = firstzvar
     for term in hamiltonian:
         self.push(
@@ -315,6 +661,43 @@ def push_expval(self, hamiltonian: Hamiltonian, *qubits: int, firstzvar=None):
     return self
 
 
+def _push_grouped_expval(self, hamiltonian, qubits, firstzvar):
+    constant, operators, strings = _expval_groups(hamiltonian)
+
+    results = []
+    zvar = firstzvar
+    for support, mat in operators.items():
+        mat = se.Matrix(
+            [[v.real if v.imag == 0 else v for v in row] for row in mat.tolist()]
+        )
+        self.push(
+            mc.ExpectationValue(mc.Operator(mat)),
+            *[qubits[q] for q in support],
+            zvar,
+        )
+        results.append(zvar)
+        zvar += 1
+
+    for coeff, terms in strings.items():
+        start = zvar
+        for pauli, support in terms:
+            self.push(
+                mc.ExpectationValue(pauli), *[qubits[q] for q in support], zvar
+            )
+            zvar += 1
+        if zvar - start > 1:
+            self.push(mc.Add(zvar - start + 1), start, *range(start, zvar))
+        if coeff != 1:
+            self.push(mc.Multiply(2, c=coeff), start, start)
+        results.append(start)
+
+    if not results:
+        self.push(mc.Add(1, c=constant), firstzvar)
+    else:
+        self.push(mc.Add(len(results) + 1, c=constant), firstzvar, *results)
+    return self
+
+
 def _pauliexp(term: HamiltonianTerm, t, qubits: tuple):
     """Internal helper for Pauli exponentiation."""
     p = term.get_operation()
@@ -343,7 +726,122 @@ def _pauliexp(term: HamiltonianTerm, t, qubits: tuple):
         return mc.Instruction(mc.RPauli(p, param), qubits)
 
 
-def push_lietrotter(self, h: Hamiltonian, qubits: tuple, t: float, steps: int):
+def _commute(a, b):
+    """Whether two Pauli strings, as ``{qubit: letter}`` dicts, commute."""
+    return sum(p != b[q] for q, p in a.items() if q in b) % 2 == 0
+
+
+def _trotter_layers(h: Hamiltonian):
+    """The terms of ``h`` arranged in layers for Trotter circuits.
+
+    Repeated Pauli strings are merged and identity terms, a global phase, are
+    dropped. Commuting terms on the same qubits form one block, and the
+    blocks are colored greedily, largest overlap first, so that the blocks
+    of a layer act on disjoint qubits. Every layer is therefore a set of
+    commuting terms that can run in parallel.
+
+    Returns:
+        list: One list of :class:`HamiltonianTerm` per layer.
+    """
+    merged = {}
+    for term in h:
+        key = tuple(
+            sorted(
+                (q, p)
+                for p, q in zip(term.get_operation().pauli, term.get_qubits())
+                if p != "I"
+            )
+        )
+        merged[key] = merged.get(key, 0) + term.get_coefficient()
+
+    blocks, bysupport = [], {}
+    for key, coeff in merged.items():
+        if not key or coeff == 0:
+            continue
+        support = tuple(q for q, _ in key)
+        paulis = dict(key)
+        pauli = mc.PauliString("".join(paulis.values()))
+        term = HamiltonianTerm(coeff, pauli, support)
+        for block in bysupport.setdefault(support, []):
+            if all(_commute(paulis, other) for other, _ in blocks[block][1]):
+                blocks[block][1].append((paulis, term))
+                break
+        else:
+            bysupport[support].append(len(blocks))
+            blocks.append((support, [(paulis, term)]))
+
+    byqubit = {}
+    for b, (support, _) in enumerate(blocks):
+        for q in support:
+            byqubit.setdefault(q, []).append(b)
+    neighbors = [
+        {n for q in support for n in byqubit[q]} - {b}
+        for b, (support, _) in enumerate(blocks)
+    ]
+
+    colors = [None] * len(blocks)
+    for b in sorted(range(len(blocks)), key=lambda b: -len(neighbors[b])):
+        used = {colors[n] for n in neighbors[b]}
+        colors[b] = next(c for c in range(len(blocks)) if c not in used)
+
+    layers = [[] for _ in range(max(colors, default=-1) + 1)]
+    for b, (_, terms) in enumerate(blocks):
+        layers[colors[b]].extend(term for _, term in terms)
+    return layers
+
+
+def _push_layers(c, layers, angle):
+    for layer in layers:
+        for term in layer:
+            c.push(_pauliexp(term, angle, term.get_qubits()))
+
+
+def _push_fused_strang(self, h, qubits, weights, name):
+    """Push the second-order steps ``S2(w)``, for every ``w`` in ``weights``,
+    with the terms arranged by :func:`_trotter_layers`.
+
+    The middle layer of each step is applied once with twice the angle, and
+    the first layer of a step is fused with the last layer of the step
+    before, so ``S2(w1) S2(w2)`` becomes ``edge(w1) inner(w1) edge(w1 + w2)
+    inner(w2) edge(w2)``.
+    """
+    λ = se.Symbol("λ")
+    layers = _trotter_layers(h)
+    if not layers:
+        return self
+
+    ce = mc.Circuit()
+    _push_layers(ce, layers[:1], λ)
+    edge = mc.GateDecl(f"{name}_edge", (λ,), ce)
+
+    inner = None
+    if len(layers) > 1:
+        ci = mc.Circuit()
+        _push_layers(ci, layers[1:-1], λ)
+        _push_layers(ci, layers[-1:], 2 * λ)
+        _push_layers(ci, layers[-2:0:-1], λ)
+        inner = mc.GateDecl(f"{name}_inner", (λ,), ci)
+
+    # a layer may leave the last qubits idle
+    edge_qubits = qubits[: edge.num_qubits]
+    inner_qubits = qubits[: inner.num_qubits] if inner else ()
+
+    pending = 0
+    for w in weights:
+        pending = pending + w
+        if inner is None:
+            pending = pending + w
+        else:
+            self.push(edge(pending), *edge_qubits)
+            self.push(inner(w), *inner_qubits)
+            pending = w
+    self.push(edge(pending), *edge_qubits)
+    return self
+
+
+def push_lietrotter(
+    self, h: Hamiltonian, qubits: tuple, t: float, steps: int, optimize=False
+):
     r"""
     Apply a Lie-Trotter expansion of the Hamiltonian ``h`` to the circuit ``self``
     for the qubits ``qubits`` over total time ``t`` with ``steps`` steps.
@@ -365,6 +863,11 @@ def push_lietrotter(self, h: Hamiltonian, qubits: tuple, t: float, steps: int):
     This method is particularly useful for simulating quantum systems and time-evolving
     quantum states in quantum algorithms such as VQE or QAOA.
 
+    With ``optimize=True``, repeated Pauli strings are merged and the terms
+    are reordered in layers of commuting terms on disjoint qubits, colored by
+    qubit overlap, so that each layer runs in parallel. Commuting terms on
+    the same qubits are kept together in one layer.
+
     See Also:
         :func:`push_suzukitrotter`, :class:`GateDecl`
 
@@ -390,8 +893,11 @@ def push_lietrotter(self, h: Hamiltonian, qubits: tuple, t: float, steps: int):
 
     ch = mc.Circuit()
 
-    for term in h:
-        ch.push(_pauliexp(term, 2 * Δt, term.get_qubits()))
+    if optimize:
+        _push_layers(ch, _trotter_layers(h), 2 * Δt)
+    else:
+        for term in h:
+            ch.push(_pauliexp(term, 2 * Δt, term.get_qubits()))
 
     decl = mc.GateDecl("trotter", (Δt,), ch)
 
@@ -401,8 +907,36 @@ def push_lietrotter(self, h: Hamiltonian, qubits: tuple, t: float, steps: int):
     return self
 
 
+def _suzuki_weights(order, λ):
+    """Time steps of the second-order steps that make up ``S_order(λ)``."""
+    if order == 2:
+        return [λ]
+    k = order // 2
+    pk = 1 / (4 - 4 ** (1 / (2 * k - 1)))
+    outer = _suzuki_weights(order - 2, pk * λ)
+    return 2 * outer + _suzuki_weights(order - 2, (1 - 4 * pk) * λ) + 2 * outer
+
+
+def _yoshida_weights(order, λ):
+    """Time steps of the second-order steps that make up Yoshida's
+    ``S_order(λ)``."""
+    if order == 2:
+        return [λ]
+    k = order // 2
+    alpha = 1 / (2 - 2 ** (1 / (2 * k - 1)))
+    beta = -(2 ** (1 / (2 * k - 1))) / (2 - 2 ** (1 / (2 * k - 1)))
+    outer = _yoshida_weights(order - 2, alpha * λ)
+    return outer + _yoshida_weights(order - 2, beta * λ) + outer
+
+
 def push_suzukitrotter(
-    self, h: Hamiltonian, qubits: tuple, t: float, steps: int, order: int = 2
+    self,
+    h: Hamiltonian,
+    qubits: tuple,
+    t: float,
+    steps: int,
+    order: int = 2,
+    optimize=False,
 ):
     # see e.g. [https://arxiv.org/pdf/quant-ph/0508139]
     # and [https://arxiv.org/abs/2211.02691]
@@ -457,6 +991,13 @@ def push_suzukitrotter(
 
         p_k = \left(4 - 4^{1/(2k - 1)}\right)^{-1}
 
+    With ``optimize=True``, the terms are merged and reordered in layers as
+    in :func:`push_lietrotter`, the middle layer of every second-order step
+    is applied once, and the first layer of each step is fused with the last
+    layer of the step before. The circuit is then a flat sequence of
+    ``suzukitrotter_edge`` and ``suzukitrotter_inner`` calls rather than
+    ``steps`` calls of ``suzukitrotter_2k``.
+
     See Also:
         :func:`push_lietrotter`, :class:`GateDecl`
 
@@ -485,6 +1026,10 @@ def push_suzukitrotter(
         )
 
     tstep = t / steps
+    if optimize:
+        weights = _suzuki_weights(order, tstep) * steps
+        return _push_fused_strang(self, h, qubits, weights, "suzukitrotter")
+
     λ = se.Symbol("λ")
 
     # Build base expansion S2(λ)
@@ -515,7 +1060,13 @@ def push_suzukitrotter(
 
 
 def push_yoshidatrotter(
-    self, h: Hamiltonian, qubits: tuple, t: float, steps: int, order: int = 4
+    self,
+    h: Hamiltonian,
+    qubits: tuple,
+    t: float,
+    steps: int,
+    order: int = 4,
+    optimize=False,
 ):
     # see e.g. [https://doi.org/10.1016/0375-9601(90)90092-3] for Yoshida's composition method
     # see e.g. [https://aiichironakano.github.io/phys516/Yoshida-symplectic-PLA00.pdf]
@@ -568,6 +1119,9 @@ def push_yoshidatrotter(
         t (float): Total simulation time.
         steps (int): Number of Trotter steps to apply.
         order (int): Desired even expansion order (must be ≥ 2 and even).
+        optimize (bool): Merge, reorder and fuse the terms as in
+            :func:`push_suzukitrotter`, emitting ``yoshida_edge`` and
+            ``yoshida_inner`` calls.
 
     Returns:
         Circuit: The modified circuit.
@@ -596,6 +1150,10 @@ def push_yoshidatrotter(
     if order < 2 or order % 2 != 0:
         raise ValueError("Yoshida order must be an even integer ≥ 2.")
 
+    if optimize:
+        weights = _yoshida_weights(order, t / steps) * steps
+        return _push_fused_strang(self, h, qubits, weights, "yoshida")
+
     λ = se.Symbol("λ")
     base = mc.Circuit()
     for term in h:
@@ -851,6 +851,187 @@ def resolve_losses(circuit: mc.Circuit, rng=None, lossmodel: Optional[LossModel]
     return lower_losses(sample_losses(circuit, rng=rng), rng=rng, lossmodel=lossmodel)
 
 
+# Instruction kinds precompiled by LossSampler.
+_GATE, _LOSS, _RELOAD, _CHECK, _MEASURECHECK, _MEASURE1 = range(6)
+
+
+class LossSampler:
+    """Loss structure of a circuit, compiled once for per-shot resolution.
+
+    :func:`resolve_losses` walks and rebuilds the whole circuit for every
+    shot. This class does that bookkeeping once: it records where the
+    ``Loss``, ``Reload``, ``Check`` and ``MeasureCheck`` instructions are, the
+    probability of every ``Loss``, and the qubits of every other instruction
+    as an integer bitmask. A shot then only draws which losses fire, as a
+    pattern bitmask (:meth:`sample_pattern`), and :meth:`variant` lowers the
+    circuit for that pattern with bitmask tests. Variants are cached by
+    pattern unless the loss model has :class:`CustomRule` entries, whose
+    generators may draw random numbers.
+
+    ``resolve_losses(circuit, rng, lossmodel)`` and
+    ``sampler.variant(sampler.sample_pattern(rng), rng)`` consume ``rng`` in
+    the same way and return the same circuit.
+
+    Args:
+        circuit: Circuit to resolve.
+        lossmodel (optional): A :class:`LossModel` for gates touching lost
+            qubits.
+
+    Raises:
+        ValueError: If a ``Loss`` probability is not numeric.
+
+    Examples:
+        >>> import random
+        >>> from mimiqcircuits import *
+        >>> circuit = Circuit()
+        >>> _ = circuit.push(Loss(0.5), 0)
+        >>> _ = circuit.push(GateCX(), 0, 1)
+        >>> _ = circuit.push(Check(), 0, 0)
+        >>> sampler = LossSampler(circuit)
+        >>> sampler.num_events
+        1
+        >>> sampler.variant(0b1)
+        1-qubit, 1-bit circuit with 2 instructions:
+        ├── Lost @ q[0]
+        └── c[0] = 0
+        <BLANKLINE>
+        >>> sampler.variant(0b0)
+        2-qubit, 1-bit circuit with 2 instructions:
+        ├── CX @ q[0], q[1]
+        └── c[0] = 1
+        <BLANKLINE>
+    """
+
+    def __init__(self, circuit: mc.Circuit, lossmodel: Optional[LossModel] = None):
+        self.circuit = circuit
+        self.lossmodel = lossmodel if lossmodel is not None else LossModel()
+        self.cacheable = not any(isinstance(r, CustomRule) for r in self.lossmodel.rules)
+
+        kinds = []
+        masks = []
+        # (bit, probability) of the losses that need a random draw, in order.
+        self._draws = []
+        certain = 0
+        nevents = 0
+        for inst in circuit:
+            op = inst.get_operation()
+            qubits = inst.get_qubits()
+            mask = 0
+            for q in qubits:
+                mask |= 1 << q
+            if isinstance(op, mc.Loss):
+                p = _sample_loss_probability(op)
+                if p >= 1.0:
+                    certain |= 1 << nevents
+                else:
+                    self._draws.append((1 << nevents, p))
+                kinds.append(_LOSS)
+                nevents += 1
+            elif isinstance(op, mc.Reload):
+                kinds.append(_RELOAD)
+            elif isinstance(op, mc.Check):
+                kinds.append(_CHECK)
+            elif isinstance(op, mc.MeasureCheck):
+                kinds.append(_MEASURECHECK)
+            elif isinstance(op, mc.AbstractMeasurement) and len(qubits) == 1:
+                kinds.append(_MEASURE1)
+            else:
+                kinds.append(_GATE)
+            masks.append(mask)
+
+        self._kinds = kinds
+        self._masks = masks
+        self._certain = certain
+        self.num_events = nevents
+        self._variants = {}
+
+    def sample_pattern(self, rng=None) -> int:
+        """Draw which ``Loss`` events fire in one shot.
+
+        Returns:
+            int: Bitmask with bit ``k`` set when the ``k``-th ``Loss`` of the
+            circuit (in circuit order) fires.
+        """
+        if rng is None:
+            rng = random.Random()
+        elif not hasattr(rng, "random"):
+            raise TypeError("rng must provide a random() method.")
+        pattern = self._certain
+        for bit, p in self._draws:
+            if rng.random() < p:
+                pattern |= bit
+        return pattern
+
+    def variant(self, pattern: int, rng=None) -> mc.Circuit:
+        """The loss-free circuit of the shot with loss pattern ``pattern``.
+
+        Same result as :func:`lower_losses` applied to the circuit where
+        exactly the losses in ``pattern`` fired. Cached by pattern when the
+        loss model is deterministic; the returned circuit must then not be
+        modified.
+        """
+        if self.cacheable:
+            found = self._variants.get(pattern)
+            if found is None:
+                found = self._variants[pattern] = self._lower(pattern, rng)
+            return found
+        if rng is None:
+            rng = random.Random()
+        return self._lower(pattern, rng)
+
+    def _lower(self, pattern, rng):
+        out = mc.Circuit()
+        lost = 0
+        # qubits lost or reloaded so far, the keys of lower_losses' lost map
+        seen = 0
+        event = 0
+        for inst, kind, mask in zip(self.circuit, self._kinds, self._masks):
+            if kind == _GATE:
+                if not lost & mask:
+                    out.push(inst)
+                elif mask & ~lost:
+                    lostmap = {
+                        q: bool(lost >> q & 1)
+                        for q in range(seen.bit_length())
+                        if seen >> q & 1
+                    }
+                    _apply_lossmodel_rules(out, inst, self.lossmodel, lostmap, rng)
+                continue
+
+            if kind == _LOSS:
+                fired = pattern >> event & 1
+                event += 1
+                if fired and not lost & mask:
+                    lost |= mask
+                    seen |= mask
+                    out.push(mc.Lost(), inst.get_qubits()[0])
+                continue
+
+            q = inst.get_qubits()[0]
+            if kind == _RELOAD:
+                out.push(mc.Reset(), q)
+                out.push(mc.Reloaded(), q)
+                lost &= ~mask
+                seen |= mask
+            elif kind == _CHECK:
+                b = inst.get_bits()[0]
+                out.push(mc.SetBit0() if lost & mask else mc.SetBit1(), b)
+            elif kind == _MEASURECHECK:
+                bits = inst.get_bits()
+                if lost & mask:
+                    out.push(mc.SetBit0(), bits[0])
+                    out.push(mc.SetBit0(), bits[1])
+                else:
+                    out.push(mc.Measure(), q, bits[0])
+                    out.push(mc.SetBit1(), bits[1])
+            elif lost & mask:
+                # a single-qubit measurement on a lost qubit reads 0
+                out.push(mc.SetBit0(), inst.get_bits()[0])
+            else:
+                out.push(inst)
+        return out
+
+
 def _normalize_loss_indices(loss_indices) -> set:
     if isinstance(loss_indices, int):
         loss_indices = (loss_indices,)
@@ -941,4 +1122,5 @@ __all__ = [
     "lower_losses",
     "resolve_losses",
     "sample_loss_scenario",
+    "LossSampler",
 ]
@@ -0,0 +1,332 @@
+#
+# Copyright © 2022-2024 University of Strasbourg. All Rights Reserved.
+# Copyright © 2023-2025 QPerfect. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""Batch sampling of mixed-unitary channels over many trajectories.
+
+The branch probabilities of a mixed-unitary channel do not depend on the
+state, so the branches of every channel in a circuit can be drawn for all
+trajectories up front. :class:`MixedUnitarySampler` does so with a single
+``searchsorted`` over the cumulative tables of all channels, and replays one
+row of choices as the instructions of a trajectory, without building a
+circuit per trajectory. :class:`RandomizedCircuitFamily` keeps many such
+instances (noise samples, Pauli twirls) as one skeleton circuit plus a compact
+choice array, and expands an instance only when it is asked for.
+"""
+
+import io
+import random
+
+import numpy as np
+
+import mimiqcircuits as mc
+
+
+def _as_generator(rng):
+    """NumPy generator for ``rng``: a ``Generator``, ``random.Random`` or ``None``."""
+    if isinstance(rng, np.random.Generator):
+        return rng
+    if rng is None:
+        return np.random.default_rng()
+    if isinstance(rng, random.Random):
+        return np.random.default_rng(rng.getrandbits(64))
+    return np.random.default_rng(rng)
+
+
+class MixedUnitarySampler:
+    """Precompiled branch tables of the mixed-unitary channels of a circuit.
+
+    Channels are numbered in circuit order; :attr:`positions` gives the
+    instruction index of each. Identical channel operations share one table.
+
+    Args:
+        circuit: Circuit whose mixed-unitary channels are sampled.
+
+    Raises:
+        ValueError: If a mixed-unitary channel has symbolic probabilities.
+
+    Examples:
+        >>> import numpy as np
+        >>> from mimiqcircuits import *
+        >>> c = Circuit()
+        >>> c.push(GateH(), 0)
+        1-qubit circuit with 1 instruction:
+        └── H @ q[0]
+        <BLANKLINE>
+        >>> c.push(PauliX(0.5), 0)
+        1-qubit circuit with 2 instructions:
+        ├── H @ q[0]
+        └── PauliX(0.5) @ q[0]
+        <BLANKLINE>
+        >>> sampler = MixedUnitarySampler(c)
+        >>> sampler.positions.tolist()
+        [1]
+        >>> choices = sampler.sample(4, rng=np.random.default_rng(1))
+        >>> choices.shape
+        (4, 1)
+        >>> [str(inst) for inst in sampler.instructions(np.array([1]))]
+        ['H @ q[0]', 'X @ q[0]']
+    """
+
+    def __init__(self, circuit):
+        self.circuit = circuit
+
+        positions = []
+        table_of = []
+        tables = {}
+        self._gates = []
+        self._lossy = []
+        cumulative = []
+        for i, inst in enumerate(circuit):
+            op = inst.get_operation()
+            if not (isinstance(op, mc.krauschannel) and op.ismixedunitary()):
+                continue
+            t = tables.get(id(op))
+            if t is None:
+                try:
+                    cum = np.asarray(op.unwrappedcumprobabilities(), dtype=np.float64)
+                except (TypeError, RuntimeError) as e:
+                    raise ValueError(
+                        f"Cannot sample {op}: its probabilities are symbolic"
+                    ) from e
+                t = tables[id(op)] = len(cumulative)
+                cumulative.append(cum)
+                self._gates.append(op.unitarygates())
+                self._lossy.append(getattr(op, "lossy", None))
+            positions.append(i)
+            table_of.append(t)
+
+        self.positions = np.asarray(positions, dtype=np.int64)
+        self._table_of = np.asarray(table_of, dtype=np.int64)
+
+        # All tables laid end to end, table t shifted by 2t: a draw r + 2t
+        # then lands inside table t, so one searchsorted serves all channels.
+        sizes = np.fromiter((c.size for c in cumulative), np.int64, len(cumulative))
+        self._start = np.cumsum(sizes) - sizes
+        self._last = sizes - 1
+        self._flat = (
+            np.concatenate([c + 2.0 * t for t, c in enumerate(cumulative)])
+            if cumulative
+            else np.empty(0)
+        )
+
+    @property
+    def num_channels(self):
+        """Number of mixed-unitary channels in the circuit."""
+        return self.positions.size
+
+    def sample(self, ntraj, rng=None):
+        """Draw a branch of every channel for ``ntraj`` trajectories.
+
+        Args:
+            ntraj: Number of trajectories.
+            rng (optional): ``numpy.random.Generator``, ``random.Random`` (used
+                to seed a NumPy generator) or seed. Defaults to a fresh
+                generator.
+
+        Returns:
+            numpy.ndarray: ``(ntraj, num_channels)`` integer array; entry
+            ``[k, j]`` is the branch of channel ``j`` in trajectory ``k``.
+        """
+        gen = _as_generator(rng)
+        tables = self._table_of
+        shift = 2.0 * tables
+        r = gen.random((int(ntraj), tables.size)) + shift
+        idx = np.searchsorted(self._flat, r, side="right") - self._start[tables]
+        # Cumulative sums may end just below 1 from rounding.
+        return np.minimum(idx, self._last[tables])
+
+    def instructions(self, choices, ids=False):
+        """Yield the instructions of one trajectory.
+
+        Every mixed-unitary channel is replaced by the gate of its branch in
+        ``choices`` (one row of :meth:`sample`), and a lossy branch emits a
+        certain :class:`Loss` on each of its lossy qubits, exactly as
+        :meth:`Circuit.sample_mixedunitaries` does.
+
+        Args:
+            choices: Branch of every channel, in channel order.
+            ids (optional): Whether to keep identity gates. Default ``False``.
+        """
+        choices = np.asarray(choices).tolist()
+        if len(choices) != self.num_channels:
+            raise ValueError(
+                f"Expected {self.num_channels} choices, got {len(choices)}"
+            )
+        positions = self.positions.tolist()
+        tables = self._table_of.tolist()
+        j = 0
+        for i, inst in enumerate(self.circuit):
+            if j < len(positions) and positions[j] == i:
+                t, index = tables[j], choices[j]
+                j += 1
+                gate = self._gates[t][index]
+                if ids or not gate.isidentity():
+                    yield mc.Instruction(gate, inst.qubits)
+                lossy = self._lossy[t]
+                if lossy is not None:
+                    for q in lossy[index]:
+                        yield mc.Instruction(mc.Loss(1.0), (inst.qubits[q - 1],))
+            else:
+                yield inst
+
+    def circuit_for(self, choices, ids=False):
+        """The circuit of one trajectory, see :meth:`instructions`."""
+        return mc.Circuit(list(self.instructions(choices, ids=ids)))
+
+
+def _compact(choices):
+    """``choices`` in the smallest unsigned integer type that holds them."""
+    high = int(choices.max()) if choices.size else 0
+    for dtype in (np.uint8, np.uint16, np.uint32):
+        if high <= np.iinfo(dtype).max:
+            return choices.astype(dtype)
+    return choices.astype(np.uint64)
+
+
+class RandomizedCircuitFamily:
+    """Randomized instances of one circuit, stored as skeleton plus choices.
+
+    The skeleton is a circuit with mixed-unitary channels, for instance the
+    output of :meth:`Circuit.add_noise` or of a twirling pass built with
+    :meth:`Circuit.decorate_on_match_parallel`. Instance ``k`` replaces every
+    channel by the branch in row ``k`` of :attr:`choices`, exactly as
+    :meth:`MixedUnitarySampler.circuit_for` does. Only the skeleton and the
+    choice array are kept in memory and written by :meth:`save`; instances
+    are expanded lazily by indexing or iteration.
+
+    Args:
+        skeleton: Circuit with the mixed-unitary channels.
+        choices: ``(n, num_channels)`` array of branch indices, one row per
+            instance, in the channel order of :class:`MixedUnitarySampler`.
+        ids (optional): Whether expanded instances keep identity gates.
+            Default ``False``.
+
+    Raises:
+        ValueError: If ``choices`` has the wrong shape or holds a branch
+            index out of range.
+
+    Examples:
+        >>> import numpy as np
+        >>> from mimiqcircuits import *
+        >>> c = Circuit()
+        >>> _ = c.push(GateH(), 0)
+        >>> _ = c.push(PauliX(0.5), 0)
+        >>> family = RandomizedCircuitFamily.sample(c, 1000, rng=np.random.default_rng(1))
+        >>> len(family), family.choices.dtype
+        (1000, dtype('uint8'))
+        >>> family[0] == family.sampler.circuit_for(family.choices[0])
+        True
+    """
+
+    def __init__(self, skeleton, choices, ids=False):
+        self.skeleton = skeleton
+        self.ids = ids
+        self.sampler = MixedUnitarySampler(skeleton)
+
+        choices = np.asarray(choices)
+        nchannels = self.sampler.num_channels
+        if choices.ndim != 2 or choices.shape[1] != nchannels:
+            raise ValueError(
+                f"Expected choices of shape (n, {nchannels}), got {choices.shape}"
+            )
+        if choices.size:
+            if not np.issubdtype(choices.dtype, np.integer):
+                raise ValueError("Choices must be integer branch indices")
+            last = self.sampler._last[self.sampler._table_of]
+            if (choices < 0).any() or (choices > last).any():
+                raise ValueError("Branch index out of range in choices")
+        self.choices = _compact(choices)
+        self.choices.flags.writeable = False
+
+    @classmethod
+    def sample(cls, skeleton, n, rng=None, ids=False):
+        """Draw ``n`` instances of ``skeleton``.
+
+        Args:
+            skeleton: Circuit with mixed-unitary channels.
+            n: Number of instances.
+            rng (optional): Random generator, as for
+                :meth:`MixedUnitarySampler.sample`.
+            ids (optional): Whether expanded instances keep identity gates.
+        """
+        choices = MixedUnitarySampler(skeleton).sample(n, rng=rng)
+        return cls(skeleton, choices, ids=ids)
+
+    def __len__(self):
+        return self.choices.shape[0]
+
+    def __getitem__(self, k):
+        if isinstance(k, slice):
+            return RandomizedCircuitFamily(self.skeleton, self.choices[k], self.ids)
+        return self.sampler.circuit_for(self.choices[k], ids=self.ids)
+
+    def __iter__(self):
+        for row in self.choices:
+            yield self.sampler.circuit_for(row, ids=self.ids)
+
+    def instructions(self, k):
+        """Yield the instructions of instance ``k`` without building it."""
+        return self.sampler.instructions(self.choices[k], ids=self.ids)
+
+    def __repr__(self):
+        return (
+            f"RandomizedCircuitFamily of {len(self)} instances "
+            f"({len(self.skeleton)} instructions, "
+            f"{self.sampler.num_channels} randomized channels)"
+        )
+
+    def save(self, file):
+        """Save the skeleton (in protobuf form) and the choices to ``file``.
+
+        The file is a NumPy ``.npz`` archive, so the size grows with the
+        number of instances only by one choice row each.
+
+        Returns:
+            int: The number of bytes written.
+        """
+        from mimiqcircuits.proto.circuitproto import toproto_circuit
+
+        skeleton = toproto_circuit(self.skeleton).SerializeToString()
+        buffer = io.BytesIO()
+        np.savez_compressed(
+            buffer,
+            skeleton=np.frombuffer(skeleton, dtype=np.uint8),
+            choices=self.choices,
+            ids=np.array(self.ids),
+        )
+        data = buffer.getvalue()
+        if hasattr(file, "write"):
+            file.write(data)
+        else:
+            with open(file, "wb") as f:
+                f.write(data)
+        return len(data)
+
+    @staticmethod
+    def load(file):
+        """Load a family written by :meth:`save`."""
+        from mimiqcircuits.proto import circuit_pb2
+        from mimiqcircuits.proto.circuitproto import fromproto_circuit
+
+        with np.load(file) as data:
+            proto = circuit_pb2.Circuit()
+            proto.ParseFromString(data["skeleton"].tobytes())
+            return RandomizedCircuitFamily(
+                fromproto_circuit(proto), data["choices"], bool(data["ids"])
+            )
+
+
+__all__ = ["MixedUnitarySampler", "RandomizedCircuitFamily"]
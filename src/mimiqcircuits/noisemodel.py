@@ -22,9 +22,12 @@ matching rule is applied to each instruction.
 
 from __future__ import annotations
 from dataclasses import dataclass, field
-from typing import Callable, Iterable, List, Sequence, Set, Union
+from typing import Callable, Iterable, List, Mapping, Sequence, Set, Union
+
+import numpy as np
 
 import mimiqcircuits as mc
+from mimiqcircuits.backends.passes import AbstractPass, PassResult, PassSpec
 from mimiqcircuits.circuitrules import AbstractCircuitRule
 from mimiqcircuits.symbolics import (
     _extract_variables,
@@ -653,12 +656,16 @@ class NoiseModel:
             rule = SetIdleQubitNoise(noise, qubits)
         return self.add_rule(rule)
 
-    def apply_noise_model(self, circuit: mc.Circuit):
+    def apply_noise_model(
+        self, circuit: mc.Circuit, *, insert_idle=False, durations=None
+    ):
         """Apply this noise model and return a new noisy circuit.
 
         This is a convenience wrapper around module-level ``apply_noise_model``.
         """
-        return apply_noise_model(circuit, self)
+        return apply_noise_model(
+            circuit, self, insert_idle=insert_idle, durations=durations
+        )
 
     def describe(self):
         title = f"NoiseModel: {self.name}" if self.name else "NoiseModel"
@@ -759,8 +766,96 @@ def _collapse_local_instructions_to_operation(
     return mc.Block(op.num_qubits, op.num_bits, op.num_zvars, instructions)
 
 
-def _apply_rules_to_instruction(inst: mc.Instruction, model: NoiseModel):
-    for rule in model.rules:
+def _rule_dispatch_key(rule: AbstractNoiseRule):
+    """Static preconditions of ``rule.matches``, used to index the rule.
+
+    Returns ``(op_type, subclass, exact_qubits, qubit_set)``: the rule can only
+    match instructions whose operation has type ``op_type`` (or is an instance
+    of ``subclass``), applied on exactly ``exact_qubits`` (or on qubits all in
+    ``qubit_set``). ``None`` entries impose no constraint. Rule types not known
+    here, including subclasses that may override ``matches``, are left
+    unconstrained so they are tried on every instruction.
+    """
+    kind = type(rule)
+    if kind is OperationInstanceNoise:
+        return type(rule.operation), None, None, None
+    if kind is ExactOperationInstanceQubitNoise:
+        return type(rule.operation), None, rule.qubits, None
+    if kind is SetOperationInstanceQubitNoise:
+        return type(rule.operation), None, None, rule._qubit_set
+    if kind is GlobalReadoutNoise:
+        return None, mc.AbstractMeasurement, None, None
+    if kind is ExactQubitReadoutNoise:
+        return None, mc.AbstractMeasurement, rule.qubits, None
+    if kind is SetQubitReadoutNoise:
+        return None, mc.AbstractMeasurement, None, rule._qubit_set
+    if kind is IdleNoise:
+        return None, mc.Delay, None, None
+    if kind is SetIdleQubitNoise:
+        return None, mc.Delay, None, rule.qubits
+    return None, None, None, None
+
+
+class _RuleIndex:
+    """Dispatch index over the rules of a :class:`NoiseModel`.
+
+    Rules are bucketed by the operation type they can match, then by the
+    exact qubit tuple they require, or by every qubit of the set they accept
+    (an instruction is looked up by its first qubit). Rules without such
+    constraints, like :class:`CustomNoiseRule`, sit in a fallback list that
+    is consulted for every instruction. The candidates for an instruction are
+    the union of its buckets, in the model's priority order, and are cached
+    per ``(operation type, qubits)`` pair.
+    """
+
+    def __init__(self, rules: Sequence[AbstractNoiseRule]):
+        self.rules = tuple(rules)
+        self._keys = [_rule_dispatch_key(rule) for rule in self.rules]
+        self._by_type = {}
+        self._candidates = {}
+
+    def _partition(self, op_type):
+        generic, exact, by_qubit, qubit_sets = [], {}, {}, []
+        for i, (rule_type, subclass, qubits, qubit_set) in enumerate(self._keys):
+            if rule_type is not None and rule_type is not op_type:
+                continue
+            if subclass is not None and not issubclass(op_type, subclass):
+                continue
+            if qubits is not None:
+                exact.setdefault(qubits, []).append(i)
+            elif qubit_set is not None:
+                qubit_sets.append(i)
+                for q in qubit_set:
+                    by_qubit.setdefault(q, []).append(i)
+            else:
+                generic.append(i)
+        return generic, exact, by_qubit, qubit_sets
+
+    def candidates(self, inst: mc.Instruction):
+        """Rules that may match ``inst``, highest priority first."""
+        op_type = type(inst.get_operation())
+        qubits = tuple(inst.get_qubits())
+        key = (op_type, qubits)
+        found = self._candidates.get(key)
+        if found is not None:
+            return found
+
+        partition = self._by_type.get(op_type)
+        if partition is None:
+            partition = self._by_type[op_type] = self._partition(op_type)
+        generic, exact, by_qubit, qubit_sets = partition
+
+        # A set rule accepts the instruction only if it contains every qubit,
+        # in particular the first one; with no qubits it always accepts.
+        positions = generic + exact.get(qubits, [])
+        positions += by_qubit.get(qubits[0], []) if qubits else qubit_sets
+        found = tuple(self.rules[i] for i in sorted(positions))
+        self._candidates[key] = found
+        return found
+
+
+def _apply_rules_to_instruction(inst: mc.Instruction, index: _RuleIndex):
+    for rule in index.candidates(inst):
         noise_inst = rule.apply_rule(inst)
         if noise_inst is None:
             continue
@@ -774,12 +869,76 @@ def _apply_rules_to_instruction(inst: mc.Instruction, model: NoiseModel):
     return [inst], False
 
 
+# Memo entry counting the truncated rewrites of self-referential declarations.
+_TRUNCATED = object()
+
+
+def _memo_key(op: mc.Operation):
+    """Key identifying the rewrite of ``op`` within one noise application.
+
+    Wrappers are keyed by identity. Gate calls are keyed by their declaration
+    and arguments instead, since every ``decl(...)`` builds a new ``GateCall``.
+    Returns ``None`` when the arguments are not hashable.
+    """
+    if isinstance(op, mc.GateCall):
+        key = (id(op.decl), tuple(op.arguments))
+        try:
+            hash(key)
+        except TypeError:
+            return None
+        return key
+    return id(op)
+
+
 def _rewrite_nested_operation(
-    op: mc.Operation, model: NoiseModel, active_decls: Set[object]
+    op: mc.Operation, index: _RuleIndex, active_decls: Set[object], memo: dict
+):
+    """Rewrite the body of a wrapper operation, memoized in ``memo``.
+
+    ``memo`` maps :func:`_memo_key` to ``(op, rewritten)`` pairs; holding
+    ``op`` keeps the identities in the keys alive. A declaration or block
+    used many times is thus rewritten once, and every use shares the same
+    rewritten operation.
+    """
+    if not isinstance(
+        op,
+        (
+            mc.Block,
+            mc.IfStatement,
+            mc.WhileStatement,
+            mc.Parallel,
+            mc.Repeat,
+            mc.GateCall,
+        ),
+    ):
+        return op
+
+    # Prevent infinite recursion for self-referential declarations. The
+    # truncated rewrite depends on the call stack, so neither it nor any
+    # rewrite that contains it is memoized.
+    if isinstance(op, mc.GateCall) and op.decl in active_decls:
+        memo[_TRUNCATED] = memo.get(_TRUNCATED, 0) + 1
+        return op
+
+    key = _memo_key(op)
+    if key is not None:
+        hit = memo.get(key)
+        if hit is not None:
+            return hit[1]
+
+    truncated = memo.get(_TRUNCATED, 0)
+    rewritten = _rewrite_wrapper(op, index, active_decls, memo)
+    if key is not None and memo.get(_TRUNCATED, 0) == truncated:
+        memo[key] = (op, rewritten)
+    return rewritten
+
+
+def _rewrite_wrapper(
+    op: mc.Operation, index: _RuleIndex, active_decls: Set[object], memo: dict
 ):
     if isinstance(op, mc.Block):
         noisy_instructions = _apply_noise_to_instructions(
-            op.instructions, model, active_decls
+            op.instructions, index, active_decls, memo
         )
         if noisy_instructions == op.instructions:
             return op
@@ -790,7 +949,9 @@ def _rewrite_nested_operation(
         qcanon, bcanon, zcanon = _canonical_targets(inner)
         inner_inst = mc.Instruction(inner, qcanon, bcanon, zcanon)
 
-        noisy_inner = _apply_noise_to_instruction(inner_inst, model, active_decls)
+        noisy_inner = _apply_noise_to_instruction(
+            inner_inst, index, active_decls, memo
+        )
         rewritten_inner = _collapse_local_instructions_to_operation(noisy_inner, inner)
 
         if rewritten_inner == inner:
@@ -803,7 +964,9 @@ def _rewrite_nested_operation(
         qcanon, bcanon, zcanon = _canonical_targets(inner)
         inner_inst = mc.Instruction(inner, qcanon, bcanon, zcanon)
 
-        noisy_inner = _apply_noise_to_instruction(inner_inst, model, active_decls)
+        noisy_inner = _apply_noise_to_instruction(
+            inner_inst, index, active_decls, memo
+        )
         rewritten_inner = _collapse_local_instructions_to_operation(noisy_inner, inner)
 
         if rewritten_inner == inner:
@@ -827,7 +990,7 @@ def _rewrite_nested_operation(
             )
 
         noisy_instructions = _apply_noise_to_instructions(
-            repeated_instructions, model, active_decls
+            repeated_instructions, index, active_decls, memo
         )
 
         if noisy_instructions == repeated_instructions:
@@ -843,7 +1006,7 @@ def _rewrite_nested_operation(
         ]
 
         noisy_instructions = _apply_noise_to_instructions(
-            repeated_instructions, model, active_decls
+            repeated_instructions, index, active_decls, memo
         )
         if noisy_instructions == repeated_instructions:
             return op
@@ -852,11 +1015,6 @@ def _rewrite_nested_operation(
 
     if isinstance(op, mc.GateCall):
         decl = op.decl
-
-        # Prevent infinite recursion for self-referential declarations.
-        if decl in active_decls:
-            return op
-
         active_decls.add(decl)
         try:
             substitutions = dict(zip(decl.arguments, op.arguments))
@@ -870,12 +1028,19 @@ def _rewrite_nested_operation(
                 )
 
             noisy_instructions = _apply_noise_to_instructions(
-                expanded_instructions, model, active_decls
+                expanded_instructions, index, active_decls, memo
             )
 
             if noisy_instructions == expanded_instructions:
                 return op
 
+            # a body that is still unitary stays a declaration, which the
+            # protobuf export writes once for all its uses
+            if all(isinstance(i.get_operation(), mc.Gate) for i in noisy_instructions):
+                body = mc.Circuit(noisy_instructions)
+                if body.num_qubits() == op.num_qubits:
+                    return mc.GateDecl(decl.name, (), body)()
+
             return mc.Block(op.num_qubits, op.num_bits, op.num_zvars, noisy_instructions)
         finally:
             active_decls.remove(decl)
@@ -884,14 +1049,17 @@ def _rewrite_nested_operation(
 
 
 def _apply_noise_to_instruction(
-    inst: mc.Instruction, model: NoiseModel, active_decls: Set[object]
+    inst: mc.Instruction,
+    index: _RuleIndex,
+    active_decls: Set[object],
+    memo: dict,
 ):
-    rewritten_instructions, matched = _apply_rules_to_instruction(inst, model)
+    rewritten_instructions, matched = _apply_rules_to_instruction(inst, index)
     if matched:
         return rewritten_instructions
 
     op = inst.get_operation()
-    rewritten_op = _rewrite_nested_operation(op, model, active_decls)
+    rewritten_op = _rewrite_nested_operation(op, index, active_decls, memo)
 
     if rewritten_op is op:
         return rewritten_instructions
@@ -904,26 +1072,197 @@ def _apply_noise_to_instruction(
 
 
 def _apply_noise_to_instructions(
-    instructions: List[mc.Instruction], model: NoiseModel, active_decls: Set[object]
+    instructions: List[mc.Instruction],
+    index: _RuleIndex,
+    active_decls: Set[object],
+    memo: dict,
 ):
     noisy_instructions = []
     for inst in instructions:
-        noisy_instructions.extend(_apply_noise_to_instruction(inst, model, active_decls))
+        noisy_instructions.extend(
+            _apply_noise_to_instruction(inst, index, active_decls, memo)
+        )
     return noisy_instructions
 
 
-def apply_noise_model(circuit: mc.Circuit, model: NoiseModel):
+def _duration_function(durations):
+    if callable(durations):
+        return durations
+    table = dict(durations or {})
+
+    def duration(inst):
+        op = inst.get_operation()
+        if type(op) in table:
+            return table[type(op)]
+        # an explicit delay lasts its own time
+        if isinstance(op, mc.Delay):
+            return op.t
+        return 1.0
+
+    return duration
+
+
+def _instruction_durations(circuit: mc.Circuit, durations):
+    duration = _duration_function(durations)
+    values = np.zeros(len(circuit), dtype=np.float64)
+    for i, inst in enumerate(circuit):
+        if isinstance(inst.get_operation(), mc.Barrier) or not inst.get_qubits():
+            continue
+        values[i] = float(duration(inst))
+    if np.any(values < 0):
+        raise ValueError("Instruction durations must be non-negative")
+    return values
+
+
+def insert_idle_delays(
+    circuit: mc.Circuit,
+    durations: Union[Mapping[type, float], Callable[[mc.Instruction], float]] = None,
+):
+    """Return a copy of ``circuit`` with a ``Delay`` on every idle period.
+
+    Instructions are scheduled as soon as possible on the layers of
+    :meth:`Circuit.layers`, each layer lasting as long as its longest
+    instruction. A qubit is idle between two of its instructions whenever the
+    second starts later than the first ends, either because other qubits are
+    still busy or because the first was shorter than its layer. Each such
+    period becomes one ``Delay(t)`` with the accumulated idle time ``t``,
+    placed right before the instruction that ends it. Qubits are not idle
+    before their first or after their last instruction.
+
+    The inserted delays are what :class:`IdleNoise` and
+    :class:`SetIdleQubitNoise` act on, which is how
+    ``apply_noise_model(..., insert_idle=True)`` uses this function.
+
+    Args:
+        circuit: Input circuit.
+        durations: Duration of each instruction, either as a mapping from
+            operation class to duration (classes not listed take ``1``, and
+            a ``Delay(t)`` takes ``t``) or as a callable of the instruction.
+            By default every instruction takes one time unit, except a
+            ``Delay``. ``Barrier`` and instructions without qubits always
+            take no time.
+
+    Returns:
+        A new circuit with the same instructions, in the same order, and the
+        idle delays.
+
+    Raises:
+        ValueError: If a duration is negative.
+
+    Examples:
+        >>> import mimiqcircuits as mc
+        >>> c = mc.Circuit()
+        >>> c.push(mc.GateH(), 0)
+        1-qubit circuit with 1 instruction:
+        └── H @ q[0]
+        <BLANKLINE>
+        >>> c.push(mc.GateX(), 1)
+        2-qubit circuit with 2 instructions:
+        ├── H @ q[0]
+        └── X @ q[1]
+        <BLANKLINE>
+        >>> c.push(mc.GateX(), 1)
+        2-qubit circuit with 3 instructions:
+        ├── H @ q[0]
+        ├── X @ q[1]
+        └── X @ q[1]
+        <BLANKLINE>
+        >>> c.push(mc.GateCX(), 0, 1)
+        2-qubit circuit with 4 instructions:
+        ├── H @ q[0]
+        ├── X @ q[1]
+        ├── X @ q[1]
+        └── CX @ q[0], q[1]
+        <BLANKLINE>
+        >>> mc.insert_idle_delays(c, {mc.GateCX: 2})
+        2-qubit circuit with 5 instructions:
+        ├── H @ q[0]
+        ├── X @ q[1]
+        ├── X @ q[1]
+        ├── Delay(1.0) @ q[0]
+        └── CX @ q[0], q[1]
+        <BLANKLINE>
+    """
+    return mc.Circuit(list(_iter_with_idle_delays(circuit, durations)))
+
+
+def _iter_with_idle_delays(circuit: mc.Circuit, durations):
+    """Instructions of ``circuit`` with the delays of :func:`insert_idle_delays`.
+
+    The idle periods are found up front; the instructions are then yielded
+    one at a time.
+    """
+    n = len(circuit)
+    if n == 0:
+        return
+
+    dur = _instruction_durations(circuit, durations)
+    levels = circuit.dag().asap_levels()
+    layer = np.zeros(int(levels.max()) + 1, dtype=np.float64)
+    np.maximum.at(layer, levels, dur)
+    start = (np.cumsum(layer) - layer)[levels]
+    end = start + dur
+
+    # Zero-duration instructions (barriers, classical operations) do not
+    # interrupt an idle period, so they are left out of the wire timelines.
+    wires = []
+    counts = []
+    for inst, d in zip(circuit, dur):
+        if d > 0:
+            wires.extend(inst.get_qubits())
+            counts.append(len(inst.get_qubits()))
+        else:
+            counts.append(0)
+    wires = np.asarray(wires, dtype=np.int64)
+    owner = np.repeat(np.arange(n, dtype=np.int64), counts)
+    order = np.argsort(wires, kind="stable")
+    wires, owner = wires[order], owner[order]
+
+    gap = start[owner[1:]] - end[owner[:-1]]
+    tol = 1e-12 * max(1.0, float(layer.sum()))
+    idle = (wires[1:] == wires[:-1]) & (gap > tol)
+    before, qubits, times = owner[1:][idle], wires[1:][idle], gap[idle]
+
+    order = np.argsort(before, kind="stable")
+    before = before[order].tolist()
+    qubits = qubits[order].tolist()
+    times = times[order].tolist()
+
+    k = 0
+    for i, inst in enumerate(circuit):
+        while k < len(before) and before[k] == i:
+            yield mc.Instruction(mc.Delay(times[k]), (qubits[k],))
+            k += 1
+        yield inst
+
+
+def apply_noise_model(
+    circuit: mc.Circuit,
+    model: NoiseModel,
+    *,
+    insert_idle: bool = False,
+    durations: Union[Mapping[type, float], Callable[[mc.Instruction], float]] = None,
+):
     """Apply a noise model to a circuit and return a new circuit.
 
     Rules are evaluated in priority order. For each instruction, only the first
     matching rule is applied.
 
+    Idle-noise rules act on ``Delay`` instructions. With ``insert_idle=True``,
+    a ``Delay`` is first placed on every idle period of the circuit's ASAP
+    schedule (see :func:`insert_idle_delays`), so idle noise is applied without
+    hand-inserted delays.
+
     Wrapper operations are traversed recursively:
     ``Block``, ``IfStatement``, ``Parallel``, ``Repeat``, and ``GateCall``.
 
     Args:
         circuit: Input circuit.
         model: Noise model to apply.
+        insert_idle: Insert a ``Delay`` on every idle period before applying
+            the rules.
+        durations: Instruction durations used to find idle periods when
+            ``insert_idle`` is set, as in :func:`insert_idle_delays`.
 
     Returns:
         A new circuit with injected noise.
@@ -1031,11 +1370,127 @@ def apply_noise_model(circuit: mc.Circuit, model: NoiseModel):
         <BLANKLINE>
                   
     """
-    active_decls: Set[object] = set()
-    noisy_instructions = _apply_noise_to_instructions(
-        circuit.instructions, model, active_decls
+    return mc.Circuit(
+        list(
+            iter_noisy_instructions(
+                circuit, model, insert_idle=insert_idle, durations=durations
+            )
+        )
     )
-    return mc.Circuit(noisy_instructions)
+
+
+def iter_noisy_instructions(
+    circuit: mc.Circuit,
+    model: NoiseModel,
+    *,
+    insert_idle: bool = False,
+    durations: Union[Mapping[type, float], Callable[[mc.Instruction], float]] = None,
+):
+    """Yield the instructions of the noisy circuit one at a time.
+
+    Lazy counterpart of :func:`apply_noise_model`: the same rules are applied
+    in the same order, but the noisy circuit is never built, so it can be fed
+    directly to a consumer such as a simulator or a writer. The rule index
+    and the rewrite memo are shared across the whole iteration.
+
+    Args:
+        circuit: Input circuit.
+        model: Noise model to apply.
+        insert_idle: Insert a ``Delay`` on every idle period before applying
+            the rules, as in :func:`apply_noise_model`.
+        durations: Instruction durations used with ``insert_idle``.
+
+    Yields:
+        The instructions of the noisy circuit, in order.
+
+    Examples:
+        >>> import mimiqcircuits as mc
+        >>> c = mc.Circuit().push(mc.GateH(), 0).push(mc.GateCX(), 0, 1)
+        >>> model = mc.NoiseModel([mc.OperationInstanceNoise(mc.GateH(), mc.AmplitudeDamping(0.01))])
+        >>> for inst in mc.iter_noisy_instructions(c, model):
+        ...     print(inst)
+        H @ q[0]
+        AmplitudeDamping(0.01) @ q[0]
+        CX @ q[0], q[1]
+    """
+    source = _iter_with_idle_delays(circuit, durations) if insert_idle else circuit
+    index = _RuleIndex(model.rules)
+    active_decls: Set[object] = set()
+    memo = {}
+    for inst in source:
+        yield from _apply_noise_to_instruction(inst, index, active_decls, memo)
+
+
+class NoiseModelPass(AbstractPass):
+    """Pass that applies a :class:`NoiseModel` to the circuit.
+
+    Wraps :func:`iter_noisy_instructions`, so noise is added as the noisy
+    circuit is assembled, without an intermediate copy. ``insert_idle`` and
+    ``durations`` are forwarded as in :func:`apply_noise_model`. Qubit indices
+    are unchanged, so :attr:`PassResult.qubit_permutation` is ``None``.
+
+    The noisy circuit is not equivalent to the input, so the pass does not
+    preserve the ``"exact_equivalence"`` feature.
+
+    Examples:
+        >>> import mimiqcircuits as mc
+        >>> from mimiqcircuits.backends import PassContext
+        >>> model = mc.NoiseModel([mc.OperationInstanceNoise(mc.GateH(), mc.AmplitudeDamping(0.01))])
+        >>> noisy, result = mc.NoiseModelPass(model).apply(PassContext(), mc.Circuit().push(mc.GateH(), 0))
+        >>> noisy
+        1-qubit circuit with 2 instructions:
+        ├── H @ q[0]
+        └── AmplitudeDamping(0.01) @ q[0]
+        <BLANKLINE>
+    """
+
+    def __init__(self, model: NoiseModel, insert_idle=False, durations=None):
+        self.model = model
+        self.insert_idle = bool(insert_idle)
+        self.durations = durations
+
+    def spec(self):
+        # Rules have no PassParam encoding; the model's repr identifies it.
+        # The name matches the remote backends' double-noise guard. A
+        # durations callable is identified by its qualified name only, so
+        # the spec is marked as not serializable.
+        params = {"model": repr(self.model), "insert_idle": self.insert_idle}
+        if callable(self.durations):
+            fn = self.durations
+            params["durations"] = (
+                f"{getattr(fn, '__module__', '')}."
+                f"{getattr(fn, '__qualname__', repr(fn))}"
+            )
+            params["serializable"] = False
+        else:
+            durations = {
+                getattr(k, "__name__", str(k)): float(v)
+                for k, v in (self.durations or {}).items()
+            }
+            params["durations"] = dict(sorted(durations.items()))
+        return PassSpec.from_dict("apply_noise_model", params)
+
+    def apply(self, ctx, circuit):
+        noisy = mc.Circuit()
+        for inst in iter_noisy_instructions(
+            circuit,
+            self.model,
+            insert_idle=self.insert_idle,
+            durations=self.durations,
+        ):
+            noisy.push(inst)
+        result = PassResult(
+            qubit_permutation=None,
+            metadata={
+                "pass": "apply_noise_model",
+                "before": len(circuit),
+                "after": len(noisy),
+            },
+        )
+        return noisy, result
+
+    def preserves(self, feature):
+        return feature != "exact_equivalence"
 
 
 __all__ = [
@@ -1051,4 +1506,7 @@ __all__ = [
     "CustomNoiseRule",
     "NoiseModel",
     "apply_noise_model",
+    "insert_idle_delays",
+    "iter_noisy_instructions",
+    "NoiseModelPass",
 ]
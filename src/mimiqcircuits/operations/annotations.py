@@ -207,6 +207,11 @@ class QubitCoordinates(AbstractAnnotation):
         self.coordinates = [float(coord) for coord in (coordinates or [])]
         self._qregsizes = [1]
 
+    def __getnewargs__(self):
+        # without arguments __new__ returns a lazy expression, so copies and
+        # pickles need the coordinates
+        return (self.coordinates,)
+
     @staticmethod
     def opname():
         return "QubitCoordinates"
@@ -283,6 +288,11 @@ class ShiftCoordinates(AbstractAnnotation):
         else:
             self.coordinates = [float(coord) for coord in coordinates]
 
+    def __getnewargs__(self):
+        # without arguments __new__ returns a lazy expression, so copies and
+        # pickles need the coordinates
+        return (self.coordinates,)
+
     @staticmethod
     def opname():
         return "ShiftCoordinates"
@@ -30,7 +30,7 @@ from mimiqcircuits.operations.decompositions.matrix_decompositions.zyz import  _
 
 
 class GateCustom(Gate):
-    """One or Two qubit Custom gates.
+    """Custom gate defined by its unitary matrix.
 
     Examples:
         >>> from mimiqcircuits import Circuit, GateCustom
@@ -50,7 +50,19 @@ class GateCustom(Gate):
     def __init__(self, matrix):
         super().__init__()
 
+        numeric_checked = False
         if isinstance(matrix, np.ndarray):
+            # Numeric input is checked for unitarity in NumPy before the
+            # SymEngine conversion: the symbolic product below is cubic in
+            # SymEngine scalars and dominates for fused multi-qubit blocks.
+            if matrix.ndim != 2 or matrix.shape[0] != matrix.shape[1]:
+                raise ValueError("Matrix is not square")
+            if matrix.dtype != object:
+                if not np.allclose(
+                    matrix @ matrix.conj().T, np.eye(matrix.shape[0]), atol=1e-8
+                ):
+                    raise ValueError("Matrix is not unitary")
+                numeric_checked = True
             mat = se.Matrix(matrix.tolist())
         elif isinstance(matrix, se.Matrix):
             mat = matrix
@@ -63,7 +75,9 @@ class GateCustom(Gate):
             raise ValueError("Matrix is not square")
 
         tolerance = 1e-8
-        if any(
+        if numeric_checked:
+            pass
+        elif any(
             isinstance(mat[i, j], (se.Symbol, str))
             for i in range(mat.rows)
             for j in range(mat.cols)
@@ -73,8 +87,8 @@ class GateCustom(Gate):
             if not self.is_unitary(mat, tol=tolerance):
                 raise ValueError("Matrix is not unitary")
 
-        num_qubits = (mat.rows >> 2) + 1
-        if mat.rows != 2**num_qubits:
+        num_qubits = mat.rows.bit_length() - 1
+        if num_qubits < 1 or mat.rows != 2**num_qubits:
             raise ValueError("Wrong number of the rows for the matrix")
 
         self.matrix = mat
@@ -0,0 +1,116 @@
+#
+# Copyright © 2022-2024 University of Strasbourg. All Rights Reserved.
+# Copyright © 2023-2025 QPerfect. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""Diagonal gate stored as a vector."""
+
+import numpy as np
+import symengine as se
+
+import mimiqcircuits as mc
+from mimiqcircuits.operations.gates.gate import Gate
+
+
+class GateDiagonal(Gate):
+    """Diagonal unitary gate stored as the vector of its diagonal entries.
+
+    A ``k``-qubit diagonal gate keeps only its ``2^k`` phases instead of the
+    dense ``2^k x 2^k`` matrix, and applying it costs one multiplication per
+    amplitude. The entries follow the same basis ordering as
+    :class:`GateCustom` (the first target qubit is the most significant).
+
+    :func:`fuse_circuit` emits it for fused runs of diagonal gates. There is no
+    dedicated wire format: serialization and decomposition go through the
+    equivalent dense :class:`GateCustom`.
+
+    Args:
+        diagonal (array-like): The ``2^k`` unit-modulus diagonal entries.
+
+    Raises:
+        ValueError: If the length is not a power of two or an entry does not
+            have unit modulus.
+
+    Examples:
+        >>> from mimiqcircuits import Circuit, GateDiagonal
+        >>> c = Circuit()
+        >>> c.push(GateDiagonal([1, 1j, -1, -1j]), 0, 1)
+        2-qubit circuit with 1 instruction:
+        └── Diagonal(...) @ q[0:1]
+        <BLANKLINE>
+    """
+
+    _name = "Diagonal"
+    _num_qubits = None
+    _qregsizes = None
+
+    def __init__(self, diagonal):
+        super().__init__()
+
+        d = np.asarray(diagonal, dtype=np.complex128).ravel()
+        num_qubits = d.size.bit_length() - 1
+        if num_qubits < 1 or d.size != 2**num_qubits:
+            raise ValueError(
+                f"GateDiagonal needs 2^k entries with k >= 1, got {d.size}"
+            )
+        if not np.allclose(np.abs(d), 1.0, atol=1e-8):
+            raise ValueError("Diagonal entries must have unit modulus")
+
+        d.flags.writeable = False
+        self.diagonal = d
+        self._num_qubits = num_qubits
+        self._qregsizes = [num_qubits]
+
+    @property
+    def num_qubits(self):
+        return self._num_qubits
+
+    def _matrix(self):
+        n = self.diagonal.size
+        m = se.zeros(n, n)
+        for i, x in enumerate(self.diagonal):
+            m[i, i] = complex(x)
+        return m
+
+    # Both matrix views bypass the class-level caches of AbstractOperator,
+    # which assume parameter-free operators share one matrix per class.
+    def matrix(self):
+        return self._matrix()
+
+    def unwrappedmatrix(self):
+        return np.diag(self.diagonal)
+
+    def inverse(self):
+        return GateDiagonal(self.diagonal.conj())
+
+    def __eq__(self, other):
+        return isinstance(other, GateDiagonal) and np.array_equal(
+            self.diagonal, other.diagonal
+        )
+
+    def __hash__(self):
+        return hash((GateDiagonal, self.diagonal.tobytes()))
+
+    def __str__(self):
+        return f"{self._name}(...)"
+
+    def __repr__(self):
+        return f"GateDiagonal({self.diagonal.tolist()})"
+
+    def _decompose(self, circ, qubits, bits, zvars):
+        circ.push(mc.GateCustom(np.diag(self.diagonal)), *qubits)
+        return circ
+
+
+__all__ = ["GateDiagonal"]
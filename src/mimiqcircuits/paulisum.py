@@ -0,0 +1,368 @@
+#
+# Copyright © 2022-2024 University of Strasbourg. All Rights Reserved.
+# Copyright © 2023-2025 QPerfect. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""Array-backed sums of Pauli strings.
+
+A :class:`PauliSum` keeps every Pauli string in symplectic form: two bit
+planes, ``x`` and ``z``, packed 64 qubits to a ``uint64`` word, one row per
+term. Qubit ``q`` is bit ``q % 64`` of word ``q // 64``, and ``I``, ``X``,
+``Z`` and ``Y`` are ``(x, z) = (0, 0), (1, 0), (0, 1), (1, 1)``. Sums,
+products and commutation checks then operate on all the terms at once with
+NumPy bitwise operations and popcounts.
+"""
+
+import numbers
+
+import numpy as np
+
+import mimiqcircuits as mc
+
+# Pauli letter of x + 2 * z.
+_LETTERS = np.array(["I", "X", "Z", "Y"])
+
+_BYTE_POPCOUNT = np.array([bin(b).count("1") for b in range(256)], dtype=np.int64)
+
+
+def _popcount(a):
+    """Number of set bits of a ``uint64`` array, summed over its last axis."""
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(a).sum(axis=-1, dtype=np.int64)
+    a = np.ascontiguousarray(a)
+    return _BYTE_POPCOUNT[a.view(np.uint8)].sum(axis=-1)
+
+
+def _nwords(num_qubits):
+    return (num_qubits + 63) // 64
+
+
+class PauliSum:
+    r"""Sum of Pauli strings stored as packed bit planes.
+
+    .. math::
+        H = \sum_j c_j P_j
+
+    where every :math:`P_j` is a tensor product of ``I``, ``X``, ``Y`` and
+    ``Z`` and :math:`c_j` a complex coefficient. Unlike :class:`Hamiltonian`,
+    which holds one :class:`HamiltonianTerm` object per term, the terms are
+    rows of two ``(num_terms, num_words)`` ``uint64`` arrays and one complex
+    array, so that building, combining and comparing large operators is
+    vectorized.
+
+    Addition concatenates the terms and products multiply every pair of
+    terms; neither merges repeated strings, which is left to
+    :meth:`simplify`.
+
+    Args:
+        num_qubits (int): Number of qubits of the operator.
+        x (numpy.ndarray, optional): ``(num_terms, num_words)`` X bit plane.
+        z (numpy.ndarray, optional): ``(num_terms, num_words)`` Z bit plane.
+        coefficients (numpy.ndarray, optional): ``(num_terms,)`` coefficients.
+
+    Raises:
+        ValueError: If the arrays do not have matching shapes.
+
+    Examples:
+        >>> from mimiqcircuits import *
+        >>> h = Hamiltonian()
+        >>> _ = h.push(1.0, PauliString("XX"), 0, 1)
+        >>> _ = h.push(0.5, PauliString("Z"), 1)
+        >>> p = PauliSum.from_hamiltonian(h)
+        >>> p
+        2-qubit PauliSum with 2 terms:
+        ├── 1.0 * XX @ q[0,1]
+        └── 0.5 * Z @ q[1]
+        >>> (p * p).simplify()
+        2-qubit PauliSum with 1 terms:
+        └── 1.25 * I @ q[0]
+        >>> zz = Hamiltonian().push(1.0, PauliString("ZZ"), 0, 1)
+        >>> p.commutes(PauliSum.from_hamiltonian(zz))
+        True
+        >>> p.to_hamiltonian()
+        2-qubit Hamiltonian with 2 terms:
+        ├── 1.0 * XX @ q[0,1]
+        └── 0.5 * Z @ q[1]
+    """
+
+    def __init__(self, num_qubits: int, x=None, z=None, coefficients=None):
+        if num_qubits < 0:
+            raise ValueError(f"Number of qubits must be ≥ 0, got {num_qubits}")
+        self.num_qubits = num_qubits
+        nwords = _nwords(num_qubits)
+
+        if x is None:
+            x = np.zeros((0, nwords), dtype=np.uint64)
+        if z is None:
+            z = np.zeros_like(x)
+        if coefficients is None:
+            coefficients = np.ones(len(x), dtype=np.complex128)
+
+        self.x = np.asarray(x, dtype=np.uint64).reshape(-1, nwords)
+        self.z = np.asarray(z, dtype=np.uint64).reshape(-1, nwords)
+        self.coefficients = np.asarray(coefficients, dtype=np.complex128).reshape(-1)
+        if not (len(self.x) == len(self.z) == len(self.coefficients)):
+            raise ValueError(
+                f"Bit planes with {len(self.x)} and {len(self.z)} terms do not "
+                f"match {len(self.coefficients)} coefficients"
+            )
+
+    @classmethod
+    def from_hamiltonian(cls, hamiltonian, num_qubits=None):
+        """Pack the terms of a :class:`Hamiltonian`, in order.
+
+        Args:
+            hamiltonian (Hamiltonian): The Hamiltonian to convert.
+            num_qubits (int, optional): Number of qubits of the result.
+                Defaults to ``hamiltonian.num_qubits()``.
+
+        Raises:
+            ValueError: If a coefficient is symbolic, or a term acts outside
+                ``num_qubits`` qubits.
+        """
+        n = hamiltonian.num_qubits() if num_qubits is None else num_qubits
+        nterms = len(hamiltonian)
+        coefficients = np.zeros(nterms, dtype=np.complex128)
+        rows, qubits, letters = [], [], []
+        for t, term in enumerate(hamiltonian):
+            try:
+                coefficients[t] = complex(term.get_coefficient())
+            except (TypeError, RuntimeError):
+                raise ValueError(
+                    f"Coefficient {term.get_coefficient()} is symbolic; "
+                    "substitute its symbols with evaluate() first"
+                ) from None
+            pauli, support = term.get_operation().pauli, term.get_qubits()
+            if support and max(support) >= n:
+                raise ValueError(f"Term {term} acts outside {n} qubits")
+            rows.extend([t] * len(support))
+            qubits.extend(support)
+            letters.extend(pauli)
+
+        rows = np.asarray(rows, dtype=np.intp)
+        qubits = np.asarray(qubits, dtype=np.uint64)
+        letters = np.asarray(letters, dtype="U1")
+        words = (qubits // 64).astype(np.intp)
+        bits = np.left_shift(np.uint64(1), qubits % np.uint64(64))
+
+        x = np.zeros((nterms, _nwords(n)), dtype=np.uint64)
+        z = np.zeros_like(x)
+        isx = (letters == "X") | (letters == "Y")
+        isz = (letters == "Z") | (letters == "Y")
+        np.bitwise_or.at(x, (rows[isx], words[isx]), bits[isx])
+        np.bitwise_or.at(z, (rows[isz], words[isz]), bits[isz])
+        return cls(n, x, z, coefficients)
+
+    def to_hamiltonian(self):
+        """The terms as a :class:`Hamiltonian`, in order.
+
+        Real coefficients become ``float``; identity terms act as ``I`` on
+        qubit 0.
+        """
+        h = mc.Hamiltonian()
+        for c, pauli, qubits in self:
+            if not qubits:
+                pauli, qubits = "I", (0,)
+            c = c.real if c.imag == 0 else c
+            h.push(c, mc.PauliString(pauli), *qubits)
+        return h
+
+    def _letters(self):
+        """``(num_terms, num_qubits)`` array of Pauli letters."""
+        n = self.num_qubits
+
+        def unpack(plane):
+            raw = plane.astype("<u8").view(np.uint8).reshape(len(plane), -1)
+            return np.unpackbits(raw, axis=1, bitorder="little")[:, :n]
+
+        return _LETTERS[unpack(self.x) + 2 * unpack(self.z)]
+
+    def __iter__(self):
+        """Yield ``(coefficient, pauli, qubits)`` for every term, with the
+        identities left out of ``pauli`` and ``qubits``."""
+        for c, row in zip(self.coefficients, self._letters()):
+            qubits = tuple(int(q) for q in np.flatnonzero(row != "I"))
+            yield complex(c), "".join(row[list(qubits)]), qubits
+
+    def num_terms(self):
+        return len(self.coefficients)
+
+    def __len__(self):
+        return len(self.coefficients)
+
+    def __getitem__(self, idx):
+        """The terms selected by an index, slice, mask or index array, as a
+        ``PauliSum``."""
+        if isinstance(idx, numbers.Integral):
+            idx = [idx]
+        return PauliSum(
+            self.num_qubits, self.x[idx], self.z[idx], self.coefficients[idx]
+        )
+
+    def __repr__(self):
+        if not len(self):
+            return "empty PauliSum"
+        out = f"{self.num_qubits}-qubit PauliSum with {len(self)} terms:\n"
+        for i, (c, pauli, qubits) in enumerate(self):
+            if not qubits:
+                pauli, qubits = "I", (0,)
+            c = c.real if c.imag == 0 else c
+            prefix = "└── " if i == len(self) - 1 else "├── "
+            out += f"{prefix}{c} * {pauli} @ q[{','.join(map(str, qubits))}]\n"
+        return out.strip()
+
+    def __str__(self):
+        return self.__repr__()
+
+    def _resized(self, num_qubits):
+        extra = _nwords(num_qubits) - self.x.shape[1]
+        if extra == 0:
+            return self
+        pad = ((0, 0), (0, extra))
+        return PauliSum(
+            num_qubits, np.pad(self.x, pad), np.pad(self.z, pad), self.coefficients
+        )
+
+    def _aligned(self, other):
+        n = max(self.num_qubits, other.num_qubits)
+        return self._resized(n), other._resized(n), n
+
+    def _identity(self, c):
+        nwords = self.x.shape[1]
+        zero = np.zeros((1, nwords), dtype=np.uint64)
+        return PauliSum(self.num_qubits, zero, zero, [c])
+
+    def __add__(self, other):
+        if isinstance(other, numbers.Number):
+            other = self._identity(other)
+        if not isinstance(other, PauliSum):
+            return NotImplemented
+        a, b, n = self._aligned(other)
+        return PauliSum(
+            n,
+            np.concatenate([a.x, b.x]),
+            np.concatenate([a.z, b.z]),
+            np.concatenate([a.coefficients, b.coefficients]),
+        )
+
+    def __radd__(self, other):
+        return self.__add__(other)
+
+    def __neg__(self):
+        return PauliSum(self.num_qubits, self.x, self.z, -self.coefficients)
+
+    def __sub__(self, other):
+        if isinstance(other, (numbers.Number, PauliSum)):
+            return self + (-other)
+        return NotImplemented
+
+    def __rsub__(self, other):
+        return (-self).__add__(other)
+
+    def __mul__(self, other):
+        """Scale by a number, or take the operator product with another
+        ``PauliSum``: one term per pair of terms, ``self`` on the left."""
+        if isinstance(other, numbers.Number):
+            return PauliSum(
+                self.num_qubits, self.x, self.z, self.coefficients * other
+            )
+        if not isinstance(other, PauliSum):
+            return NotImplemented
+        a, b, n = self._aligned(other)
+        x1, z1 = a.x[:, None, :], a.z[:, None, :]
+        x2, z2 = b.x[None, :, :], b.z[None, :, :]
+        x, z = x1 ^ x2, z1 ^ z2
+        # P(x, z) = i^|x & z| X^x Z^z, and Z^z1 X^x2 = (-1)^|z1 & x2| X^x2 Z^z1
+        k = (
+            _popcount(x1 & z1)
+            + _popcount(x2 & z2)
+            + 2 * _popcount(z1 & x2)
+            - _popcount(x & z)
+        ) % 4
+        phase = np.array([1, 1j, -1, -1j])[k]
+        coefficients = a.coefficients[:, None] * b.coefficients[None, :] * phase
+        nwords = _nwords(n)
+        return PauliSum(
+            n, x.reshape(-1, nwords), z.reshape(-1, nwords), coefficients.reshape(-1)
+        )
+
+    def __rmul__(self, other):
+        if isinstance(other, numbers.Number):
+            return self.__mul__(other)
+        return NotImplemented
+
+    def simplify(self, atol=1e-12):
+        """Merge repeated Pauli strings and drop negligible terms.
+
+        The merged terms keep the order of their first occurrence.
+
+        Args:
+            atol (float): Terms with ``abs(coefficient) <= atol`` are dropped.
+
+        Returns:
+            PauliSum: The simplified sum.
+        """
+        if not len(self):
+            return self
+        keys = np.concatenate([self.x, self.z], axis=1)
+        _, first, inverse = np.unique(
+            keys, axis=0, return_index=True, return_inverse=True
+        )
+        inverse = inverse.reshape(-1)
+        coefficients = np.zeros(len(first), dtype=np.complex128)
+        np.add.at(coefficients, inverse, self.coefficients)
+
+        order = np.argsort(first, kind="stable")
+        keep = order[np.abs(coefficients[order]) > atol]
+        rows = first[keep]
+        return PauliSum(
+            self.num_qubits, self.x[rows], self.z[rows], coefficients[keep]
+        )
+
+    def commutation_matrix(self, other=None, qubitwise=False):
+        """Whether every term of ``self`` commutes with every term of
+        ``other``.
+
+        Two Pauli strings commute when they anticommute on an even number of
+        qubits; they commute qubit-wise when they anticommute on none.
+
+        Args:
+            other (PauliSum, optional): Defaults to ``self``.
+            qubitwise (bool): Check qubit-wise commutation instead.
+
+        Returns:
+            numpy.ndarray: ``(len(self), len(other))`` boolean array.
+        """
+        a, b, _ = self._aligned(self if other is None else other)
+        x1, z1 = a.x[:, None, :], a.z[:, None, :]
+        x2, z2 = b.x[None, :, :], b.z[None, :, :]
+        anti = (x1 & z2) ^ (z1 & x2)
+        if qubitwise:
+            return ~np.any(anti, axis=-1)
+        return _popcount(anti) % 2 == 0
+
+    def commutes(self, other, atol=1e-12):
+        """Whether the two operators commute.
+
+        The commutator is ``2 * sum(c_i d_j P_i Q_j)`` over the pairs of
+        anticommuting terms; the operators commute when it simplifies to
+        zero.
+        """
+        anti = ~self.commutation_matrix(other)
+        if not anti.any():
+            return True
+        return not len((self * other)[anti.reshape(-1)].simplify(atol))
+
+
+__all__ = ["PauliSum"]
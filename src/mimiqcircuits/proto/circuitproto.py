@@ -572,6 +572,12 @@ def toproto_customgate(gate, declcache=None):
     )
 
 
+@gate_registry.register_toproto(mc.GateDiagonal)
+def toproto_diagonalgate(gate, declcache=None):
+    """Convert a GateDiagonal to protocol buffer format as a dense CustomGate."""
+    return toproto_customgate(mc.GateCustom(np.diag(gate.diagonal)), declcache)
+
+
 def toproto_gatedecl(gate, declcache=None):
     """Convert a GateDecl to protocol buffer format."""
     instructions_proto = list(
@@ -8,6 +8,7 @@ from mimiqcircuits.qasm.exceptions import (
 )
 from mimiqcircuits.qasm.interpreter import load, loads
 from mimiqcircuits.qasm.serializer import dump, dumps
+from mimiqcircuits.qasm.parser import set_include_cache_dir
 
 __all__ = [
     "QASMError",
@@ -20,4 +21,5 @@ __all__ = [
     "loads",
     "dump",
     "dumps",
+    "set_include_cache_dir",
 ]
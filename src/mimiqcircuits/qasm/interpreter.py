@@ -2,14 +2,14 @@
 # Proprietary and confidential.
 #
 from dataclasses import dataclass, field
-from typing import Any, Dict, List, Set, Union
+from typing import Any, Dict, Iterable, List, Set, Union
 
 import symengine as se
 
 import mimiqcircuits as mc
 from mimiqcircuits.gatedecl import GateDecl
 from mimiqcircuits.qasm.exceptions import QASMError
-from mimiqcircuits.qasm.parser import QASMExpr, parseopenqasm
+from mimiqcircuits.qasm.parser import QASMExpr, iterparseopenqasm, parseopenqasm
 
 
 class QASMStructureError(QASMError):
@@ -289,6 +289,8 @@ def interpret_if(istate: InterpreterState, expr: QASMExpr):
         lastqreg=istate.lastqreg,
         lastcreg=istate.lastcreg,
         gates=istate.gates,
+        pending_gates=istate.pending_gates,
+        compiling_gates=istate.compiling_gates,
         vars_map=istate.vars_map,
         circuit=mc.Circuit(),
     )
@@ -409,6 +411,23 @@ def interpret_opaque(istate: InterpreterState, expr: QASMExpr):
         raise QASMArgumentError(f"Unsupported opaque gate {name}")
 
 
+def _declared_name(stmt: QASMExpr) -> str:
+    return stmt.args[0].args[0].args[0]
+
+
+def interpret_statement(istate: InterpreterState, stmt: QASMExpr):
+    if stmt.head in {"qreg", "creg"}:
+        interpret_regs(istate, stmt)
+    elif stmt.head == "gate":
+        compile_pending_gate(istate, _declared_name(stmt))
+    elif stmt.head == "opaque":
+        interpret_opaque(istate, stmt)
+    elif stmt.head == "if":
+        interpret_if(istate, stmt)
+    else:
+        interpret_qop(istate, stmt)
+
+
 def interpret(expr: QASMExpr) -> mc.Circuit:
     istate = InterpreterState()
 
@@ -421,22 +440,97 @@ def interpret(expr: QASMExpr) -> mc.Circuit:
 
     for stmt in expr.args[1:]:
         if stmt.head == "gate":
-            unitary = stmt.args[0]
-            gatecall = unitary.args[0]
-            decl_name = gatecall.args[0]
-            istate.pending_gates[decl_name] = stmt
+            istate.pending_gates[_declared_name(stmt)] = stmt
 
     for stmt in expr.args[1:]:
-        if stmt.head in {"qreg", "creg"}:
-            interpret_regs(istate, stmt)
-        elif stmt.head == "gate":
-            compile_pending_gate(istate, stmt.args[0].args[0].args[0])
+        interpret_statement(istate, stmt)
+
+    return istate.circuit
+
+
+# Gate declarations compiled from include files, by absolute path:
+# (the parsed statements they were compiled from, name -> GateDecl).
+COMPILED_INCLUDES: Dict[str, Any] = {}
+
+
+def include_gates(path: str, stmts: List[QASMExpr]) -> Dict[str, GateDecl]:
+    """Gate declarations of an include file, compiled once per parsed file.
+
+    Declarations whose bodies need gates from outside the file are left
+    out, and are compiled with the program instead. Opaque declarations are
+    checked here, once.
+    """
+    cached = COMPILED_INCLUDES.get(path)
+    if cached is not None and cached[0] is stmts:
+        return cached[1]
+
+    istate = InterpreterState()
+    names = []
+    for stmt in stmts:
+        if stmt.head == "gate":
+            names.append(_declared_name(stmt))
+            istate.pending_gates[names[-1]] = stmt
         elif stmt.head == "opaque":
             interpret_opaque(istate, stmt)
-        elif stmt.head == "if":
-            interpret_if(istate, stmt)
+
+    for name in names:
+        try:
+            compile_pending_gate(istate, name)
+        except QASMError:
+            pass
+
+    gates = {name: istate.gates[name] for name in names if name in istate.gates}
+    COMPILED_INCLUDES[path] = (stmts, gates)
+    return gates
+
+
+def interpret_include(istate: InterpreterState, expr: QASMExpr):
+    path, stmts = expr.args
+    gates = include_gates(path, stmts)
+    for stmt in stmts:
+        if stmt.head == "opaque":
+            continue
+        if stmt.head != "gate":
+            interpret_statement(istate, stmt)
+            continue
+        name = _declared_name(stmt)
+        if name in istate.gates:
+            continue
+        if name in gates:
+            istate.pending_gates.pop(name, None)
+            istate.gates[name] = gates[name]
         else:
-            interpret_qop(istate, stmt)
+            istate.pending_gates[name] = stmt
+
+
+def interpret_statements(statements: Iterable[QASMExpr]) -> mc.Circuit:
+    """Interpret OpenQASM statements in a single pass as they arrive.
+
+    Unlike :func:`interpret`, which needs the whole program, each statement
+    is applied to the circuit as soon as it is produced and then dropped.
+    Only ``gate`` declarations are kept, and their bodies are compiled the
+    first time the gate is used, so a gate body may still refer to gates
+    declared after it. The gates of ``include`` statements are compiled once
+    per process and shared by every program including the same file (see
+    :func:`include_gates`). Gates must be declared before their first use in the
+    program, as the OpenQASM 2 specification requires.
+
+    Args:
+        statements: Iterable of statements, e.g. from
+            :func:`~mimiqcircuits.qasm.parser.iterparseopenqasm`.
+
+    Returns:
+        mc.Circuit: The interpreted circuit.
+    """
+    istate = InterpreterState()
+
+    for stmt in statements:
+        if stmt.head == "gate":
+            istate.pending_gates[_declared_name(stmt)] = stmt
+        elif stmt.head == "include":
+            interpret_include(istate, stmt)
+        else:
+            interpret_statement(istate, stmt)
 
     return istate.circuit
 
@@ -444,6 +538,9 @@ def interpret(expr: QASMExpr) -> mc.Circuit:
 def loads(s: str, includedirs: List[str] = None) -> mc.Circuit:
     """Parse and interpret an OpenQASM 2.0 string.
 
+    The program is interpreted while it is parsed, one statement at a time
+    (see :func:`interpret_statements`).
+
     Args:
         s (str): The OpenQASM 2.0 string.
         includedirs (List[str], optional): List of directories to search for included files.
@@ -451,8 +548,10 @@ def loads(s: str, includedirs: List[str] = None) -> mc.Circuit:
     Returns:
         mc.Circuit: The interpreted circuit.
     """
-    expr = parseopenqasm(s, includedirs)
-    return interpret(expr)
+    version, statements = iterparseopenqasm(s, includedirs)
+    if version != 2.0:
+        raise QASMVersionError(f"Unsupported version {version}")
+    return interpret_statements(statements)
 
 
 def load(filename: str, includedirs: List[str] = None) -> mc.Circuit:
@@ -2,7 +2,9 @@
 # Proprietary and confidential.
 #
 import io
-from typing import Callable, Iterator, Optional, Union
+import re
+from bisect import bisect_right
+from typing import Iterator, Union
 
 from mimiqcircuits.qasm.tokens import KEYWORDS, Token, TokenKind
 
@@ -14,42 +16,89 @@ UNICODE_OPS = {
     "^": TokenKind.CIRCUMFLEX_ACCENT,
 }
 
+# Single-character tokens that carry no text.
+PUNCTUATION = {
+    "[": TokenKind.LSQUARE,
+    "]": TokenKind.RSQUARE,
+    "{": TokenKind.LBRACE,
+    "}": TokenKind.RBRACE,
+    "(": TokenKind.LPAREN,
+    ")": TokenKind.RPAREN,
+    ",": TokenKind.COMMA,
+    ";": TokenKind.SEMICOLON,
+    "+": TokenKind.PLUS,
+    "-": TokenKind.MINUS,
+    "−": TokenKind.MINUS,
+    "*": TokenKind.STAR,
+    "/": TokenKind.FWD_SLASH,
+    "^": TokenKind.CIRCUMFLEX_ACCENT,
+}
 
-class Lexer:
-    def __init__(self, input_source: Union[str, io.TextIOBase]):
-        if isinstance(input_source, str):
-            self.io = io.StringIO(input_source)
-        else:
-            self.io = input_source
+# One alternative per token class, tried in order at the current offset, most
+# frequent first. Plain integers have their own fast alternative; other
+# numbers are matched generously and validated in ``Lexer._number``.
+_MASTER = re.compile(
+    r"""
+    (?P<punct>[\[\](),;{}+^−]|-(?!>)|\*(?!\*)|/(?!/))
+    | (?P<ident>[^\W\d]\w*)
+    | (?P<int>\d[\d_]*(?![\d_.eE]))
+    | (?P<ws>\s+)
+    | (?P<comment>//[^\n]*)
+    | (?P<num>
+        (?P<lead>\.)?\d[\d_]*
+        (?P<frac>\.[\d_]*)?
+        (?:[eE](?=[\d+-])[+-]?(?P<exp>\d*))?
+        (?P<trail>\.)?
+      )
+    | (?P<string>"(?:[^"\\]|\\.)*")
+    | (?P<arrow>->)
+    | (?P<eqeq>==)
+    | (?P<doublestar>\*\*)
+    | (?P<other>.)
+    """,
+    re.VERBOSE | re.DOTALL,
+)
+
+# An unterminated string: a quote with no closing quote before the end.
+_OPEN_STRING = re.compile(r'"(?:[^"\\]|\\.)*\\?\Z', re.DOTALL)
+
+_NEWLINE = re.compile("\n")
+
+
+class LineIndex:
+    """Maps offsets in a source text to 1-based ``(line, column)`` pairs.
+
+    The line starts are found on the first lookup, so sources whose token
+    positions are never inspected never pay for them.
+    """
+
+    def __init__(self, text: str):
+        self.text = text
+        self._starts = None
+
+    def position(self, offset: int):
+        if self._starts is None:
+            self._starts = [0] + [m.end() for m in _NEWLINE.finditer(self.text)]
+        row = bisect_right(self._starts, offset)
+        return row, offset - self._starts[row - 1] + 1
 
-        self.io_startpos = self.io.tell()
 
-        # Current token start position
-        self.token_start_row = 1
-        self.token_start_col = 1
-        self.token_startpos = self.io_startpos
+class Lexer:
+    """Tokenizer of OpenQASM 2 sources.
 
-        # Current scanner position
-        self.current_row = 1
-        self.current_col = 1
-        self.current_pos = self.io_startpos
+    The whole source is read once and scanned with a single compiled regular
+    expression; tokens record their offsets and compute line and column
+    information only when asked.
+    """
 
+    def __init__(self, input_source: Union[str, io.TextIOBase]):
+        if isinstance(input_source, str):
+            self.text = input_source
+        else:
+            self.text = input_source.read()
+        self.lines = LineIndex(self.text)
         self.last_token_kind = TokenKind.ERROR
-        self.charstore = io.StringIO()
-
-        # Lookahead buffer (c1, c2, c3)
-        self.chars = ["", "", ""]
-
-        # Initialize buffer
-        c1 = self.io.read(1)
-        c2 = self.io.read(1)
-        c3 = self.io.read(1)
-
-        self.chars = [c1, c2, c3]
-
-        # Reset position to start for logic consistency
-
-        self.doread = False
+        self.seekstart()
 
     def __iter__(self) -> Iterator[Token]:
         self.seekstart()
@@ -62,297 +111,119 @@ class Lexer:
         return t
 
     def seekstart(self):
-        self.io.seek(self.io_startpos)
-        self.current_row = 1
-        self.current_col = 1
-        self.token_start_row = 1
-        self.token_start_col = 1
-        # Refill buffer
-        self.io.seek(self.io_startpos)
-        c1 = self.io.read(1)
-        c2 = self.io.read(1)
-        c3 = self.io.read(1)
-
-        self.chars = [c1, c2, c3]
-        self.current_pos = self.io.tell()
-
-    def start_token(self):
-        self.token_startpos = self.current_pos  # Roughly
-        self.token_start_row = self.current_row
-        self.token_start_col = self.current_col
-
-    def readchar(self) -> str:
-        # Shift buffer
-        c = self.io.read(1)
-
-        current_char = self.chars[0]
-        self.chars[0] = self.chars[1]
-        self.chars[1] = self.chars[2]
-        self.chars[2] = c
-
-        if self.doread:
-            self.charstore.write(current_char)
-
-        if current_char == "\n":
-            self.current_row += 1
-            self.current_col = 1
-        elif current_char != "":
-            self.current_col += 1
-
-        return current_char
-
-    def readon(self, c: Optional[str] = None):
-        # Clear charstore and start accumulating
-        self.charstore = io.StringIO()
-        if c is not None:
-            self.charstore.write(c)
-        self.doread = True
-
-    def readoff(self):
-        self.doread = False
-        return self.chars[0]
-
-    def peekchar(self):
-        return self.chars[0]
-
-    def dpeekchar(self):
-        return self.chars[0], self.chars[1]
-
-    def accept(self, f: Union[Callable[[str], bool], str, set]) -> bool:
-        c = self.peekchar()
-        ok = False
-        if callable(f):
-            ok = f(c)
-        elif isinstance(f, str):
-            ok = c == f
-        else:  # set/list
-            ok = c in f
-
-        if ok:
-            self.readchar()
-        return ok
-
-    def accept_batch(self, f) -> bool:
-        ok = False
-        while self.accept(f):
-            ok = True
-        return ok
-
-    def emit(self, kind: TokenKind, err: Optional[str] = None) -> Token:
-        if kind == TokenKind.ERROR:
-            s = self.charstore.getvalue()
-        elif (
-            kind == TokenKind.IDENTIFIER
-            or is_literal(kind)
-            or kind == TokenKind.WHITESPACE
-            or kind == TokenKind.COMMENT
-        ):
-            s = self.charstore.getvalue()
-        else:
-            s = ""
-
-        # Reset charstore
-        self.charstore = io.StringIO()
-
-        tok = Token(
-            kind=kind,
-            startpos=(self.token_start_row, self.token_start_col),
-            endpos=(self.current_row, self.current_col - 1),
-            val=s,
-            token_error=err,
-        )
-        self.last_token_kind = kind
-        self.readoff()
-        return tok
-
-    def emit_error(self, err: str = "unknown"):
-        return self.emit(TokenKind.ERROR, err)
+        self._tokens = self._scan()
 
     def next_token(self, start=True) -> Token:
-        if start:
-            self.start_token()
-
-        c = self.readchar()
-
-        if c == "":
-            return self.emit(TokenKind.ENDMARKER)
-        elif c.isspace():
-            return self.lex_whitespace(c)
-        elif c == "[":
-            return self.emit(TokenKind.LSQUARE)
-        elif c == "]":
-            return self.emit(TokenKind.RSQUARE)
-        elif c == "{":
-            return self.emit(TokenKind.LBRACE)
-        elif c == ";":
-            return self.emit(TokenKind.SEMICOLON)
-        elif c == "}":
-            return self.emit(TokenKind.RBRACE)
-        elif c == "(":
-            return self.emit(TokenKind.LPAREN)
-        elif c == ",":
-            return self.emit(TokenKind.COMMA)
-        elif c == ")":
-            return self.emit(TokenKind.RPAREN)
-        elif c == "*":
-            return self.lex_star(c)
-        elif c == "^":
-            return self.emit(TokenKind.CIRCUMFLEX_ACCENT)
-        elif c == "/":
-            return self.lex_fwdslash(c)
-        elif c == "+":
-            return self.emit(TokenKind.PLUS)
-        elif c == "-":
-            return self.lex_minus(c)
-        elif c == "=":
-            return self.lex_equal(c)
-        elif c == '"':
-            return self.lex_quote()
-        elif c.isidentifier() or c == "_" or c.isalpha():
-            return self.lex_identifier(c)
-        elif c.isdigit():
-            return self.lex_digit(c, TokenKind.INTEGER)
-        elif c == ".":
-            # Check if it's a real number starting with .
-            pc = self.peekchar()
-            if pc.isdigit():
-                return self.lex_digit(c, TokenKind.REAL)
-            else:
-                return self.emit_error()
-        elif c in UNICODE_OPS:
-            return self.emit(UNICODE_OPS[c])
-        else:
-            return self.emit_error()
-
-    def lex_whitespace(self, c):
-        self.readon(c)
-        self.accept_batch(lambda ch: ch.isspace())
-        return self.emit(TokenKind.WHITESPACE)
-
-    def lex_star(self, c):
-        if self.accept("*"):
-            return self.emit_error("invalid operator")
-        return self.emit(TokenKind.STAR)
-
-    def lex_minus(self, c):
-        if self.accept(">"):
-            return self.emit(TokenKind.ARROW)
-        return self.emit(TokenKind.MINUS)
-
-    def lex_equal(self, c):
-        if not self.accept("="):
-            return self.emit_error("invalid operator")
-        return self.emit(TokenKind.EQEQ)
-
-    def lex_fwdslash(self, c):
-        self.readon(c)
-        if self.accept("/"):
-            # It's a comment //
-            while True:
-                pc = self.peekchar()
-                if pc == "\n" or pc == "":
-                    return self.emit(TokenKind.COMMENT)
-                self.readchar()
-        return self.emit(TokenKind.FWD_SLASH)
-
-    def lex_quote(self):
-        self.readon()
-        if self.accept('"'):
-            return self.emit(TokenKind.STRING)
-
-        self.charstore = io.StringIO()  # Clean
-        self.doread = True  # Start reading
-
-        while True:
-            c = self.peekchar()
-            if c == "\\":
-                self.readchar()  # consume backslash
-                if self.peekchar() == "":
-                    return self.emit_error("unterminated string literal")
-                self.readchar()  # consume escaped char
-                continue
-
-            if c == '"':
-                # End of string
-                tok = self.emit(TokenKind.STRING)
-                self.readchar()  # consume closing quote
-                return tok
-            elif c == "":
-                return self.emit_error("unterminated string literal")
-            else:
-                self.readchar()
-
-    def lex_identifier(self, c):
-        self.readon(c)
-        while True:
-            pc = self.peekchar()
-            if pc.isidentifier() or pc.isdigit() or pc == "_":
-                self.readchar()
-            else:
-                break
-
-        # Extract string
-        s = self.charstore.getvalue()
-        # Check keywords
-        kw_kind = KEYWORDS.get(s, TokenKind.IDENTIFIER)
-
-        return self.emit(kw_kind)
-
-    def lex_digit(self, c, kind):
-        self.readon(c)
-
-        def accept_number():
-            while True:
-                pc = self.peekchar()
-                if pc == "_":  # 1_000
-                    self.readchar()  # consume _
-                    continue
-                if pc.isdigit():
-                    self.readchar()
-                else:
-                    return
-
-        accept_number()
-
-        pc, ppc = self.dpeekchar()
-
-        if pc == ".":
-            if kind == TokenKind.REAL:
-                self.readchar()
-                return self.emit_error("invalid numeric constant")
-
-            self.readchar()  # consume .
-            kind = TokenKind.REAL
-            accept_number()
+        t = next(self._tokens)
+        self.last_token_kind = t.kind
+        return t
 
-            pc, ppc = self.dpeekchar()
-            if (pc == "e" or pc == "E") and (
-                ppc.isdigit() or ppc == "+" or ppc == "-"
-            ):
-                # Exponent
-                self.readchar()  # consume e
-                self.accept({"+", "-"})
-                if self.accept_batch(lambda c: c.isdigit()):
-                    pc, _ = self.dpeekchar()
-                    if pc == ".":
-                        self.readchar()
-                        return self.emit_error("invalid numeric constant")
+    def _scan(self) -> Iterator[Token]:
+        text = self.text
+        lines = self.lines
+        keywords = KEYWORDS
+        punctuation = PUNCTUATION
+        IDENTIFIER = TokenKind.IDENTIFIER
+        INTEGER = TokenKind.INTEGER
+        WHITESPACE = TokenKind.WHITESPACE
+
+        resume = 0
+        while resume is not None:
+            matches = _MASTER.finditer(text, resume)
+            resume = None
+            for m in matches:
+                group = m.lastgroup
+                pos, end = m.span()
+                if group == "punct":
+                    kind = punctuation[m.group()]
+                    yield Token(kind, None, None, pos, end, "", None, lines)
+                elif group == "ident":
+                    s = m.group()
+                    kind = keywords.get(s)
+                    if kind is None:
+                        yield Token(IDENTIFIER, None, None, pos, end, s, None, lines)
+                    else:
+                        yield Token(kind, None, None, pos, end, "", None, lines)
+                elif group == "int":
+                    yield Token(INTEGER, None, None, pos, end, m.group(), None, lines)
+                elif group == "ws":
+                    yield Token(WHITESPACE, None, None, pos, end, m.group(), None, lines)
                 else:
-                    return self.emit_error()
-
-        # Check for start of exponent without dot
-        elif (pc == "e" or pc == "E") and (ppc.isdigit() or ppc == "+" or ppc == "-"):
-            kind = TokenKind.REAL
-            self.readchar()  # consume e
-            self.accept({"+", "-"})
-            if not self.accept_batch(lambda c: c.isdigit()):
-                return self.emit_error()
-            pc, _ = self.dpeekchar()
-            if pc == ".":
-                self.readchar()
-                return self.emit_error()
-
-        return self.emit(kind)
+                    t = self._other(m)
+                    yield t
+                    if t.endbyte != end:
+                        # the token is not the whole match: rescan after it
+                        resume = t.endbyte
+                        break
+
+        end = len(text)
+        while True:
+            yield Token(TokenKind.ENDMARKER, None, None, end, end, "", None, lines)
+
+    def _token(self, kind, start, end, val="", err=None) -> Token:
+        return Token(kind, None, None, start, end, val, err, self.lines)
+
+    def _other(self, m) -> Token:
+        """Token of the less frequent alternatives of the master pattern."""
+        group = m.lastgroup
+        pos, end = m.span()
+        text = self.text
+        if group == "comment":
+            return self._token(TokenKind.COMMENT, pos, end, m.group())
+        elif group == "num":
+            return self._number(m, pos)
+        elif group == "string":
+            return self._token(TokenKind.STRING, pos, end, text[pos + 1 : end - 1])
+        elif group == "arrow":
+            return self._token(TokenKind.ARROW, pos, end)
+        elif group == "eqeq":
+            return self._token(TokenKind.EQEQ, pos, end)
+        elif group == "doublestar":
+            return self._token(TokenKind.ERROR, pos, end, err="invalid operator")
+        elif m.group() == '"':
+            end = _OPEN_STRING.match(text, pos).end()
+            return self._token(
+                TokenKind.ERROR,
+                pos,
+                end,
+                text[pos + 1 : end],
+                "unterminated string literal",
+            )
+        elif m.group() == "=":
+            return self._token(TokenKind.ERROR, pos, end, err="invalid operator")
+        else:
+            return self._token(TokenKind.ERROR, pos, end, err="unknown")
+
+    def _number(self, m, pos) -> Token:
+        """Validate the numeric literal matched by ``m``.
+
+        A literal is ``INTEGER`` unless it has a leading dot, a fraction or
+        an exponent. Malformed literals (a second dot, an exponent without
+        digits) become ``ERROR`` tokens holding the text scanned so far.
+        """
+        lead, frac, exp, trail = m.group("lead", "frac", "exp", "trail")
+        end = m.end("num")
+        if lead is not None and frac is not None:
+            end = m.start("frac") + 1
+            return self._token(
+                TokenKind.ERROR,
+                pos,
+                end,
+                self.text[pos:end],
+                "invalid numeric constant",
+            )
+        if exp is None:
+            kind = TokenKind.REAL if lead or frac else TokenKind.INTEGER
+            if trail is not None:
+                end -= 1
+            return self._token(kind, pos, end, self.text[pos:end])
+        if not exp:
+            end = m.end("exp")
+            return self._token(TokenKind.ERROR, pos, end, self.text[pos:end], "unknown")
+        if trail is not None:
+            err = "invalid numeric constant" if frac is not None else "unknown"
+            return self._token(TokenKind.ERROR, pos, end, self.text[pos:end], err)
+        return self._token(TokenKind.REAL, pos, end, self.text[pos:end])
 
 
 def tokenize(text: str) -> Iterator[Token]:
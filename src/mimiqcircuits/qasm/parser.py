@@ -1,9 +1,11 @@
 # Copyright (C) 2023 QPerfect. All Rights Reserved.
 # Proprietary and confidential.
 #
+import hashlib
 import os
+import pickle
 from dataclasses import dataclass, field
-from typing import Any, Dict, List, Set, Union
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple, Union
 
 from mimiqcircuits.qasm.exceptions import ParseError
 from mimiqcircuits.qasm.lexer import Lexer
@@ -447,46 +449,106 @@ def parse_statement(ps: ParserState):
         raise ParseError("Unexpected statement", ps.peektoken(), ps)
 
 
-PARSED_INCLUDES: Dict[str, List[QASMExpr]] = {}
+# Parsed include files, by absolute path: (modification time, statements).
+PARSED_INCLUDES: Dict[str, Tuple[int, List[QASMExpr]]] = {}
 
+# Directory of the on-disk cache of parsed include files, if enabled.
+INCLUDE_CACHE_DIR: Optional[str] = None
 
-def parse_include(ps: ParserState):
-    ps.expectnext(TokenKind.INCLUDE)
-    t = ps.expectnext(TokenKind.STRING)
-    ps.expectnext(TokenKind.SEMICOLON)
-    fname = t.val
 
-    # Check cache
-    if fname in PARSED_INCLUDES:
-        return PARSED_INCLUDES[fname]
+def set_include_cache_dir(path: Optional[str]):
+    """Enable (or, with ``None``, disable) the on-disk include cache.
 
-    # Resolve file
-    found_path = None
-    for d in ps.includedirs:
-        p = os.path.join(d, fname)
-        if os.path.isfile(p):
-            found_path = p
-            break
+    Parsed include files are then also pickled to ``path``, so that new
+    processes can skip parsing them. Entries are keyed by the absolute path
+    of the include and invalidated when its modification time or size
+    changes.
+    """
+    global INCLUDE_CACHE_DIR
+    if path is not None:
+        os.makedirs(path, exist_ok=True)
+    INCLUDE_CACHE_DIR = path
 
-    if not found_path:
-        raise ParseError(f"Include file {fname} not found", t, ps)
 
-    # Parse include
-    with open(found_path, "r") as f:
-        content = f.read()
+def find_include(fname: str, includedirs: List[str]) -> Optional[str]:
+    """Absolute path of the include file ``fname``, or ``None``."""
+    for d in includedirs:
+        p = os.path.join(d, fname)
+        if os.path.isfile(p):
+            return os.path.abspath(p)
+    return None
 
-    sub_lexer = Lexer(content)
-    sub_ps = ParserState(sub_lexer, ps.includedirs)
 
+def _parse_include_source(content: str, includedirs: List[str]) -> List[QASMExpr]:
+    sub_ps = ParserState(Lexer(content), includedirs)
     stmts = []
     while sub_ps.peektoken().kind != TokenKind.ENDMARKER:
         stmts.append(parse_statement(sub_ps))
+    return stmts
+
+
+def _include_cache_file(path: str) -> str:
+    digest = hashlib.sha1(path.encode()).hexdigest()
+    return os.path.join(INCLUDE_CACHE_DIR, f"{digest}.pickle")
+
+
+def load_include(path: str, includedirs: List[str] = None) -> List[QASMExpr]:
+    """Parsed statements of the include file at ``path``.
 
-    # Cache
-    PARSED_INCLUDES[fname] = stmts
+    The result is cached for the whole process, keyed by absolute path and
+    modification time, and in :data:`INCLUDE_CACHE_DIR` when enabled with
+    :func:`set_include_cache_dir`. The returned list is shared and must not
+    be modified.
+    """
+    path = os.path.abspath(path)
+    st = os.stat(path)
+    cached = PARSED_INCLUDES.get(path)
+    if cached is not None and cached[0] == st.st_mtime_ns:
+        return cached[1]
+
+    stmts = None
+    key = (path, st.st_mtime_ns, st.st_size)
+    if INCLUDE_CACHE_DIR is not None:
+        try:
+            with open(_include_cache_file(path), "rb") as f:
+                stored_key, stored = pickle.load(f)
+            if stored_key == key:
+                stmts = stored
+        except (OSError, pickle.UnpicklingError, EOFError, ValueError):
+            pass
+
+    if stmts is None:
+        with open(path, "r") as f:
+            content = f.read()
+        stmts = _parse_include_source(content, includedirs or [])
+        if INCLUDE_CACHE_DIR is not None:
+            try:
+                with open(_include_cache_file(path), "wb") as f:
+                    pickle.dump((key, stmts), f)
+            except OSError:
+                pass
+
+    PARSED_INCLUDES[path] = (st.st_mtime_ns, stmts)
     return stmts
 
 
+def parse_include_path(ps: ParserState) -> str:
+    """Parse an ``include`` statement and return the absolute path of the
+    file it names."""
+    ps.expectnext(TokenKind.INCLUDE)
+    t = ps.expectnext(TokenKind.STRING)
+    ps.expectnext(TokenKind.SEMICOLON)
+
+    found_path = find_include(t.val, ps.includedirs)
+    if not found_path:
+        raise ParseError(f"Include file {t.val} not found", t, ps)
+    return found_path
+
+
+def parse_include(ps: ParserState):
+    return load_include(parse_include_path(ps), ps.includedirs)
+
+
 def parse_version(ps: ParserState):
     ps.expectnext(TokenKind.OPENQASM)
     version = parse_real_value(ps)
@@ -498,22 +560,36 @@ def parse_version(ps: ParserState):
     return version
 
 
-def parse_program(ps: ParserState):
-    # Check for empty or comment only start?
-
+def parse_header(ps: ParserState) -> float:
     # Peek to see if OpenQASM header exists
     if ps.peektoken().kind == TokenKind.OPENQASM:
-        version = parse_version(ps)
-    else:
-        version = 2.0  # Default if missing
+        return parse_version(ps)
+    return 2.0  # Default if missing
 
-    statements = []
+
+def iter_statements(
+    ps: ParserState, expand_includes: bool = True
+) -> Iterator[QASMExpr]:
+    """Parse the statements of a program one at a time.
+
+    Each statement is yielded as soon as it is parsed, so no tree of the
+    whole program is built. Included files are expanded in place, or, with
+    ``expand_includes=False``, yielded as one ``include`` statement holding
+    the absolute path and the (cached) statements of the file.
+    """
     while ps.peektoken().kind != TokenKind.ENDMARKER:
-        if ps.peektoken().kind == TokenKind.INCLUDE:
-            statements.extend(parse_include(ps))
+        if ps.peektoken().kind != TokenKind.INCLUDE:
+            yield parse_statement(ps)
+        elif expand_includes:
+            yield from parse_include(ps)
         else:
-            statements.append(parse_statement(ps))
+            path = parse_include_path(ps)
+            yield QASMExpr("include", [path, load_include(path, ps.includedirs)])
+
 
+def parse_program(ps: ParserState):
+    version = parse_header(ps)
+    statements = list(iter_statements(ps))
     return QASMExpr("program", [version] + statements)
 
 
@@ -521,3 +597,19 @@ def parseopenqasm(source: str, includedirs: List[str] = None):
     lexer = Lexer(source)
     ps = ParserState(lexer, includedirs)
     return parse_program(ps)
+
+
+def iterparseopenqasm(
+    source: str, includedirs: List[str] = None
+) -> Tuple[float, Iterator[QASMExpr]]:
+    """Parse the header of an OpenQASM source and stream its statements.
+
+    Returns:
+        The version of the program and an iterator over its statements,
+        which parses the source as it is consumed. Included files are
+        yielded as ``include`` statements (see :func:`iter_statements`).
+    """
+    lexer = Lexer(source)
+    ps = ParserState(lexer, includedirs)
+    version = parse_header(ps)
+    return version, iter_statements(ps, expand_includes=False)
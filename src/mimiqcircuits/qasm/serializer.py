@@ -559,6 +559,126 @@ def _expr_to_str(expr):
     return str(expr)
 
 
+# Names of the operation types whose QASM name depends only on the type,
+# filled on first use by ``_gate_name``.
+_TYPE_NAMES: Dict[type, str] = {}
+
+# Types whose instances may map to different QASM names.
+_GENERIC_TYPES = (mc.Control, mc.Power, mc.Inverse, GateCall)
+
+# Number of statements buffered before each write to the output.
+WRITE_BATCH = 4096
+
+
+def _gate_name(op: mc.Operation) -> str:
+    t = type(op)
+    name = _TYPE_NAMES.get(t)
+    if name is None:
+        name = gate_to_qasm(op)
+        if t not in _GENERIC_TYPES:
+            _TYPE_NAMES[t] = name
+    return name
+
+
+def _scan_for_qasm(c: mc.Circuit, cache: Dict):
+    """First pass of :func:`write_qasm` over the decomposed instructions.
+
+    Returns the ``(num_qubits, num_bits, uses_std_gates, gatecall_instructions)``
+    of the decomposed circuit, keeping one instruction per distinct declaration.
+    """
+    from mimiqcircuits.decomposition import DecomposeIterator
+    from mimiqcircuits.decomposition.basis import QASMBasis
+
+    nq = 0
+    nb = 0
+    std = False
+    calls = {}
+    for inst in DecomposeIterator(c, QASMBasis(), wrap=True, cache=cache):
+        if inst.zvars:
+            raise QASMSerializationError(
+                "Circuit with Z-register variables cannot be converted to QASM"
+            )
+        if inst.qubits:
+            nq = max(nq, max(inst.qubits) + 1)
+        if inst.bits:
+            nb = max(nb, max(inst.bits) + 1)
+        op = inst.operation
+        if isinstance(op, GateCall):
+            if op.decl in calls:
+                continue
+            calls[op.decl] = inst
+        if not std:
+            std = uses_std_gates((inst,))
+    return nq, nb, std, list(calls.values())
+
+
+def write_qasm(c: mc.Circuit, fp, sanitize_names: bool = True):
+    """Write a circuit as OpenQASM 2.0 to the text stream ``fp``.
+
+    Statements are produced and written in batches as the circuit is
+    decomposed, so no representation of the whole output is held in memory.
+    A first pass over the decomposition collects the gate declarations,
+    which must precede the instructions; the second pass writes the
+    instructions, reusing the QASM name of every operation type.
+
+    Args:
+        c (mc.Circuit): The circuit to serialize.
+        fp: Text stream to write to.
+        sanitize_names: Whether to sanitize gate names for QASM compliance.
+    """
+    from mimiqcircuits.decomposition import DecomposeIterator
+    from mimiqcircuits.decomposition.basis import QASMBasis
+
+    # both passes share the wrapping cache, so they see the same declarations
+    cache = {}
+    nq, nb, std, calls = _scan_for_qasm(c, cache)
+    decl_names = {}
+    _collect_gatedecls(decl_names, calls, sanitize_names=sanitize_names)
+
+    header = io.StringIO()
+    header.write("OPENQASM 2.0;\n")
+    if std:
+        header.write('include "qelib1.inc";\n')
+    for decl in decl_names:
+        print_qasm_expr(
+            gatedecl_to_qasm(decl, decl_names, sanitize_names=sanitize_names),
+            header,
+        )
+        header.write("\n")
+    header.write(f"qreg q[{nq}];\n")
+    if nb > 0:
+        header.write(f"creg c[{nb}];\n")
+    fp.write(header.getvalue())
+
+    lines = []
+    for inst in DecomposeIterator(c, QASMBasis(), wrap=True, cache=cache):
+        op = inst.operation
+        qs = inst.qubits
+        if isinstance(op, mc.Measure):
+            cb = inst.bits[0] if inst.bits else qs[0]
+            lines.append(f"measure q[{qs[0]}] -> c[{cb}];\n")
+        elif isinstance(op, (mc.Reset, mc.Barrier)):
+            head = "reset" if isinstance(op, mc.Reset) else "barrier"
+            lines.append(f"{head} " + ",".join(f"q[{q}]" for q in qs) + ";\n")
+        else:
+            if isinstance(op, GateCall):
+                name = decl_names[op.decl]
+                args = op.arguments
+            else:
+                name = _gate_name(op)
+                args = args_to_qasm(op)
+            targets = ",".join(f"q[{q}]" for q in qs)
+            if args:
+                params = ",".join(_expr_to_str(a) for a in args)
+                lines.append(f"{name}({params}) {targets};\n")
+            else:
+                lines.append(f"{name} {targets};\n")
+        if len(lines) >= WRITE_BATCH:
+            fp.write("".join(lines))
+            lines.clear()
+    fp.write("".join(lines))
+
+
 def dumps(
     c: mc.Circuit, decompose_wrappers: bool = False, sanitize_names: bool = True
 ) -> str:
@@ -572,34 +692,35 @@ def dumps(
     Returns:
         str: The OpenQASM 2.0 string representation.
     """
-    expr = circuit_to_qasm(c, sanitize_names=sanitize_names)
     s = io.StringIO()
-    print_qasm_expr(expr, s, level=0)
+    write_qasm(c, s, sanitize_names=sanitize_names)
     return s.getvalue()
 
 
 def dump(
     c: mc.Circuit,
-    filename: str,
+    filename: Union[str, io.TextIOBase],
     decompose_wrappers: bool = False,
     sanitize_names: bool = True,
 ):
     """Serialize a circuit to an OpenQASM 2.0 file.
 
+    The output is streamed to the file while the circuit is converted (see
+    :func:`write_qasm`).
+
     Args:
         c (mc.Circuit): The circuit to serialize.
-        filename (str): The file path to write to.
+        filename (str or file object): The file path, or an open text
+            stream, to write to.
         decompose_wrappers: Kept for backward compatibility, ignored.
         sanitize_names: Whether to sanitize gate names for QASM compliance.
     """
-    with open(filename, "w") as f:
-        f.write(
-            dumps(
-                c,
-                decompose_wrappers=decompose_wrappers,
-                sanitize_names=sanitize_names,
-            )
-        )
+    if hasattr(filename, "write"):
+        write_qasm(c, filename, sanitize_names=sanitize_names)
+        return
+
+    with open(filename, "w", buffering=1 << 16) as f:
+        write_qasm(c, f, sanitize_names=sanitize_names)
 
 
 # Deprecated/Legacy aliases
@@ -2,7 +2,6 @@
 # Proprietary and confidential.
 #
 from enum import Enum, auto
-from dataclasses import dataclass
 from typing import Tuple, Dict, Optional
 
 
@@ -121,15 +120,77 @@ KEYWORDS: Dict[str, TokenKind] = {
 }
 
 
-@dataclass
 class Token:
-    kind: TokenKind = TokenKind.ERROR
-    startpos: Tuple[int, int] = (0, 0)  # (line, column)
-    endpos: Tuple[int, int] = (0, 0)  # (line, column)
-    startbyte: int = 0
-    endbyte: int = 0
-    val: str = ""
-    token_error: Optional[str] = None
+    """A lexical token of an OpenQASM source.
+
+    ``startbyte`` and ``endbyte`` are the offsets of the token in the source
+    text. The ``(line, column)`` positions ``startpos`` and ``endpos`` are
+    computed from them on first access when the token was produced by a
+    :class:`~mimiqcircuits.qasm.lexer.Lexer`.
+    """
+
+    __slots__ = (
+        "kind",
+        "startbyte",
+        "endbyte",
+        "val",
+        "token_error",
+        "_startpos",
+        "_endpos",
+        "_lines",
+    )
+
+    def __init__(
+        self,
+        kind: TokenKind = TokenKind.ERROR,
+        startpos: Optional[Tuple[int, int]] = None,
+        endpos: Optional[Tuple[int, int]] = None,
+        startbyte: int = 0,
+        endbyte: int = 0,
+        val: str = "",
+        token_error: Optional[str] = None,
+        lines=None,
+    ):
+        self.kind = kind
+        self.startbyte = startbyte
+        self.endbyte = endbyte
+        self.val = val
+        self.token_error = token_error
+        self._startpos = startpos
+        self._endpos = endpos
+        self._lines = lines
+
+    @property
+    def startpos(self) -> Tuple[int, int]:
+        """``(line, column)`` of the first character of the token."""
+        if self._startpos is None:
+            if self._lines is None:
+                return (0, 0)
+            self._startpos = self._lines.position(self.startbyte)
+        return self._startpos
+
+    @property
+    def endpos(self) -> Tuple[int, int]:
+        """``(line, column)`` of the last character of the token."""
+        if self._endpos is None:
+            if self._lines is None:
+                return (0, 0)
+            row, col = self._lines.position(self.endbyte)
+            self._endpos = (row, col - 1)
+        return self._endpos
+
+    def __eq__(self, other):
+        if not isinstance(other, Token):
+            return NotImplemented
+        return (
+            self.kind == other.kind
+            and self.startpos == other.startpos
+            and self.endpos == other.endpos
+            and self.startbyte == other.startbyte
+            and self.endbyte == other.endbyte
+            and self.val == other.val
+            and self.token_error == other.token_error
+        )
 
     def exactkind(self) -> TokenKind:
         return self.kind
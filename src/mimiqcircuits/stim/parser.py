@@ -0,0 +1,373 @@
+#
+# Copyright © 2022-2024 University of Strasbourg. All Rights Reserved.
+# Copyright © 2023-2025 QPerfect. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""Reading of Stim circuit files.
+
+Every measurement of a Stim program gets its own classical bit, in program
+order, and ``rec[-k]`` targets of ``DETECTOR`` and ``OBSERVABLE_INCLUDE``
+become the bits of the measurements they refer to.
+
+A ``REPEAT`` block becomes a :class:`~mimiqcircuits.Repeat` of a
+:class:`~mimiqcircuits.Block`, which runs the same instructions on the same
+bits at every iteration. When the body reads measurements of the previous
+iteration, as the rounds of a memory experiment do, the first iteration (or
+two, for an even count) is peeled off and the rest is repeated two
+iterations at a time, alternating between two sets of bits so that the
+previous round is never overwritten before it is read. The block is never
+unrolled, and :func:`~mimiqcircuits.stim.dumps` writes it back as a single
+``REPEAT``.
+"""
+
+import re
+from typing import List, Union
+import io
+
+import mimiqcircuits as mc
+from mimiqcircuits.stim.tables import (
+    GATES,
+    MEASUREMENTS,
+    NOISE,
+    RESETS,
+    canonical_name,
+)
+
+_LINE = re.compile(r"([A-Za-z_][A-Za-z0-9_]*)\s*(?:\(([^)]*)\))?\s*(.*)")
+_REC = re.compile(r"rec\[-(\d+)\]")
+
+
+class _Statement:
+    __slots__ = ("name", "args", "targets", "lineno", "body")
+
+    def __init__(self, name, args, targets, lineno, body=None):
+        self.name = name
+        self.args = args
+        self.targets = targets
+        self.lineno = lineno
+        self.body = body
+
+
+def parse_statements(text: str) -> List[_Statement]:
+    """Split a Stim program into statements, nesting ``REPEAT`` bodies."""
+    stack = [[]]
+    for lineno, line in enumerate(text.splitlines(), start=1):
+        line = line.split("#", 1)[0].strip()
+        if not line:
+            continue
+        if line == "}":
+            if len(stack) == 1:
+                raise ValueError(f"line {lineno}: unmatched '}}'")
+            stack.pop()
+            continue
+        m = _LINE.fullmatch(line)
+        if m is None:
+            raise ValueError(f"line {lineno}: cannot parse {line!r}")
+        name, args, rest = m.groups()
+        name = canonical_name(name)
+        try:
+            args = [float(a) for a in args.split(",")] if args else []
+        except ValueError:
+            raise ValueError(f"line {lineno}: invalid arguments {args!r}") from None
+        targets = rest.split()
+        if name == "REPEAT":
+            if len(targets) != 2 or targets[1] != "{" or not targets[0].isdigit():
+                raise ValueError(f"line {lineno}: expected 'REPEAT <count> {{'")
+            stmt = _Statement(name, [], [], lineno, [])
+            stmt.args = [int(targets[0])]
+            stack[-1].append(stmt)
+            stack.append(stmt.body)
+            continue
+        stack[-1].append(_Statement(name, args, targets, lineno))
+    if len(stack) > 1:
+        raise ValueError("unterminated REPEAT block")
+    return stack[0]
+
+
+class _Builder:
+    """Lowers statements into a circuit, keeping track of which bit holds
+    each measurement record.
+
+    ``records`` maps a record index to its bit and ``writer`` a bit to the
+    record last written to it; a record can be read only while its bit has
+    not been overwritten.
+    """
+
+    def __init__(self):
+        self.circuit = mc.Circuit()
+        self.num_bits = 0
+        self.total = 0
+        self.records = {}
+        self.writer = {}
+        self.floor = 0
+        self.lowest = None
+        self.allocated = []
+        self.reuse = None
+
+    def _alloc(self):
+        if self.reuse is not None:
+            bit = next(self.reuse)
+        else:
+            bit = self.num_bits
+            self.num_bits += 1
+        self.allocated.append(bit)
+        return bit
+
+    def _measure(self, op, qubit):
+        bit = self._alloc()
+        self.circuit.push(op, qubit, bit)
+        self.records[self.total] = bit
+        self.writer[bit] = self.total
+        self.total += 1
+
+    def _record(self, target, stmt):
+        m = _REC.fullmatch(target)
+        if m is None:
+            raise ValueError(
+                f"line {stmt.lineno}: {stmt.name} expects rec[-k] targets, "
+                f"got {target!r}"
+            )
+        idx = self.total - int(m.group(1))
+        bit = self.records.get(idx)
+        if idx < self.floor or bit is None or self.writer.get(bit) != idx:
+            raise ValueError(
+                f"line {stmt.lineno}: {target} refers to a measurement that "
+                "cannot be represented by a classical bit at this point"
+            )
+        if self.lowest is None or idx < self.lowest:
+            self.lowest = idx
+        return bit
+
+    def build(self, statements):
+        for stmt in statements:
+            if stmt.name == "REPEAT":
+                self._repeat(stmt)
+            else:
+                self._statement(stmt)
+
+    def _statement(self, stmt):
+        name = stmt.name
+        args = stmt.args
+        if name in GATES:
+            op = GATES[name]()
+            self._push_each(op, stmt)
+        elif name in MEASUREMENTS:
+            if any(args):
+                raise ValueError(
+                    f"line {stmt.lineno}: noisy measurements are not supported"
+                )
+            op = MEASUREMENTS[name]()
+            for q in self._qubits(stmt):
+                self._measure(op, q)
+        elif name in RESETS:
+            self._push_each(RESETS[name](), stmt)
+        elif name in NOISE:
+            self._push_each(NOISE[name](*self._args(stmt, 1)), stmt)
+        elif name == "DEPOLARIZE1":
+            self._push_each(mc.Depolarizing1(*self._args(stmt, 1)), stmt)
+        elif name == "DEPOLARIZE2":
+            self._push_each(mc.Depolarizing2(*self._args(stmt, 1)), stmt)
+        elif name == "DETECTOR":
+            bits = [self._record(t, stmt) for t in stmt.targets]
+            if not bits:
+                raise ValueError(f"line {stmt.lineno}: DETECTOR without records")
+            self.circuit.push(mc.Detector(len(bits), list(args)), *bits)
+        elif name == "OBSERVABLE_INCLUDE":
+            (index,) = self._args(stmt, 1)
+            bits = [self._record(t, stmt) for t in stmt.targets]
+            if bits:
+                op = mc.ObservableInclude(len(bits), [int(index)])
+                self.circuit.push(op, *bits)
+        elif name == "QUBIT_COORDS":
+            for q in self._qubits(stmt):
+                self.circuit.push(mc.QubitCoordinates(list(args)), q)
+        elif name == "SHIFT_COORDS":
+            self.circuit.push(mc.ShiftCoordinates(list(args)))
+        elif name == "TICK":
+            self.circuit.push(mc.Tick())
+        else:
+            raise ValueError(f"line {stmt.lineno}: unsupported instruction {name}")
+
+    def _args(self, stmt, n):
+        if len(stmt.args) != n:
+            raise ValueError(
+                f"line {stmt.lineno}: {stmt.name} takes {n} argument(s), "
+                f"got {len(stmt.args)}"
+            )
+        return stmt.args
+
+    def _qubits(self, stmt):
+        try:
+            return [int(t) for t in stmt.targets]
+        except ValueError:
+            raise ValueError(
+                f"line {stmt.lineno}: {stmt.name} supports only qubit targets"
+            ) from None
+
+    def _push_each(self, op, stmt):
+        qubits = self._qubits(stmt)
+        n = op.num_qubits
+        if len(qubits) % n:
+            raise ValueError(
+                f"line {stmt.lineno}: {stmt.name} needs a multiple of {n} targets"
+            )
+        for i in range(0, len(qubits), n):
+            self.circuit.push(op, *qubits[i : i + n])
+
+    def _body(self, statements, reuse=None):
+        """Build one iteration of a block into its own circuit.
+
+        The bits of the measurements are allocated afresh, or taken in order
+        from ``reuse``. Returns the circuit, the bits it allocated and the
+        lowest record it read.
+        """
+        outer = (self.circuit, self.allocated, self.reuse, self.lowest)
+        self.circuit = mc.Circuit()
+        self.allocated = []
+        if reuse is not None:
+            self.reuse = iter(reuse)
+        try:
+            self.lowest = None
+            self.build(statements)
+            result = (self.circuit, self.allocated, self.lowest)
+        finally:
+            self.circuit, self.allocated, self.reuse, self.lowest = outer
+        if reuse is None:
+            self.allocated.extend(result[1])
+        if result[2] is not None and (self.lowest is None or result[2] < self.lowest):
+            self.lowest = result[2]
+        return result
+
+    def _layout(self, start, stop):
+        """Bits of the readable records in ``[start, stop)``, by offset."""
+        return {i - start: b for i, b in self.records.items() if start <= i < stop}
+
+    def _repeat(self, stmt):
+        n = stmt.args[0]
+        if n == 0:
+            raise ValueError(f"line {stmt.lineno}: REPEAT count must be positive")
+        start = self.total
+        first, bits, lowest = self._body(stmt.body)
+        m = self.total - start
+        layouts = [self._layout(start, self.total)]
+
+        # a body that measures nothing reads the same records every time
+        peeled = n > 1 and m > 0 and lowest is not None and lowest < start
+        if not peeled:
+            self._push_block(mc.Repeat(n, _block(first)))
+        else:
+            # The body reads the previous iteration: peel the first one (two
+            # for an even count) and repeat pairs of iterations that
+            # alternate between two sets of bits.
+            floor = self.floor
+            try:
+                self.floor = start
+                second, _, _ = self._body(stmt.body)
+                layouts.append(self._layout(start + m, self.total))
+                self.floor = start + m
+                third, _, _ = self._body(stmt.body, reuse=bits)
+                layouts.append(self._layout(start + 2 * m, self.total))
+            finally:
+                self.floor = floor
+            self._push_block(first)
+            if n == 2:
+                self._push_block(mc.Repeat(1, _block(second)))
+            else:
+                if n % 2 == 0:
+                    self._push_block(second)
+                    second, third = third, second
+                pair = mc.Circuit()
+                for inst in [*second, *third]:
+                    pair.push(inst)
+                self._push_block(mc.Repeat((n - 1) // 2, _block(pair)))
+
+        # keep the records of the last two iterations, the only ones that
+        # can still be read after the block
+        for i in [i for i in self.records if i >= start]:
+            del self.records[i]
+        for k in range(max(n - 2, 0), n):
+            layout = layouts[1 + (k - 1) % 2 if peeled and k else 0]
+            for rel, bit in layout.items():
+                self.records[start + k * m + rel] = bit
+                self.writer[bit] = start + k * m + rel
+        self.total = start + n * m
+
+    def _push_block(self, op):
+        if isinstance(op, mc.Circuit):
+            for inst in op:
+                self.circuit.push(inst)
+            return
+        self.circuit.push(op, *range(op.num_qubits), *range(op.num_bits))
+
+
+def _block(circuit):
+    return mc.Block(circuit.num_qubits(), circuit.num_bits(), 0, circuit.instructions)
+
+
+def loads(s: str) -> mc.Circuit:
+    """Parse a Stim program.
+
+    Supports the Clifford gates, Pauli-basis measurements and resets, Pauli
+    and depolarizing noise, ``DETECTOR``, ``OBSERVABLE_INCLUDE``,
+    ``QUBIT_COORDS``, ``SHIFT_COORDS``, ``TICK`` and ``REPEAT`` blocks.
+    Measurements are stored in consecutive classical bits.
+
+    Args:
+        s (str): The Stim program.
+
+    Returns:
+        mc.Circuit: The circuit.
+
+    Raises:
+        ValueError: If the program is malformed, uses an unsupported
+            instruction, or a ``REPEAT`` body reads measurements more than
+            one iteration back.
+
+    Examples:
+        >>> from mimiqcircuits.stim import loads
+        >>> c = loads('''
+        ... R 0 1
+        ... REPEAT 3 {
+        ...     CX 0 1
+        ...     MR 1
+        ...     DETECTOR rec[-1]
+        ... }
+        ... ''')
+        >>> c.instructions[-1].operation
+        ∏³ block ...
+        >>> c.num_bits()
+        1
+    """
+    builder = _Builder()
+    builder.build(parse_statements(s))
+    return builder.circuit
+
+
+def load(filename: Union[str, io.TextIOBase]) -> mc.Circuit:
+    """Parse a Stim file.
+
+    Args:
+        filename (str or file object): The path of the file, or an open
+            text stream.
+
+    Returns:
+        mc.Circuit: The circuit.
+    """
+    if hasattr(filename, "read"):
+        return loads(filename.read())
+    with open(filename, "r") as f:
+        return loads(f.read())
+
+
+__all__ = ["load", "loads", "parse_statements"]
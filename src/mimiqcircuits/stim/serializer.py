@@ -0,0 +1,254 @@
+#
+# Copyright © 2022-2024 University of Strasbourg. All Rights Reserved.
+# Copyright © 2023-2025 QPerfect. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""Writing of Stim circuit files.
+
+Classical bits are turned back into measurement records: a ``Detector`` or
+``ObservableInclude`` on a bit refers to the measurement last written to it,
+as ``rec[-k]``. A :class:`~mimiqcircuits.Repeat` becomes a ``REPEAT`` block,
+provided its body refers to the same records, relative to the end of the
+record, at every iteration. Copies of the body written just before the block
+are folded into it, so the peeled iterations of a block read by
+:func:`~mimiqcircuits.stim.loads` are written back as one ``REPEAT``.
+"""
+
+import io
+from typing import Union
+
+import mimiqcircuits as mc
+from mimiqcircuits.decomposition import DecomposeIterator, DecompositionError, StimBasis
+from mimiqcircuits.stim.tables import MEASUREMENTS, NAMES, format_head
+
+_MEASUREMENT_TYPES = tuple(MEASUREMENTS.values())
+
+
+class _Writer:
+    """Collects the lines of a Stim program and the record index of the
+    measurement last written to every bit."""
+
+    def __init__(self):
+        self.lines = []
+        self.total = 0
+        self.last = {}
+
+    def line(self, head, targets, merge=True):
+        prev = self.lines[-1] if self.lines else None
+        if merge and prev is not None and prev[2] and prev[0] == head:
+            prev[1].extend(targets)
+        else:
+            self.lines.append([head, list(targets), merge])
+
+    def render(self):
+        return _render(self.lines)
+
+    def records(self, bits):
+        targets = []
+        for b in bits:
+            if b not in self.last:
+                raise ValueError(f"Bit {b} is read before any measurement writes it")
+            targets.append(f"rec[-{self.total - self.last[b]}]")
+        return targets
+
+    def emit(self, instructions):
+        for inst in instructions:
+            self.instruction(inst)
+
+    def instruction(self, inst):
+        op = inst.operation
+        qubits = [str(q) for q in inst.qubits]
+        name = NAMES.get(type(op))
+
+        if isinstance(op, _MEASUREMENT_TYPES):
+            self.line(name, qubits)
+            self.last[inst.bits[0]] = self.total
+            self.total += 1
+        elif name is not None:
+            self.line(format_head(name, op.getparams()), qubits)
+        elif isinstance(op, mc.Depolarizing) and op.num_qubits in (1, 2):
+            head = format_head(f"DEPOLARIZE{op.num_qubits}", [op.p])
+            self.line(head, qubits)
+        elif isinstance(op, mc.Detector):
+            head = format_head("DETECTOR", op.get_notes())
+            self.line(head, self.records(inst.bits), merge=False)
+        elif isinstance(op, mc.ObservableInclude):
+            index = op.notes[0] if op.notes else 0
+            head = format_head("OBSERVABLE_INCLUDE", [index])
+            self.line(head, self.records(inst.bits), merge=False)
+        elif isinstance(op, mc.QubitCoordinates):
+            self.line(format_head("QUBIT_COORDS", op.get_notes()), qubits)
+        elif isinstance(op, mc.ShiftCoordinates):
+            self.line(format_head("SHIFT_COORDS", op.get_notes()), [], merge=False)
+        elif isinstance(op, mc.Tick):
+            self.line("TICK", [], merge=False)
+        elif isinstance(op, (mc.AbstractAnnotation, mc.Barrier)):
+            return
+        elif isinstance(op, mc.Repeat):
+            self.repeat(op, inst)
+        elif isinstance(op, mc.Block):
+            self.emit(_remap(op.instructions, inst))
+        else:
+            self.decompose(inst)
+
+    def decompose(self, inst):
+        op = inst.operation
+        try:
+            if StimBasis().isterminal(op):
+                subs = list(inst.decompose())
+            else:
+                subs = list(DecomposeIterator(inst, StimBasis()))
+        except DecompositionError as e:
+            raise ValueError(f"{op} cannot be written in Stim: {e}") from None
+        if len(subs) == 1 and subs[0].operation is op:
+            raise ValueError(f"{op} cannot be written in Stim")
+        self.emit(subs)
+
+    def repeat(self, op, inst):
+        n = op.repeats
+        if n == 0:
+            return
+        body = op.op
+        if isinstance(body, mc.Block):
+            body = list(_remap(body.instructions, inst))
+        else:
+            body = [mc.Instruction(body, inst.qubits, inst.bits, inst.zvars)]
+
+        outer = self.lines
+        start = self.total
+        self.lines = []
+        self.emit(body)
+        first = self.render()
+        m = self.total - start
+        if n > 1:
+            # the records the body refers to must be the same at every
+            # iteration; the second one is representative of all others
+            self.lines = []
+            self.emit(body)
+            if self.render() != first:
+                self.lines = outer
+                raise ValueError(
+                    f"{op} reads different measurement records at different "
+                    "iterations and cannot be written as a REPEAT block"
+                )
+            shift = (n - 2) * m
+            for b, idx in self.last.items():
+                if idx >= start + m:
+                    self.last[b] = idx + shift
+            self.total += shift
+        self.lines = outer
+
+        # a body made of identical halves, and copies of the body written
+        # just before the block, are folded into the repetition count
+        while first and len(first) % 2 == 0:
+            half = len(first) // 2
+            if first[:half] != first[half:]:
+                break
+            first = first[:half]
+            n *= 2
+        k = len(first)
+        while k and len(self.lines) >= k and _render(self.lines[-k:]) == first:
+            del self.lines[-k:]
+            n += 1
+
+        self.line(f"REPEAT {n} {{", [], merge=False)
+        for s in first:
+            self.line("    " + s, [], merge=False)
+        self.line("}", [], merge=False)
+
+
+def _render(lines):
+    return [" ".join([head, *targets]) if targets else head for head, targets, _ in lines]
+
+
+def _remap(instructions, inst):
+    """The instructions of a block, on the targets it is applied to."""
+    qubits, bits, zvars = inst.qubits, inst.bits, inst.zvars
+    for sub in instructions:
+        yield mc.Instruction(
+            sub.operation,
+            tuple(qubits[q] for q in sub.qubits),
+            tuple(bits[b] for b in sub.bits),
+            tuple(zvars[z] for z in sub.zvars),
+        )
+
+
+def write_stim(c: mc.Circuit, fp: io.TextIOBase):
+    """Write a circuit as a Stim program to a text stream.
+
+    Raises:
+        ValueError: If the circuit has an operation with no Stim equivalent
+            (such as a non-Clifford gate), reads a bit before it is measured,
+            or has a ``Repeat`` whose body cannot be written as a ``REPEAT``
+            block.
+    """
+    writer = _Writer()
+    writer.emit(c)
+    for s in writer.render():
+        fp.write(s)
+        fp.write("\n")
+
+
+def dumps(c: mc.Circuit) -> str:
+    """Serialize a circuit to a Stim program.
+
+    Operations outside the Stim gate set are decomposed with
+    :class:`~mimiqcircuits.StimBasis`; ``Repeat`` is written as a ``REPEAT``
+    block rather than unrolled.
+
+    Args:
+        c (mc.Circuit): The circuit to serialize.
+
+    Returns:
+        str: The Stim program.
+
+    Examples:
+        >>> from mimiqcircuits import *
+        >>> from mimiqcircuits.stim import dumps
+        >>> body = Circuit()
+        >>> _ = body.push(GateCX(), 0, 1)
+        >>> _ = body.push(MeasureReset(), 1, 0)
+        >>> _ = body.push(Detector(1), 0)
+        >>> c = Circuit()
+        >>> _ = c.push(Reset(), range(2))
+        >>> _ = c.push(Repeat(3, Block(body)), 0, 1, 0)
+        >>> print(dumps(c), end="")
+        R 0 1
+        REPEAT 3 {
+            CX 0 1
+            MR 1
+            DETECTOR rec[-1]
+        }
+    """
+    s = io.StringIO()
+    write_stim(c, s)
+    return s.getvalue()
+
+
+def dump(c: mc.Circuit, filename: Union[str, io.TextIOBase]):
+    """Serialize a circuit to a Stim file.
+
+    Args:
+        c (mc.Circuit): The circuit to serialize.
+        filename (str or file object): The file path, or an open text
+            stream, to write to.
+    """
+    if hasattr(filename, "write"):
+        write_stim(c, filename)
+        return
+    with open(filename, "w") as f:
+        write_stim(c, f)
+
+
+__all__ = ["dump", "dumps", "write_stim"]
@@ -0,0 +1,101 @@
+#
+# Copyright © 2022-2024 University of Strasbourg. All Rights Reserved.
+# Copyright © 2023-2025 QPerfect. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""Correspondence between Stim instructions and MIMIQ operations."""
+
+import mimiqcircuits as mc
+
+# Clifford gates, by their canonical Stim name.
+GATES = {
+    "I": mc.GateID,
+    "X": mc.GateX,
+    "Y": mc.GateY,
+    "Z": mc.GateZ,
+    "H": mc.GateH,
+    "S": mc.GateS,
+    "S_DAG": mc.GateSDG,
+    "SQRT_X": mc.GateSX,
+    "SQRT_X_DAG": mc.GateSXDG,
+    "SQRT_Y": mc.GateSY,
+    "SQRT_Y_DAG": mc.GateSYDG,
+    "CX": mc.GateCX,
+    "CY": mc.GateCY,
+    "CZ": mc.GateCZ,
+    "SWAP": mc.GateSWAP,
+    "ISWAP": mc.GateISWAP,
+    "ISWAP_DAG": mc.GateISWAPDG,
+}
+
+# Operations that write a measurement record.
+MEASUREMENTS = {
+    "M": mc.Measure,
+    "MX": mc.MeasureX,
+    "MY": mc.MeasureY,
+    "MR": mc.MeasureReset,
+    "MRX": mc.MeasureResetX,
+    "MRY": mc.MeasureResetY,
+}
+
+RESETS = {
+    "R": mc.Reset,
+    "RX": mc.ResetX,
+    "RY": mc.ResetY,
+}
+
+# Single-parameter Pauli noise channels.
+NOISE = {
+    "X_ERROR": mc.PauliX,
+    "Y_ERROR": mc.PauliY,
+    "Z_ERROR": mc.PauliZ,
+}
+
+# Alternative spellings accepted by Stim.
+ALIASES = {
+    "CNOT": "CX",
+    "ZCX": "CX",
+    "ZCY": "CY",
+    "ZCZ": "CZ",
+    "H_XZ": "H",
+    "SQRT_Z": "S",
+    "SQRT_Z_DAG": "S_DAG",
+    "MZ": "M",
+    "RZ": "R",
+    "MRZ": "MR",
+}
+
+# Stim name of every operation type above, for serialization.
+NAMES = {
+    cls: name for table in (GATES, MEASUREMENTS, RESETS, NOISE) for name, cls in table.items()
+}
+
+
+def canonical_name(name: str) -> str:
+    name = name.upper()
+    return ALIASES.get(name, name)
+
+
+def format_number(x) -> str:
+    """Shortest text of a parameter: integers without a decimal point."""
+    x = float(x)
+    if x.is_integer():
+        return str(int(x))
+    return repr(x)
+
+
+def format_head(name: str, args) -> str:
+    if not args:
+        return name
+    return f"{name}({', '.join(format_number(a) for a in args)})"
@@ -700,6 +700,93 @@ def test_localbackend_recompile_per_trajectory_default():
     assert backend.recompile_per_trajectory(plain) is False
 
 
+def test_localbackend_trajectories_compile_sampled_mixed_unitaries():
+    """Per-shot recompiles see circuits with the branches already drawn."""
+    import mimiqcircuits as mc
+
+    class _Recording(_MockBackend):
+        def compile(self, circuit):
+            self.compiled = getattr(self, "compiled", []) + [circuit]
+            return super().compile(circuit)
+
+    c = mc.Circuit()
+    c.push(mc.GateH(), 0)
+    c.push(mc.PauliX(1.0), 0)
+    c.push(mc.Depolarizing1(0.5), 1)
+    c.push(mc.Measure(), 0, 0)
+    c.push(mc.Reset(), 0)
+    c.push(mc.GateCX(), 0, 1)
+    c.push(mc.Measure(), 1, 1)
+
+    backend = _Recording()
+    res = backend.execute(c, nsamples=6, seed=3)
+
+    assert len(res.fidelities) == 6
+    assert len(backend.compiled) == 6
+    for circuit in backend.compiled:
+        ops = [inst.get_operation() for inst in circuit]
+        assert not any(
+            isinstance(op, mc.krauschannel) and op.ismixedunitary() for op in ops
+        )
+        assert isinstance(ops[1], mc.GateX)
+
+
+def test_localbackend_loss_sampling_compiles_each_pattern_once():
+    """Shots with the same loss pattern share one compiled variant."""
+    import mimiqcircuits as mc
+
+    c = mc.Circuit()
+    c.push(mc.GateH(), 0)
+    c.push(mc.Loss(0.5), 0)
+    c.push(mc.GateCX(), 0, 1)
+    c.push(mc.Check(), 0, 0)
+
+    class _PerShotBackend(_MockBackend):
+        def group_loss_patterns(self):
+            return False
+
+    backend = _PerShotBackend()
+    res = backend.execute(c, nsamples=50, seed=1)
+    assert len(res.fidelities) == 50
+    assert backend.evolve_calls == 50
+    # one compilation per distinct pattern: lost and not lost
+    assert backend.compile_calls == 2
+
+
+def test_localbackend_loss_sampling_groups_shots_by_pattern():
+    """Each distinct loss pattern is evolved once and its shots are
+    sampled from the final state, in shot order."""
+    import mimiqcircuits as mc
+
+    c = mc.Circuit()
+    c.push(mc.GateH(), 0)
+    c.push(mc.Loss(0.5), 0)
+    c.push(mc.GateCX(), 0, 1)
+    c.push(mc.Measure(), 0, 0)
+    c.push(mc.Measure(), 1, 1)
+    c.push(mc.Check(), 0, 2)
+
+    backend = _MockBackend(fixed_bits=[True, True])
+    res = backend.execute(c, nsamples=50, seed=1)
+    assert backend.evolve_calls == 2
+    assert len(res.fidelities) == 50
+    assert len(res.cstates) == 50
+    # lost shots read 0 on the lost qubit, drop the CX (leaving q[1]
+    # in |0>) and fail the check
+    patterns = {tuple(int(b) for b in s) for s in res.cstates}
+    assert patterns == {(0, 0, 0), (1, 1, 1)}
+
+    # a mid-circuit measurement keeps one evolution per shot
+    mid = mc.Circuit()
+    mid.push(mc.Loss(0.0), 0)
+    mid.push(mc.Measure(), 0, 0)
+    mid.push(mc.GateX(), 0)
+    mid.push(mc.Measure(), 0, 1)
+    backend = _MockBackend()
+    backend.execute(mid, nsamples=20, seed=1)
+    assert backend.evolve_calls == 20
+
+
 # ──────────────────────────────────────────────────────────────────────────
 # kwargs → passes conversion (MIMIQ prep knobs)
 # ──────────────────────────────────────────────────────────────────────────
@@ -432,6 +432,42 @@ def test_noisemodel_and_apply_noise_pass_conflict_raises(backend):
         )
 
 
+def test_noisemodel_and_noise_model_pass_conflict_raises(backend):
+    """The shipped :class:`NoiseModelPass` must trip the same guard as
+    the named fake, so noise cannot be applied twice.
+    """
+    from mimiqcircuits import NoiseModel, NoiseModelPass
+
+    with pytest.raises(ValueError, match="noisemodel"):
+        backend.submit(
+            _bell_circuit(), nsamples=10,
+            passes=PassPipeline(passes=[NoiseModelPass(NoiseModel())]),
+            strict_pass_order=False,
+            noisemodel=NoiseModel(),
+        )
+
+
+def test_noise_model_pass_with_callable_durations(backend):
+    """A callable ``durations`` keeps the double-noise diagnostic, and
+    on its own is rejected as not serializable before any network call.
+    """
+    from mimiqcircuits import NoiseModel, NoiseModelPass
+
+    pipe = PassPipeline(
+        passes=[NoiseModelPass(NoiseModel(), durations=lambda inst: 1.0)]
+    )
+    with pytest.raises(ValueError, match="noisemodel"):
+        backend.submit(
+            _bell_circuit(), nsamples=10, passes=pipe,
+            strict_pass_order=False, noisemodel=NoiseModel(),
+        )
+    with pytest.raises(ValueError, match="not serializable"):
+        backend.submit(
+            _bell_circuit(), nsamples=10, passes=pipe,
+            strict_pass_order=False,
+        )
+
+
 def test_noisemodel_collision_beats_strict_pass_order(backend):
     """With both `noisemodel=` and `ApplyNoiseModelPass` and the
     default `strict_pass_order=True`, the duplication ValueError must
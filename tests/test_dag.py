@@ -17,6 +17,7 @@
 
 import importlib.util
 
+import numpy as np
 import pytest
 
 import mimiqcircuits as mc
@@ -79,7 +80,7 @@ def test_linear_chain_same_qubit():
     dag = c.dag()
     # Each gate depends only on the immediately preceding one on qubit 0.
     assert dag.edges() == [(0, 1), (1, 2)]
-    assert topological_sort_by_bfs(dag) == [0, 1, 2]
+    assert topological_sort_by_bfs(dag).tolist() == [0, 1, 2]
 
 
 def test_independent_gates_have_no_edges():
@@ -89,7 +90,7 @@ def test_independent_gates_have_no_edges():
     c.push(mc.GateH(), 2)
     dag = c.dag()
     assert dag.num_edges() == 0
-    assert topological_sort_by_bfs(dag) == [0, 1, 2]
+    assert topological_sort_by_bfs(dag).tolist() == [0, 1, 2]
 
 
 def test_qubit_dependency_edges():
@@ -136,7 +137,7 @@ def test_bfs_groups_by_depth():
     c.push(mc.GateX(), 0)
     c.push(mc.GateX(), 1)
     dag = c.dag()
-    assert topological_sort_by_bfs(dag) == [0, 2, 1]
+    assert topological_sort_by_bfs(dag).tolist() == [0, 2, 1]
 
 
 def test_amplitude_depends_on_all_qubits():
@@ -223,6 +224,32 @@ def test_resources_cached_and_recomputed():
     assert c.num_qubits() == 4  # recomputed after the cache was invalidated
 
 
+def test_layers_asap_and_alap():
+    c = bell_then_local()
+    assert [layer.tolist() for layer in c.layers()] == [[0, 1], [2], [3, 4]]
+    c.push(mc.GateX(), 2)
+    assert [layer.tolist() for layer in c.layers()] == [[0, 1, 5], [2], [3, 4]]
+    assert [layer.tolist() for layer in c.layers(alap=True)] == [
+        [0, 1],
+        [2],
+        [3, 4, 5],
+    ]
+    moments = c.moments()
+    assert moments[1] == [c.instructions[2]]
+    assert len(c.moments(alap=True)[2]) == 3
+
+
+def test_layers_cached_and_invalidated():
+    c = bell_then_local()
+    layers = c.layers()
+    assert c.layers() is layers
+    assert not layers[0].flags.writeable
+    c.push(mc.GateH(), 0)
+    assert c.layers() is not layers
+    assert len(c.layers()) == 4
+    assert mc.Circuit().layers() == ()
+
+
 def test_instructions_is_read_only():
     c = bell_then_local()
     with pytest.raises(AttributeError):
@@ -248,6 +275,79 @@ def test_dfs_detects_cycle():
         topological_sort_by_dfs(dag)
 
 
+def test_bfs_detects_cycle():
+    dag = CircuitDAG.from_edges(2, [0, 1], [1, 0])
+    with pytest.raises(ValueError):
+        topological_sort_by_bfs(dag)
+
+
+def test_sorts_return_index_arrays():
+    dag = bell_then_local().dag()
+    for order in (topological_sort_by_bfs(dag), topological_sort_by_dfs(dag)):
+        assert isinstance(order, np.ndarray)
+        assert order.dtype == np.int32
+        assert_topological(order.tolist(), dag)
+
+
+def test_from_edges_drops_duplicates_and_self_loops():
+    dag = CircuitDAG.from_edges(3, [0, 0, 1, 2], [1, 1, 1, 0])
+    assert sorted(dag.edges()) == [(0, 1), (2, 0)]
+    assert dag.num_edges() == 2
+
+
+def test_csr_arrays():
+    dag = bell_then_local().dag()
+    indptr, indices = dag.csr()
+    assert indptr.tolist() == [0, 1, 2, 4, 4, 4]
+    assert indices.tolist() == [2, 2, 3, 4]
+    indptr, indices = dag.csr(reverse=True)
+    assert indptr.tolist() == [0, 0, 0, 2, 3, 4]
+    assert indices.tolist() == [0, 1, 2, 2]
+    assert dag.in_neighbors(2).tolist() == [0, 1]
+
+
+def test_asap_and_alap_levels():
+    # X(0), X(0), X(0) is a chain of three; X(1) is free, so it sits in
+    # layer 0 as soon as possible and in layer 2 as late as possible.
+    c = mc.Circuit()
+    c.push(mc.GateX(), 0)
+    c.push(mc.GateX(), 0)
+    c.push(mc.GateX(), 0)
+    c.push(mc.GateX(), 1)
+    dag = c.dag()
+    assert dag.asap_levels().tolist() == [0, 1, 2, 0]
+    assert dag.alap_levels().tolist() == [0, 1, 2, 2]
+    assert dag.depth() == 3
+    assert dag.critical_path().tolist() == [0, 1, 2]
+
+
+def test_levels_of_empty_dag():
+    dag = CircuitDAG(0)
+    assert dag.depth() == 0
+    assert dag.asap_levels().size == 0
+    assert dag.critical_path().size == 0
+
+
+def test_levels_match_circuit_depth():
+    rng = np.random.default_rng(7)
+    c = mc.Circuit()
+    for _ in range(200):
+        a, b = rng.choice(6, size=2, replace=False)
+        c.push(mc.GateCX(), int(a), int(b))
+        c.push(mc.GateH(), int(rng.integers(6)))
+    dag = c.dag()
+    asap = dag.asap_levels()
+    alap = dag.alap_levels()
+    assert dag.depth() == c.depth()
+    assert np.all(asap <= alap)
+    for u, v in dag.edges():
+        assert asap[u] < asap[v]
+        assert alap[u] < alap[v]
+    path = dag.critical_path()
+    assert len(path) == dag.depth()
+    assert all(dag.has_edge(int(u), int(v)) for u, v in zip(path, path[1:]))
+
+
 def test_build_dag_matches_circuit_dag():
     c = bell_then_local()
     assert build_dag(c).edges() == c.dag().edges()
@@ -0,0 +1,127 @@
+import numpy as np
+import pytest
+
+import mimiqcircuits as mc
+from mimiqcircuits.backends.stabilizer import PauliFrameSampler
+
+
+def _repetition_code(p):
+    c = mc.Circuit()
+    for q in range(3):
+        c.push(mc.PauliX(p), q)
+    c.push(mc.GateCX(), 0, 3)
+    c.push(mc.GateCX(), 1, 3)
+    c.push(mc.GateCX(), 1, 4)
+    c.push(mc.GateCX(), 2, 4)
+    c.push(mc.Measure(), 3, 0)
+    c.push(mc.Measure(), 4, 1)
+    for q in range(3):
+        c.push(mc.Measure(), q, 2 + q)
+    c.push(mc.Detector(1), 0)
+    c.push(mc.Detector(1), 1)
+    c.push(mc.ObservableInclude(1, [0]), 2)
+    return c
+
+
+def test_detector_error_model_repetition_code():
+    dem = mc.detector_error_model(_repetition_code(0.05))
+    assert (len(dem), dem.num_detectors, dem.num_observables) == (3, 2, 1)
+    assert np.allclose(dem.probabilities, 0.05)
+    rows = {
+        (tuple(dem.detectors[e].indices), tuple(dem.observables[e].indices))
+        for e in range(len(dem))
+    }
+    assert rows == {((0,), (0,)), ((0, 1), ()), ((1,), ())}
+    assert str(dem).splitlines()[0].startswith("error(0.05) ")
+
+
+def test_detector_error_model_merges_and_drops():
+    c = mc.Circuit()
+    c.push(mc.PauliX(0.1), 0)
+    c.push(mc.PauliX(0.2), 0)
+    c.push(mc.PauliZ(0.3), 0)  # invisible to a Z measurement
+    c.push(mc.Measure(), 0, 0)
+    c.push(mc.Detector(1), 0)
+    dem = mc.detector_error_model(c)
+    assert len(dem) == 1
+    assert np.isclose(dem.probabilities[0], 0.1 * 0.8 + 0.2 * 0.9)
+
+
+def test_detector_error_model_sampling_matches_frames():
+    c = mc.Circuit()
+    c.push(mc.GateH(), 0)
+    c.push(mc.GateCX(), 0, 1)
+    c.push(mc.Depolarizing1(0.06), 0)
+    c.push(mc.Depolarizing1(0.06), 1)
+    c.push(mc.GateCX(), 0, 1)
+    c.push(mc.GateH(), 0)
+    c.push(mc.Measure(), 0, 0)
+    c.push(mc.Measure(), 1, 1)
+    c.push(mc.Detector(1), 0)
+    c.push(mc.Detector(1), 1)
+    c.push(mc.ObservableInclude(1, [0]), 0)
+
+    dem = mc.detector_error_model(c)
+    shots = 100000
+    det, obs = dem.sample(shots, rng=np.random.default_rng(4))
+    fdet, fobs = PauliFrameSampler(c).sample_detectors(shots, rng=5)
+    assert det.shape == (shots, 2) and obs.shape == (shots, 1)
+    assert np.allclose(det.mean(axis=0), fdet.mean(axis=0), atol=0.005)
+    assert np.allclose(obs.mean(axis=0), fobs.mean(axis=0), atol=0.005)
+    assert abs((det[:, 0] & det[:, 1]).mean() - (fdet[:, 0] & fdet[:, 1]).mean()) < 0.005
+
+
+def test_detector_error_model_rejects_random_detectors():
+    c = mc.Circuit()
+    c.push(mc.GateH(), 0)
+    c.push(mc.Measure(), 0, 0)
+    c.push(mc.Detector(1), 0)
+    with pytest.raises(ValueError, match="D0"):
+        mc.detector_error_model(c)
+
+
+def test_detector_error_model_independent_depolarizing():
+    def circuit(p):
+        # the detectors read the X and Z errors on qubit 0 of a Bell pair
+        c = mc.Circuit()
+        c.push(mc.GateH(), 0)
+        c.push(mc.GateCX(), 0, 1)
+        c.push(mc.Depolarizing1(p), 0)
+        c.push(mc.GateCX(), 0, 1)
+        c.push(mc.GateH(), 0)
+        c.push(mc.Measure(), 0, 0)
+        c.push(mc.Measure(), 1, 1)
+        c.push(mc.Detector(1), 0)
+        c.push(mc.Detector(1), 1)
+        return c
+
+    p = 0.6
+    dem = mc.detector_error_model(circuit(p))
+    assert len(dem) == 3
+    assert np.allclose(dem.probabilities, (1 - np.sqrt(1 - 4 * p / 3)) / 2)
+    det, _ = dem.sample(200000, rng=np.random.default_rng(1))
+    # each detector fires on two of the three branches
+    assert np.allclose(det.mean(axis=0), 2 * p / 3, atol=0.005)
+    assert abs((det[:, 0] & det[:, 1]).mean() - p / 3) < 0.005
+
+    with pytest.raises(ValueError, match="too noisy"):
+        mc.detector_error_model(circuit(0.75))
+
+
+def test_detector_error_model_custom_cliffords():
+    h = mc.GateCustom(np.array([[1, 1], [1, -1]]) / np.sqrt(2))
+    x = mc.GateCustom(np.array([[0, 1], [1, 0]]))
+
+    def model(gate):
+        c = mc.Circuit()
+        c.push(gate, 0)
+        c.push(mc.PauliZ(0.1), 0)
+        c.push(gate, 0)
+        c.push(mc.Measure(), 0, 0)
+        c.push(mc.Detector(1), 0)
+        return mc.detector_error_model(c)
+
+    # H turns the Z error into a visible X error; X keeps it a Z error
+    dem = model(h)
+    assert len(dem) == 1 and np.isclose(dem.probabilities[0], 0.1)
+    assert len(model(x)) == 0
@@ -212,3 +212,242 @@ def test_qubit_threshold_skips_small_circuits():
     assert dict(pth.spec().parameters)["qubit_threshold"].value == 2
     skipped, _ = pth.apply(PassContext(), c)
     assert len(skipped) == 2
+
+
+def test_wide_support_fuses_three_qubit_block():
+    c = mc.Circuit()
+    c.push(mc.GateCX(), 0, 1)
+    c.push(mc.GateCX(), 1, 2)
+    c.push(mc.GateH(), 2)
+    f = mc.fuse_circuit(c, 3)
+    assert len(f) == 1
+    assert f[0].operation.num_qubits == 3
+    assert np.allclose(_circuit_unitary(c, 3), _circuit_unitary(f, 3), atol=1e-9)
+
+
+def test_bridging_gate_merges_open_clusters():
+    # H(0)·H(0) and H(1)·H(1) form two clusters; the CX touching both merges
+    # them into a single block since nothing depends on either yet
+    c = mc.Circuit()
+    for q in (0, 1):
+        c.push(mc.GateH(), q)
+        c.push(mc.GateT(), q)
+    c.push(mc.GateCX(), 0, 1)
+    f = mc.fuse_circuit(c, 2)
+    assert len(f) == 1
+    assert np.allclose(_circuit_unitary(c, 2), _circuit_unitary(f, 2), atol=1e-9)
+
+
+def test_closed_cluster_is_not_merged():
+    # cluster {0,1} loses wire 1 to a measurement, which is then followed by a
+    # CX(1, 2); a gate bridging {0,1} and the CX cluster must not merge them
+    c = mc.Circuit()
+    c.push(mc.GateCX(), 0, 1)
+    c.push(mc.Measure(), 1, 0)
+    c.push(mc.GateCX(), 1, 2)
+    c.push(mc.GateCX(), 0, 2)
+    f = mc.fuse_circuit(c, 3)
+    assert np.allclose(_circuit_unitary(c, 3), _circuit_unitary(f, 3), atol=1e-9)
+    assert [type(i.operation) for i in f].count(mc.Measure) == 1
+
+
+def test_cost_model_limits_width():
+    c = mc.Circuit()
+    for q in range(3):
+        c.push(mc.GateCX(), q, q + 1)
+    # Without a sweep cost growing a 3-qubit block to 4 qubits (16) costs more
+    # than a separate 2-qubit block (8 + 4), so the chain splits in two.
+    f = mc.fuse_circuit(c, 4, cost_model=mc.FusionCostModel(sweep_cost=0.0))
+    assert [i.operation.num_qubits for i in f] == [3, 2]
+    f = mc.fuse_circuit(c, 4)
+    assert len(f) == 1
+    assert np.allclose(_circuit_unitary(c, 4), _circuit_unitary(f, 4), atol=1e-9)
+
+
+def test_diagonal_blocks():
+    c = mc.Circuit()
+    c.push(mc.GateRZ(0.3), 0)
+    c.push(mc.GateCZ(), 0, 1)
+    c.push(mc.GateT(), 1)
+    c.push(mc.GateRZZ(0.7), 1, 2)
+    f = mc.fuse_circuit(c, 3, diagonal=True)
+    assert len(f) == 1
+    op = f[0].operation
+    assert isinstance(op, mc.GateDiagonal)
+    assert op.diagonal.shape == (8,)
+    assert np.allclose(_circuit_unitary(c, 3), _circuit_unitary(f, 3), atol=1e-9)
+    # without the option the same block is dense
+    assert isinstance(mc.fuse_circuit(c, 3)[0].operation, mc.GateCustom)
+
+
+def test_dense_diagonal_chain_is_priced_dense():
+    # without `diagonal=True` a diagonal cluster is emitted as a dense block,
+    # so it stops growing like any dense block instead of reaching 6 qubits
+    c = mc.Circuit()
+    c.push(mc.GateRZ(0.3), 0)
+    for q in range(5):
+        c.push(mc.GateCZ(), q, q + 1)
+    f = mc.fuse_circuit(c, max_support=6)
+    assert [i.operation.num_qubits for i in f] == [5, 2]
+    assert np.allclose(_circuit_unitary(c, 6), _circuit_unitary(f, 6), atol=1e-9)
+    f = mc.fuse_circuit(c, max_support=6, diagonal=True)
+    assert [type(i.operation) for i in f] == [mc.GateDiagonal]
+
+
+def test_diagonal_block_stays_diagonal_when_cheaper():
+    # a wide diagonal block does not absorb a dense gate: a separate 1-qubit
+    # block is cheaper than turning the 5-qubit diagonal into a dense one
+    c = mc.Circuit()
+    for q in range(4):
+        c.push(mc.GateCZ(), q, q + 1)
+    c.push(mc.GateH(), 0)
+    f = mc.fuse_circuit(c, 5, diagonal=True)
+    assert [type(i.operation) for i in f] == [mc.GateDiagonal, mc.GateH]
+
+
+def test_gatediagonal_roundtrips_through_proto():
+    from mimiqcircuits.proto.circuitproto import toproto_circuit, fromproto_circuit
+
+    c = mc.Circuit()
+    c.push(mc.GateDiagonal([1, 1j, -1, -1j]), 0, 1)
+    back = fromproto_circuit(toproto_circuit(c))
+    assert np.allclose(
+        back[0].operation.unwrappedmatrix(), c[0].operation.unwrappedmatrix()
+    )
+
+
+def _numeric_unitary(circuit, nq):
+    # NumPy-only counterpart of `_circuit_unitary`: the SymEngine embedding is
+    # too slow for the wider registers exercised below.
+    u = np.eye(2**nq, dtype=complex)
+    for inst in circuit:
+        if isinstance(inst.operation, mc.Gate):
+            u = reorder_qubits_matrix(inst.operation.unwrappedmatrix(), list(inst.qubits), nq) @ u
+    return u
+
+
+def test_random_equivalence_wide():
+    rng = Random(20261018)
+    g1 = [mc.GateH, mc.GateT, mc.GateS, lambda: mc.GateRZ(0.4), lambda: mc.GateRX(1.3)]
+    g2 = [mc.GateCX, mc.GateCZ, lambda: mc.GateRZZ(0.2)]
+    for _ in range(40):
+        nq = rng.randint(2, 6)
+        c = mc.Circuit()
+        for _ in range(rng.randint(4, 30)):
+            r = rng.random()
+            if r < 0.45:
+                c.push(rng.choice(g1)(), rng.randrange(nq))
+            elif r < 0.92:
+                a, b = rng.sample(range(nq), 2)
+                c.push(rng.choice(g2)(), a, b)
+            else:
+                q = rng.randrange(nq)
+                c.push(mc.Measure(), q, q)
+        for width in (3, 4, 5):
+            f = mc.fuse_circuit(c, width, diagonal=True)
+            assert np.allclose(_numeric_unitary(c, nq), _numeric_unitary(f, nq), atol=1e-9)
+
+
+def test_gate_after_boundary_joins_open_cluster():
+    # after a full barrier, H(0) starts a cluster and CX(0, 1) joins it even
+    # though its other wire was last touched by the barrier
+    c = mc.Circuit()
+    c.push(mc.GateH(), 1)
+    c.push(mc.Barrier(2), 0, 1)
+    c.push(mc.GateH(), 0)
+    c.push(mc.GateCX(), 0, 1)
+    f = mc.fuse_circuit(c)
+    assert [type(i.operation) for i in f] == [mc.GateH, mc.Barrier, mc.GateCustom]
+def test_synthesize_matches_embedded_product():
+    from mimiqcircuits.fusion import _synthesize
+
+    c = mc.Circuit()
+    c.push(mc.GateCX(), 3, 0)
+    c.push(mc.GateRX(0.4), 5)
+    c.push(mc.GateCU(0.1, 0.2, 0.3, 0.4), 5, 3)
+    c.push(mc.GateSWAP(), 0, 5)
+    support = [0, 3, 5]
+    members = [(inst, inst.operation.unwrappedmatrix()) for inst in c]
+    expected = np.eye(8, dtype=complex)
+    for inst in c:
+        localq = [support.index(q) for q in inst.qubits]
+        expected = reorder_qubits_matrix(inst.operation.unwrappedmatrix(), localq, 3) @ expected
+    assert np.allclose(_synthesize(members, support), expected)
+
+
+def test_repeated_blocks_share_one_gate():
+    c = mc.Circuit()
+    for _ in range(3):
+        for q in (0, 2):
+            c.push(mc.GateH(), q)
+            c.push(mc.GateCX(), q, q + 1)
+        c.push(mc.Barrier(4), 0, 1, 2, 3)
+    f = mc.fuse_circuit(c)
+    blocks = [i.operation for i in f if isinstance(i.operation, mc.GateCustom)]
+    assert len(blocks) == 6
+    assert all(b is blocks[0] for b in blocks)
+    assert np.allclose(_numeric_unitary(c, 4), _numeric_unitary(f, 4), atol=1e-9)
+
+
+def test_eachfused_matches_fuse_circuit():
+    rng = Random(7)
+    g1 = [mc.GateH, mc.GateT, lambda: mc.GateRX(0.3)]
+    for _ in range(30):
+        nq = rng.randint(2, 5)
+        c = mc.Circuit()
+        for _ in range(rng.randint(3, 30)):
+            r = rng.random()
+            if r < 0.45:
+                c.push(rng.choice(g1)(), rng.randrange(nq))
+            elif r < 0.85:
+                a, b = rng.sample(range(nq), 2)
+                c.push(mc.GateCX(), a, b)
+            else:
+                q = rng.randrange(nq)
+                c.push(mc.Measure(), q, q)
+        batch = mc.fuse_circuit(c, 3)
+        stream = mc.Circuit(list(mc.eachfused(c, 3)))
+        assert len(stream) == len(batch)
+        assert np.allclose(_numeric_unitary(stream, nq), _numeric_unitary(batch, nq), atol=1e-9)
+
+
+def test_eachfused_yields_before_the_end():
+    # the first block is final once the measurements take both of its wires,
+    # so it comes out before the rest of the circuit is read
+    c = mc.Circuit()
+    c.push(mc.GateH(), 0)
+    c.push(mc.GateCX(), 0, 1)
+    c.push(mc.Measure(), 0, 0)
+    c.push(mc.Measure(), 1, 1)
+    c.push(mc.GateH(), 0)
+    c.push(mc.GateH(), 1)
+    seen = []
+
+    def source():
+        for i, inst in enumerate(c):
+            seen.append(i)
+            yield inst
+
+    class Lazy:
+        def __iter__(self):
+            return source()
+
+        def num_qubits(self):
+            return 2
+
+    it = mc.eachfused(Lazy())
+    first = next(it)
+    assert isinstance(first.operation, mc.GateCustom)
+    assert seen == [0, 1, 2, 3]
+    assert [str(i.operation) for i in it] == ["M", "M", "H", "H"]
+
+
+def test_fuse_circuit_long_chain_is_fast():
+    # many independent clusters: the ordering must stay linear
+    c = mc.Circuit()
+    for _ in range(2000):
+        for q in range(0, 8, 2):
+            c.push(mc.GateCX(), q, q + 1)
+            c.push(mc.Measure(), q, q)
+    f = mc.fuse_circuit(c)
+    assert len(f) == len(c)
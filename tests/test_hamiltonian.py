@@ -163,3 +163,207 @@ def test_push_suzuki_order_and_qubit_errors():
 
     with pytest.raises(ValueError):
         mc.Circuit().push_suzukitrotter(h, (0,), t=1.0, steps=2, order=2)
+
+
+def test_hamiltonian_sparse_matrix_and_linear_operator():
+    import numpy as np
+    from symengine import Symbol
+
+    h = mc.Hamiltonian()
+    h.push(1.0, mc.PauliString("XY"), 2, 0)
+    h.push(-0.5, mc.PauliString("ZZ"), 0, 1)
+    h.push(0.25, mc.PauliString("Y"), 1)
+    h.push(0.75, mc.PauliString("ZX"), 2, 0)
+
+    dense = np.array(h.matrix().tolist(), dtype=complex)
+    assert np.allclose(h.sparse_matrix().toarray(), dense)
+
+    rng = np.random.default_rng(3)
+    psi = rng.normal(size=8) + 1j * rng.normal(size=8)
+    assert np.allclose(h.linear_operator() @ psi, dense @ psi)
+
+    # embedding in more qubits adds the extra qubits as least significant
+    assert np.allclose(h.sparse_matrix(4).toarray(), np.kron(dense, np.eye(2)))
+
+    hs = mc.Hamiltonian()
+    hs.push(Symbol("a"), mc.PauliString("Z"), 0)
+    with pytest.raises(ValueError, match="symbolic"):
+        hs.sparse_matrix()
+
+
+def _expval_operator(c, zvar, n):
+    """The operator whose expectation value the circuit stores in z[zvar]."""
+    import numpy as np
+
+    z = {}
+    for inst in c:
+        op = inst.operation
+        if isinstance(op, mc.ExpectationValue):
+            k = len(inst.qubits)
+            m = np.array(op.op.matrix().tolist(), dtype=complex).reshape([2] * 2 * k)
+            rest = [q for q in range(n) if q not in inst.qubits]
+            eye = np.eye(2 ** len(rest)).reshape([2] * 2 * len(rest))
+            full = np.einsum(
+                m,
+                [*inst.qubits, *(n + q for q in inst.qubits)],
+                eye,
+                [*rest, *(n + q for q in rest)],
+                list(range(2 * n)),
+            )
+            z[inst.zvars[0]] = full.reshape(2**n, 2**n)
+        elif isinstance(op, mc.Multiply):
+            z[inst.zvars[0]] = complex(op.factor) * z[inst.zvars[1]]
+        elif isinstance(op, mc.Add):
+            total = complex(op.term) * np.eye(2**n)
+            for v in inst.zvars[1:]:
+                total = total + z[v]
+            z[inst.zvars[0]] = total
+    return z[zvar]
+
+
+def test_push_expval_group():
+    import numpy as np
+
+    h = mc.Hamiltonian()
+    h.push(-1.5, mc.PauliString("II"), 0, 1)
+    for i in range(4):
+        h.push(0.3, mc.PauliString("X"), i)
+        h.push(0.7, mc.PauliString("ZZ"), i, (i + 1) % 4)
+    h.push(0.2, mc.PauliString("XY"), 3, 1)
+    h.push(0.2, mc.PauliString("YZ"), 1, 2)
+    h.push(0.4, mc.PauliString("XZXZ"), 0, 1, 2, 3)
+    h.push(0.4, mc.PauliString("ZXZ"), 1, 2, 3)
+    h.push(0.1, mc.PauliString("XZXZ"), 0, 1, 2, 3)
+    h.push(-0.3, mc.PauliString("YIYY"), 0, 1, 2, 3)
+
+    plain = mc.Circuit().push_expval(h, 0, 1, 2, 3, firstzvar=2)
+    grouped = mc.Circuit().push_expval(h, 0, 1, 2, 3, firstzvar=2, group=True)
+    assert len(grouped) < len(plain) // 2
+
+    dense = np.array(h.matrix().tolist(), dtype=complex)
+    assert np.allclose(_expval_operator(plain, 2, 4), dense)
+    assert np.allclose(_expval_operator(grouped, 2, 4), dense)
+
+    # grouped terms follow the qubit mapping
+    grouped = mc.Circuit().push_expval(h, 3, 0, 2, 1, group=True)
+    plain = mc.Circuit().push_expval(h, 3, 0, 2, 1)
+    assert np.allclose(_expval_operator(grouped, 0, 4), _expval_operator(plain, 0, 4))
+
+    # only the identity
+    h = mc.Hamiltonian()
+    h.push(2.0, mc.PauliString("I"), 0)
+    c = mc.Circuit().push_expval(h, 0, group=True)
+    assert len(c) == 1
+    assert np.allclose(_expval_operator(c, 0, 1), 2 * np.eye(2))
+
+
+def _gate_count(c):
+    return sum(
+        _gate_count(inst.operation._decl.circuit)
+        if isinstance(inst.operation, mc.GateCall)
+        else 1
+        for inst in c
+    )
+
+
+def _unitary(c, n):
+    import numpy as np
+
+    u = np.eye(2**n, dtype=complex)
+    for inst in c:
+        u = np.array(inst.matrix(n).tolist(), dtype=complex) @ u
+    return u
+
+
+@pytest.mark.parametrize(
+    "push, order",
+    [
+        ("push_lietrotter", None),
+        ("push_suzukitrotter", 2),
+        ("push_suzukitrotter", 4),
+        ("push_yoshidatrotter", 4),
+    ],
+)
+def test_push_trotter_optimize(push, order):
+    import numpy as np
+    from scipy.linalg import expm
+
+    h = mc.Hamiltonian()
+    for i in range(4):
+        h.push(0.8, mc.PauliString("X"), i)
+    for i in range(3):
+        h.push(1.0, mc.PauliString("ZZ"), i, i + 1)
+        h.push(0.3, mc.PauliString("YY"), i + 1, i)
+    h.push(0.2, mc.PauliString("ZZ"), 1, 0)
+    exact = expm(-1j * h.sparse_matrix().toarray())
+
+    kwargs = {} if order is None else {"order": order}
+    push = getattr(mc.Circuit, push)
+    plain = push(mc.Circuit(), h, (0, 1, 2, 3), t=1.0, steps=4, **kwargs)
+    fused = push(
+        mc.Circuit(), h, (0, 1, 2, 3), t=1.0, steps=4, optimize=True, **kwargs
+    )
+
+    assert _gate_count(fused) < _gate_count(plain)
+    error = np.abs(_unitary(plain, 4) - exact).max()
+    assert np.abs(_unitary(fused, 4) - exact).max() < 1.5 * error
+
+
+def test_push_trotter_optimize_layers():
+    import numpy as np
+    from scipy.linalg import expm
+
+    # commuting terms on disjoint qubits form one layer: a single step is exact
+    h = mc.Hamiltonian()
+    h.push(0.5, mc.PauliString("ZZ"), 0, 1)
+    h.push(0.7, mc.PauliString("X"), 2)
+    h.push(0.5, mc.PauliString("XX"), 0, 1)
+    h.push(0.5, mc.PauliString("ZZ"), 0, 1)
+    c = mc.Circuit().push_suzukitrotter(h, (0, 1, 2), t=0.9, steps=3, optimize=True)
+    assert len(c) == 1
+    assert c[0].operation._decl.name == "suzukitrotter_edge"
+    exact = expm(-0.9j * h.sparse_matrix().toarray())
+    assert np.allclose(_unitary(c, 3), exact)
+
+    # the repeated ZZ is merged
+    body = c[0].operation._decl.circuit
+    assert len(body) == 3
+
+    # a layer that leaves the last qubit idle (here the middle Z) is applied
+    # to fewer qubits
+    h.push(0.3, mc.PauliString("Z"), 1)
+    c = mc.Circuit().push_suzukitrotter(h, (4, 5, 6), t=0.9, steps=1, optimize=True)
+    assert [inst.qubits for inst in c] == [(4, 5, 6), (4, 5), (4, 5, 6)]
+
+
+def test_hamiltonian_expectation():
+    import numpy as np
+
+    h = mc.Hamiltonian()
+    h.push(1.0, mc.PauliString("XY"), 2, 0)
+    h.push(-0.5, mc.PauliString("ZZ"), 0, 1)
+    h.push(0.25, mc.PauliString("Y"), 1)
+    h.push(0.75, mc.PauliString("ZX"), 2, 0)
+    h.push(0.3, mc.PauliString("Z"), 2)
+    h.push(-1.0, mc.PauliString("I"), 0)
+
+    rng = np.random.default_rng(5)
+    psi = rng.normal(size=8) + 1j * rng.normal(size=8)
+    dense = np.array(h.matrix().tolist(), dtype=complex)
+    value = h.expectation(psi)
+    assert isinstance(value, float)
+    assert np.isclose(value, np.vdot(psi, dense @ psi))
+
+    # extra qubits are the least significant bits of the index
+    psi4 = rng.normal(size=16) + 1j * rng.normal(size=16)
+    assert np.isclose(
+        h.expectation(psi4), np.vdot(psi4, np.kron(dense, np.eye(2)) @ psi4)
+    )
+
+    hc = mc.Hamiltonian().push(1j, mc.PauliString("X"), 0)
+    assert np.isclose(hc.expectation([0.6, 0.8]), 0.96j)
+
+    with pytest.raises(ValueError, match="state vector"):
+        h.expectation(np.ones(4))
+    with pytest.raises(ValueError, match="state vector"):
+        h.expectation(np.ones(12))
@@ -218,3 +218,75 @@ def test_decorate_rule_instruction_mapping_filters_lost_targets():
     expected.push(Lost(), 1)
     expected.push(GateX(), 0)
     assert resolve_losses(c, lossmodel=model) == expected
+
+
+def _random_loss_circuit(rng, nq=4, n=60):
+    c = Circuit()
+    for _ in range(n):
+        q = rng.randrange(nq)
+        kind = rng.randrange(7)
+        if kind == 0:
+            c.push(Loss(rng.choice([0.3, 0.7, 1.0])), q)
+        elif kind == 1:
+            c.push(Reload(), q)
+        elif kind == 2:
+            c.push(Check(), q, rng.randrange(3))
+        elif kind == 3:
+            c.push(MeasureCheck(), q, rng.randrange(3), 3)
+        elif kind == 4:
+            c.push(Measure(), q, rng.randrange(3))
+        else:
+            p = (q + 1 + rng.randrange(nq - 1)) % nq
+            c.push(GateCX(), q, p)
+    return c
+
+
+def test_loss_sampler_matches_resolve_losses():
+    import random
+
+    model = LossModel(
+        [
+            CustomRule(
+                lambda inst: isinstance(inst.get_operation(), GateCX),
+                lambda inst, lost, rng: [
+                    Instruction(GateRX(rng.random()), (q,))
+                    for q in inst.get_qubits()
+                    if not lost.get(q, False)
+                ],
+            )
+        ]
+    )
+    gen = random.Random(3)
+    for _ in range(10):
+        c = _random_loss_circuit(gen)
+        for lossmodel in (None, model):
+            sampler = LossSampler(c, lossmodel)
+            assert sampler.cacheable is (lossmodel is None)
+            for seed in range(5):
+                ref = random.Random(seed)
+                expected = resolve_losses(c, ref, lossmodel)
+                rng = random.Random(seed)
+                got = sampler.variant(sampler.sample_pattern(rng), rng)
+                assert got == expected
+                # both consumed the same draws
+                assert rng.random() == ref.random()
+
+
+def test_loss_sampler_caches_variants():
+    c = Circuit()
+    c.push(Loss(0.5), 0)
+    c.push(GateCX(), 0, 1)
+    sampler = LossSampler(c)
+    assert sampler.num_events == 1
+    assert sampler.variant(1) is sampler.variant(1)
+    assert sampler.variant(0) != sampler.variant(1)
+    assert sampler.sample_pattern(DummyRng(0.4)) == 1
+    assert sampler.sample_pattern(DummyRng(0.6)) == 0
+
+
+def test_loss_sampler_symbolic_probability_raises():
+    x = se.Symbol("x")
+    c = Circuit()
+    c.push(Loss(x), 0)
+    with pytest.raises(ValueError):
+        LossSampler(c)
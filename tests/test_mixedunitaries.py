@@ -0,0 +1,105 @@
+import random
+
+import numpy as np
+import pytest
+
+from mimiqcircuits import *
+
+
+def _noisy_circuit():
+    c = Circuit()
+    c.push(GateH(), 0)
+    c.push(Depolarizing1(0.3), 0)
+    c.push(GateCX(), 0, 1)
+    c.push(PauliZ(0.5), 1)
+    c.push(AmplitudeDamping(0.1), 1)
+    c.push(Depolarizing1(0.3), 1)
+    return c
+
+
+def test_sampler_positions_and_shape():
+    sampler = MixedUnitarySampler(_noisy_circuit())
+    assert sampler.positions.tolist() == [1, 3, 5]
+    choices = sampler.sample(7, rng=np.random.default_rng(0))
+    assert choices.shape == (7, 3)
+    assert choices.dtype.kind == "i"
+
+    empty = MixedUnitarySampler(Circuit().push(GateH(), 0))
+    assert empty.sample(5).shape == (5, 0)
+
+
+def test_sampler_frequencies_match_probabilities():
+    c = _noisy_circuit()
+    choices = c.sample_mixedunitary_choices(200_000, rng=np.random.default_rng(3))
+    for j, pos in enumerate(MixedUnitarySampler(c).positions):
+        op = c.instructions[pos].get_operation()
+        probs = np.array([float(p) for p in op.probabilities()])
+        freq = np.bincount(choices[:, j], minlength=probs.size) / choices.shape[0]
+        assert np.allclose(freq, probs, atol=5e-3)
+
+
+def test_zero_probability_branch_never_chosen():
+    c = Circuit().push(MixedUnitary([0.0, 1.0, 0.0], [GateID(), GateX(), GateY()]), 0)
+    choices = c.sample_mixedunitary_choices(1000, rng=random.Random(2))
+    assert np.all(choices == 1)
+
+
+def test_instructions_replay_matches_sample_mixedunitaries():
+    lossy = MixedUnitary([0.5, 0.5], [GateID(), GateX()], lossy=[[], [1]])
+    c = Circuit().push(GateH(), 2).push(lossy, 2).push(PauliX(0.5), 0)
+    sampler = MixedUnitarySampler(c)
+
+    class FixedRng:
+        def __init__(self, values):
+            self._values = iter(values)
+
+        def random(self):
+            return next(self._values)
+
+    for row, draws in (([1, 0], [0.7, 0.1]), ([0, 1], [0.1, 0.7])):
+        for ids in (False, True):
+            expected = c.sample_mixedunitaries(rng=FixedRng(draws), ids=ids)
+            assert sampler.circuit_for(np.array(row), ids=ids) == expected
+
+    with pytest.raises(ValueError):
+        list(sampler.instructions([0]))
+
+
+def test_sample_mixedunitaries_default_rng():
+    c = Circuit().push(PauliX(0.5), 0)
+    assert len(c.sample_mixedunitaries()) <= 1
+
+
+def test_randomized_family_expands_lazily_and_round_trips(tmp_path):
+    c = Circuit()
+    for q in range(3):
+        c.push(GateH(), q)
+        c.push(Depolarizing1(0.3), q)
+    c.push(GateCX(), 0, 1)
+    c.push(Depolarizing2(0.1), 0, 1)
+
+    family = RandomizedCircuitFamily.sample(c, 200, rng=np.random.default_rng(5))
+    assert len(family) == 200
+    assert family.choices.shape == (200, 4)
+    assert family.choices.dtype == np.uint8
+    assert family[7] == family.sampler.circuit_for(family.choices[7])
+    assert list(family.instructions(7)) == list(family[7])
+    assert len(family[10:20]) == 10
+    assert list(family)[3] == family[3]
+
+    path = tmp_path / "family.npz"
+    assert family.save(str(path)) == path.stat().st_size
+    loaded = RandomizedCircuitFamily.load(str(path))
+    assert loaded.skeleton == c
+    assert np.array_equal(loaded.choices, family.choices)
+    assert all(loaded[k] == family[k] for k in range(0, 200, 37))
+
+
+def test_randomized_family_rejects_bad_choices():
+    c = Circuit().push(PauliX(0.5), 0)
+    with pytest.raises(ValueError):
+        RandomizedCircuitFamily(c, np.zeros((3, 2), dtype=int))
+    with pytest.raises(ValueError):
+        RandomizedCircuitFamily(c, np.full((3, 1), 2))
+    with pytest.raises(ValueError):
+        RandomizedCircuitFamily(c, np.full((3, 1), 0.5))
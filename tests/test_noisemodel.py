@@ -429,3 +429,303 @@ def test_apply_noise_model_recurses_into_parallel_and_repeat():
     op_repeat = noisy_repeat.instructions[0].get_operation()
     assert isinstance(op_repeat, Block)
     assert len(op_repeat.instructions) == 4
+
+
+def _first_match_by_scan(inst, model):
+    for rule in model.rules:
+        if rule.matches(inst):
+            return rule
+    return None
+
+
+def test_rule_index_matches_linear_scan():
+    import random
+
+    from mimiqcircuits.noisemodel import _RuleIndex
+
+    rng = random.Random(11)
+    model = NoiseModel()
+    for q in range(6):
+        model.add_operation_noise(GateX(), AmplitudeDamping(0.01 * (q + 1)), qubits=[q], exact=True)
+        model.add_readout_noise(ReadoutErr(0.01, 0.02), qubits=[q], exact=True)
+    for a in range(6):
+        for b in range(6):
+            if a != b and rng.random() < 0.4:
+                model.add_operation_noise(
+                    GateCX(), Depolarizing(2, 0.01), qubits=[a, b], exact=True
+                )
+    model.add_operation_noise(GateCX(), Depolarizing(2, 0.05), qubits=[0, 1, 2])
+    model.add_operation_noise(GateH(), AmplitudeDamping(0.2))
+    model.add_operation_noise(GateRX(0.3), AmplitudeDamping(0.3))
+    model.add_readout_noise(ReadoutErr(0.05, 0.05), qubits=[3, 4])
+    model.add_readout_noise(ReadoutErr(0.1, 0.1))
+    model.add_idle_noise(AmplitudeDamping(0.4), qubits=[1, 2])
+    model.add_idle_noise(AmplitudeDamping(0.5))
+    model.add_rule(
+        CustomNoiseRule(
+            lambda inst: inst.get_qubits() == (5,),
+            lambda inst: Instruction(PauliX(0.1), inst.get_qubits()),
+        )
+    )
+
+    c = Circuit()
+    for _ in range(300):
+        kind = rng.randrange(6)
+        q = rng.randrange(6)
+        if kind == 0:
+            c.push(GateX(), q)
+        elif kind == 1:
+            c.push(GateCX(), q, (q + rng.randrange(1, 6)) % 6)
+        elif kind == 2:
+            c.push(GateH(), q)
+        elif kind == 3:
+            c.push(GateRX(rng.choice([0.3, 0.4])), q)
+        elif kind == 4:
+            c.push(Measure(), q, q)
+        else:
+            c.push(Delay(0.1), q)
+
+    index = _RuleIndex(model.rules)
+    for inst in c:
+        expected = _first_match_by_scan(inst, model)
+        found = next((r for r in index.candidates(inst) if r.matches(inst)), None)
+        assert found is expected
+
+
+def test_custom_rule_keeps_priority_over_indexed_rules():
+    c = Circuit().push(GateH(), 0).push(GateH(), 1)
+    model = NoiseModel(
+        [
+            OperationInstanceNoise(GateH(), AmplitudeDamping(0.01)),
+            CustomNoiseRule(
+                lambda inst: inst.get_qubits() == (1,),
+                lambda inst: Instruction(PauliX(0.1), inst.get_qubits()),
+            ),
+        ]
+    )
+    noisy = apply_noise_model(c, model)
+    assert isinstance(noisy.instructions[1].get_operation(), AmplitudeDamping)
+    assert isinstance(noisy.instructions[3].get_operation(), PauliX)
+
+
+def test_rules_mutated_between_applications():
+    c = Circuit().push(GateH(), 0)
+    model = NoiseModel()
+    assert len(apply_noise_model(c, model)) == 1
+    model.rules.append(OperationInstanceNoise(GateH(), AmplitudeDamping(0.01)))
+    assert len(apply_noise_model(c, model)) == 2
+
+
+def test_repeated_gatecall_rewritten_once():
+    from symengine import symbols
+
+    theta = symbols("theta")
+    body = Circuit().push(GateH(), 0).push(GateRX(theta), 0)
+    decl = GateDecl("hrx", (theta,), body)
+
+    c = Circuit()
+    for q in range(50):
+        c.push(decl(0.5), q)
+    c.push(decl(0.7), 0)
+
+    model = NoiseModel([OperationInstanceNoise(GateH(), AmplitudeDamping(0.01))])
+    noisy = apply_noise_model(c, model)
+
+    ops = [inst.get_operation() for inst in noisy.instructions]
+    assert all(isinstance(op, Block) for op in ops)
+    assert all(op is ops[0] for op in ops[:50])
+    assert ops[50] is not ops[0]
+    assert ops[50].instructions[2].get_operation() == GateRX(0.7)
+
+
+def test_shared_block_rewritten_once():
+    block = Block(Circuit().push(GateH(), 0))
+    c = Circuit().push(block, 0).push(block, 1).push(Repeat(2, block), 2)
+
+    model = NoiseModel([OperationInstanceNoise(GateH(), AmplitudeDamping(0.01))])
+    noisy = apply_noise_model(c, model)
+
+    first, second, repeated = (inst.get_operation() for inst in noisy.instructions)
+    assert first is second
+    assert len(first.instructions) == 2
+    inner = [inst.get_operation() for inst in repeated.instructions]
+    assert inner[0] is inner[1]
+    assert len(inner[0].instructions) == 2
+
+
+def _delays(circuit):
+    return [
+        (inst.get_qubits(), inst.get_operation().t)
+        for inst in circuit
+        if isinstance(inst.get_operation(), Delay)
+    ]
+
+
+def test_insert_idle_delays_merges_idle_layers():
+    c = Circuit()
+    c.push(GateH(), 0)
+    for _ in range(3):
+        c.push(GateX(), 1)
+    c.push(Barrier(2), 0, 1)
+    c.push(GateCX(), 0, 1)
+    c.push(GateH(), 2)
+
+    idle = insert_idle_delays(c)
+    # q0 waits for the three X gates on q1 as one period; q2 has a single
+    # instruction and is never idle.
+    assert _delays(idle) == [((0,), 2.0)]
+    assert idle.instructions[5].get_operation() == Delay(2.0)
+    assert [inst for inst in idle if not isinstance(inst.get_operation(), Delay)] == list(c)
+
+
+def test_insert_idle_delays_with_durations():
+    c = Circuit().push(GateH(), 0).push(GateCX(), 1, 2).push(GateCX(), 0, 1)
+
+    idle = insert_idle_delays(c, {GateCX: 3.0, GateH: 0.5})
+    assert _delays(idle) == [((0,), 2.5)]
+
+    idle = insert_idle_delays(c, lambda inst: len(inst.get_qubits()))
+    assert _delays(idle) == [((0,), 1.0)]
+
+    with pytest.raises(ValueError):
+        insert_idle_delays(c, {GateH: -1})
+
+
+def test_insert_idle_delays_counts_explicit_delays():
+    c = Circuit().push(Delay(3.0), 0).push(GateX(), 1).push(GateCX(), 0, 1)
+
+    # q1 waits for the explicit delay on q0, not for one time unit
+    idle = insert_idle_delays(c)
+    assert _delays(idle) == [((0,), 3.0), ((1,), 2.0)]
+
+    # a listed duration still takes precedence
+    idle = insert_idle_delays(c, {Delay: 0.5})
+    assert _delays(idle) == [((0,), 3.0), ((0,), 0.5)]
+
+
+def test_apply_noise_model_insert_idle():
+    from symengine import symbols
+
+    t = symbols("t")
+    c = Circuit().push(GateH(), 0)
+    for _ in range(4):
+        c.push(GateX(), 1)
+    c.push(GateCX(), 0, 1)
+
+    model = NoiseModel()
+    model.add_idle_noise((t, AmplitudeDamping(t / 100)))
+
+    assert len(apply_noise_model(c, model)) == len(c)
+
+    noisy = model.apply_noise_model(c, insert_idle=True)
+    channels = [
+        inst for inst in noisy if isinstance(inst.get_operation(), AmplitudeDamping)
+    ]
+    assert len(channels) == 1
+    assert channels[0].get_qubits() == (0,)
+    assert float(channels[0].get_operation().getparam("gamma")) == pytest.approx(0.03)
+
+
+def test_iter_noisy_instructions_matches_apply():
+    c = Circuit()
+    c.push(GateH(), 0)
+    c.push(GateX(), 1)
+    c.push(GateX(), 1)
+    c.push(GateCX(), 0, 1)
+    c.push(Measure(), 0, 0)
+    model = NoiseModel()
+    model.add_operation_noise(GateCX(), Depolarizing(2, 0.01))
+    model.add_readout_noise(ReadoutErr(0.01, 0.02))
+    model.add_idle_noise(AmplitudeDamping(0.001))
+
+    assert list(iter_noisy_instructions(c, model)) == list(apply_noise_model(c, model))
+    assert list(iter_noisy_instructions(c, model, insert_idle=True)) == list(
+        apply_noise_model(c, model, insert_idle=True)
+    )
+
+
+def test_iter_noisy_instructions_is_lazy():
+    def source():
+        yield Instruction(GateH(), (0,))
+        raise RuntimeError("consumed too far")
+
+    model = NoiseModel([OperationInstanceNoise(GateH(), AmplitudeDamping(0.01))])
+    it = iter_noisy_instructions(source(), model)
+    assert isinstance(next(it).get_operation(), GateH)
+    assert isinstance(next(it).get_operation(), AmplitudeDamping)
+    with pytest.raises(RuntimeError):
+        next(it)
+
+
+def test_noise_model_pass_in_pipeline():
+    from mimiqcircuits.backends import PassContext, PassPipeline, apply_passes
+
+    model = NoiseModel([OperationInstanceNoise(GateH(), AmplitudeDamping(0.01))])
+    c = Circuit().push(GateH(), 0).push(GateH(), 1)
+    pipeline = PassPipeline([NoiseModelPass(model)])
+    noisy, perm, results = apply_passes(pipeline, PassContext(), c)
+
+    assert noisy == apply_noise_model(c, model)
+    assert perm is None
+    assert results[0].metadata["after"] == 4
+    assert NoiseModelPass(model).spec() == NoiseModelPass(model).spec()
+    assert NoiseModelPass(model).spec() != NoiseModelPass(NoiseModel()).spec()
+    assert not NoiseModelPass(model).preserves("exact_equivalence")
+
+
+def test_noise_model_pass_spec_includes_durations():
+    model = NoiseModel([IdleNoise(AmplitudeDamping(0.01))])
+    spec = NoiseModelPass(model, durations={GateH: 2.0}).spec()
+    assert spec.name == "apply_noise_model"
+    assert spec != NoiseModelPass(model, durations={GateH: 3.0}).spec()
+
+    def duration(inst):
+        return 1.0
+
+    spec = dict(NoiseModelPass(model, durations=duration).spec().parameters)
+    assert spec["durations"].value.endswith("duration")
+    assert spec["serializable"].value is False
+
+
+def test_unitary_noise_keeps_gatecall_declaration(tmp_path):
+    decl = GateDecl("hh", (), Circuit().push(GateH(), 0).push(GateH(), 1))
+    c = Circuit()
+    for q in range(0, 20, 2):
+        c.push(decl(), q, q + 1)
+
+    model = NoiseModel([OperationInstanceNoise(GateH(), GateRZ(0.01))])
+    noisy = apply_noise_model(c, model)
+
+    ops = [inst.get_operation() for inst in noisy.instructions]
+    assert all(isinstance(op, GateCall) for op in ops)
+    assert all(op.decl is ops[0].decl for op in ops)
+    assert ops[0].decl is not decl
+    assert len(ops[0].decl.circuit) == 4
+
+    # the noisy declaration is written once for all its calls
+    from mimiqcircuits.proto.circuitproto import toproto_circuit
+
+    assert len(toproto_circuit(noisy).decls) == 1
+    path = tmp_path / "noisy.pb"
+    noisy.saveproto(str(path))
+    loaded = Circuit.loadproto(str(path))
+    assert str(loaded) == str(noisy)
+    assert loaded[0].get_operation().decl is loaded[1].get_operation().decl
+
+
+def test_truncated_rewrite_is_not_memoized():
+    a = GateDecl("A", (), Circuit().push(GateH(), 0))
+    b = GateDecl("B", (), Circuit().push(GateH(), 0))
+    a.circuit.push(b(), 0)
+    b.circuit.push(a(), 0)
+
+    c = Circuit().push(a(), 0).push(b(), 0)
+    model = NoiseModel([OperationInstanceNoise(GateH(), AmplitudeDamping(0.01))])
+    noisy = apply_noise_model(c, model)
+
+    # inside A, the call back to A is left as is; B at the top level still
+    # rewrites its own call to A
+    noisy_a, noisy_b = (inst.get_operation() for inst in noisy.instructions)
+    inner_b = noisy_a.instructions[2].get_operation()
+    assert isinstance(inner_b.instructions[2].get_operation(), GateCall)
+    assert isinstance(noisy_b.instructions[2].get_operation(), Block)
@@ -0,0 +1,109 @@
+import numpy as np
+import pytest
+from symengine import Symbol
+
+import mimiqcircuits as mc
+
+
+def _random_hamiltonian(rng, n, nterms):
+    h = mc.Hamiltonian()
+    for _ in range(nterms):
+        k = rng.integers(1, n + 1)
+        qubits = [int(q) for q in rng.choice(n, size=k, replace=False)]
+        pauli = "".join(rng.choice(list("IXYZ"), size=k))
+        h.push(float(rng.normal()), mc.PauliString(pauli), *qubits)
+    return h
+
+
+def _dense(p, n):
+    return p.to_hamiltonian().sparse_matrix(n).toarray()
+
+
+def test_paulisum_roundtrip():
+    rng = np.random.default_rng(7)
+    h = _random_hamiltonian(rng, 4, 12)
+    p = mc.PauliSum.from_hamiltonian(h)
+    assert len(p) == 12
+    assert p.x.dtype == np.uint64 and p.x.shape == (12, 1)
+    assert np.allclose(_dense(p, 4), h.sparse_matrix().toarray())
+
+    hs = mc.Hamiltonian().push(Symbol("a"), mc.PauliString("Z"), 0)
+    with pytest.raises(ValueError, match="symbolic"):
+        mc.PauliSum.from_hamiltonian(hs)
+
+
+def test_paulisum_arithmetic():
+    rng = np.random.default_rng(11)
+    a = mc.PauliSum.from_hamiltonian(_random_hamiltonian(rng, 3, 6))
+    b = mc.PauliSum.from_hamiltonian(_random_hamiltonian(rng, 4, 5))
+    A, B = _dense(a, 4), _dense(b, 4)
+    I = np.eye(16)
+
+    assert np.allclose(_dense(a + b, 4), A + B)
+    assert np.allclose(_dense(a - 2 * b, 4), A - 2 * B)
+    assert np.allclose(_dense(1.5 - a, 4), 1.5 * I - A)
+    assert np.allclose(_dense(a * b, 4), A @ B)
+    assert len(a * b) == len(a) * len(b)
+
+    s = (a * a + a * b - b * a).simplify()
+    assert len(s) < len(a * a) + 2 * len(a) * len(b)
+    assert np.allclose(_dense(s, 4), A @ A + A @ B - B @ A)
+    assert len((a - a).simplify()) == 0
+
+
+def test_paulisum_simplify_keeps_first_order():
+    h = mc.Hamiltonian()
+    h.push(1.0, mc.PauliString("ZZ"), 1, 2)
+    h.push(1.0, mc.PauliString("X"), 0)
+    h.push(2.0, mc.PauliString("ZZ"), 1, 2)
+    h.push(-1.0, mc.PauliString("X"), 0)
+    h.push(0.5, mc.PauliString("Y"), 2)
+    p = mc.PauliSum.from_hamiltonian(h).simplify()
+    assert [(c, s, q) for c, s, q in p] == [(3.0, "ZZ", (1, 2)), (0.5, "Y", (2,))]
+
+
+def test_paulisum_commutation():
+    h = mc.Hamiltonian()
+    h.push(1.0, mc.PauliString("XX"), 0, 1)
+    h.push(1.0, mc.PauliString("YY"), 0, 1)
+    h.push(1.0, mc.PauliString("ZI"), 0, 1)
+    h.push(1.0, mc.PauliString("X"), 2)
+    p = mc.PauliSum.from_hamiltonian(h)
+
+    expected = np.array(
+        [
+            [True, True, False, True],
+            [True, True, False, True],
+            [False, False, True, True],
+            [True, True, True, True],
+        ]
+    )
+    assert (p.commutation_matrix() == expected).all()
+    qwc = p.commutation_matrix(qubitwise=True)
+    assert not qwc[0, 1] and qwc[0, 3] and qwc[2, 3]
+
+    # XX + YY commutes with ZZ and with Z0 + Z1, but not with Z0 alone
+    zz = mc.Hamiltonian().push(1.0, mc.PauliString("ZZ"), 0, 1)
+    z0 = mc.Hamiltonian().push(1.0, mc.PauliString("Z"), 0)
+    z01 = mc.Hamiltonian().push(1.0, mc.PauliString("Z"), 0)
+    z01.push(1.0, mc.PauliString("Z"), 1)
+    xx_yy = p[:2]
+    assert xx_yy.commutes(mc.PauliSum.from_hamiltonian(zz))
+    assert xx_yy.commutes(mc.PauliSum.from_hamiltonian(z01))
+    assert not xx_yy.commutes(mc.PauliSum.from_hamiltonian(z0))
+    assert p.commutes(p)
+
+
+def test_paulisum_many_qubits():
+    h = mc.Hamiltonian()
+    h.push(1.0, mc.PauliString("XZ"), 3, 100)
+    h.push(1.0, mc.PauliString("ZY"), 3, 100)
+    p = mc.PauliSum.from_hamiltonian(h)
+    assert p.x.shape == (2, 2)
+    assert p.commutation_matrix()[0, 1]
+    assert not p.commutation_matrix(qubitwise=True)[0, 1]
+
+    # XZ * ZY = (XZ)(ZY) = (-iY)(iX) on the two qubits
+    # X Z on qubits 3, 100 times Z Y: (-iY)(-iX) = -YX
+    assert list(p[0] * p[1]) == [(-1, "YX", (3, 100))]
+    assert list(p[::-1]) == list(p[[1, 0]]) == [(1, "ZY", (3, 100)), (1, "XZ", (3, 100))]
@@ -47,6 +47,40 @@ def test_scientific_notation():
     assert tokens[1].kind == TokenKind.REAL
 
 
+def test_lexer_tokens_and_positions():
+    import io
+
+    from mimiqcircuits.qasm.lexer import Lexer
+    from mimiqcircuits.qasm.tokens import TokenKind
+
+    qasm = 'include "qelib1.inc";\n// rotation\nrx(-1.5e-3) q[10];\nx ** 1.2.;'
+    tokens = [t for t in tokenize(qasm) if t.kind != TokenKind.WHITESPACE]
+    assert [t.kind.name for t in tokens] == [
+        "INCLUDE", "STRING", "SEMICOLON", "COMMENT", "IDENTIFIER", "LPAREN",
+        "MINUS", "REAL", "RPAREN", "IDENTIFIER", "LSQUARE", "INTEGER",
+        "RSQUARE", "SEMICOLON", "IDENTIFIER", "ERROR", "REAL", "ERROR",
+        "SEMICOLON",
+    ]
+    assert tokens[1].val == "qelib1.inc"
+    assert tokens[3].val == "// rotation"
+    assert tokens[7].val == "1.5e-3" and tokens[11].val == "10"
+    assert tokens[15].token_error == "invalid operator"
+
+    # positions are (line, column), the end column inclusive
+    assert (tokens[4].startpos, tokens[4].endpos) == ((3, 1), (3, 2))
+    assert (tokens[11].startpos, tokens[11].endpos) == ((3, 15), (3, 16))
+    assert qasm[tokens[11].startbyte : tokens[11].endbyte] == "10"
+
+    # streams are read like strings, and iteration restarts from the top
+    lexer = Lexer(io.StringIO(qasm))
+    assert [t.val for t in lexer] == [t.val for t in tokenize(qasm)]
+    assert len(list(lexer)) == len(list(tokenize(qasm)))
+
+    tokens = list(tokenize('x "open'))
+    assert tokens[-1].kind == TokenKind.ERROR
+    assert tokens[-1].val == "open"
+
+
 def test_parser_simple():
     qasm = """
     OPENQASM 2.0;
@@ -137,6 +171,33 @@ def test_custom_gate():
     )
 
 
+def test_streaming_interpreter():
+    from mimiqcircuits.qasm.parser import iterparseopenqasm
+
+    qasm = """
+    OPENQASM 2.0;
+    include "qelib1.inc";
+    gate outer(t) a, b { inner(t) a; cx a, b; }
+    gate inner(t) a { rz(t/2) a; }
+    qreg q[2];
+    creg c[2];
+    outer(pi) q[0], q[1];
+    measure q -> c;
+    outer(0.5) q[1], q[0];
+    """
+    c = loads(qasm)
+    assert str(c) == str(interpreter.interpret(parseopenqasm(qasm)))
+    assert len(c) == 4
+
+    # statements are parsed only as they are consumed
+    version, statements = iterparseopenqasm(qasm)
+    assert version == 2.0
+    assert next(statements).head == "include"
+    first = next(s for s in statements if s.head != "gate")
+    assert first.head == "qreg"
+    assert next(statements).head == "creg"
+
+
 def test_load_dump_file(tmp_path):
     qasm = """OPENQASM 2.0;
     include "qelib1.inc";
@@ -160,6 +221,74 @@ def test_load_dump_file(tmp_path):
     assert "x q[0]" in content
 
 
+def test_include_cache(tmp_path, monkeypatch):
+    import os
+
+    from mimiqcircuits.qasm import parser
+
+    prog = 'OPENQASM 2.0;\ninclude "lib.inc";\nqreg q[1];\nmine q[0];\n'
+    inc = tmp_path / "lib.inc"
+    inc.write_text("gate mine a { x a; }\n")
+
+    c1 = loads(prog, includedirs=[str(tmp_path)])
+    c2 = loads(prog, includedirs=[str(tmp_path)])
+    # the compiled declaration is shared by every program
+    assert c1.instructions[0].operation.decl is c2.instructions[0].operation.decl
+
+    # edits to the include are picked up through its modification time
+    inc.write_text("gate mine a { y a; }\n")
+    st = os.stat(inc)
+    os.utime(inc, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+    c3 = loads(prog, includedirs=[str(tmp_path)])
+    body = c3.instructions[0].operation.decl.circuit
+    assert isinstance(body.instructions[0].operation, mc.GateY)
+
+    # on-disk cache: a fresh process state loads the pickled statements
+    monkeypatch.setattr(parser, "PARSED_INCLUDES", {})
+    monkeypatch.setattr(parser, "INCLUDE_CACHE_DIR", None)
+    parser.set_include_cache_dir(str(tmp_path / "cache"))
+    loads(prog, includedirs=[str(tmp_path)])
+    assert len(os.listdir(tmp_path / "cache")) == 1
+
+    parser.PARSED_INCLUDES.clear()
+
+    def fail(*args):
+        raise AssertionError("include parsed again")
+
+    monkeypatch.setattr(parser, "_parse_include_source", fail)
+    c4 = loads(prog, includedirs=[str(tmp_path)])
+    assert len(c4) == 1
+
+
+def test_dump_streams_to_file_object(tmp_path):
+    import io
+
+    c = mc.Circuit()
+    c.push(mc.GateH(), 0)
+    c.push(mc.Control(2, mc.GateRY(0.3)), 0, 1, 2)
+    for i in range(3 * serializer.WRITE_BATCH):
+        c.push(mc.GateRX(0.1 * i), i % 3)
+    c.push(mc.Measure(), 2, 0)
+
+    def norm(qasm):
+        # declaration names carry an object id
+        return re.sub(r"_[0-9a-f]{6,}\b", "_id", qasm)
+
+    buf = io.StringIO()
+    dump(c, buf)
+    text = norm(buf.getvalue())
+    # the streamed output is the one of the statement tree
+    ref = io.StringIO()
+    serializer.print_qasm_expr(serializer.circuit_to_qasm(c), ref)
+    assert text == norm(ref.getvalue())
+
+    path = tmp_path / "stream.qasm"
+    with open(path, "w") as f:
+        dump(c, f)
+    assert norm(path.read_text()) == text
+    assert len(load(str(path))) == len(c)
+
+
 # QASM roundtrip test for circuits with wrapper gates
 def test_dump_load_roundtrip(tmp_path):
     c = mc.Circuit()
@@ -0,0 +1,159 @@
+import random
+
+import numpy as np
+import pytest
+
+import mimiqcircuits as mc
+from mimiqcircuits.backends import StabilizerBackend
+from mimiqcircuits.backends.stabilizer import PauliFrameSampler, StabilizerProgram
+
+
+_CLIFFORDS_1Q = [mc.GateH, mc.GateS, mc.GateSDG, mc.GateSX, mc.GateSY, mc.GateX, mc.GateZ]
+_CLIFFORDS_2Q = [mc.GateCX, mc.GateCZ, mc.GateCY, mc.GateSWAP, mc.GateISWAP, mc.GateECR]
+
+
+def _random_clifford_circuit(rng, nq=4, n=40, noise=True):
+    c = mc.Circuit()
+    nb = 0
+    for _ in range(n):
+        kind = rng.randrange(10)
+        if kind < 4:
+            c.push(rng.choice(_CLIFFORDS_1Q)(), rng.randrange(nq))
+        elif kind < 7:
+            a, b = rng.sample(range(nq), 2)
+            c.push(rng.choice(_CLIFFORDS_2Q)(), a, b)
+        elif kind == 7 and noise:
+            c.push(mc.Depolarizing1(0.1), rng.randrange(nq))
+        elif kind == 8:
+            meas = rng.choice([mc.Measure, mc.MeasureX, mc.MeasureY, mc.MeasureReset])
+            c.push(meas(), rng.randrange(nq), nb)
+            nb += 1
+        else:
+            c.push(rng.choice([mc.Reset, mc.ResetX, mc.ResetY])(), rng.randrange(nq))
+    for q in range(nq):
+        c.push(mc.Measure(), q, nb + q)
+    return c
+
+
+def test_frame_sampler_matches_tableau_trajectories():
+    """Bit marginals and pairwise parities of the frame sampler agree with
+    shot-by-shot tableau simulation."""
+    gen = random.Random(11)
+    backend = StabilizerBackend()
+    shots = 1500
+    for trial in range(3):
+        c = _random_clifford_circuit(gen)
+        frames = PauliFrameSampler(c).sample(shots, rng=np.random.default_rng(trial))
+
+        compiled = backend.compile(c)
+        rng = random.Random(trial)
+        tableau = np.array(
+            [
+                list(backend.evolve(backend.build_state(c.num_qubits(), c.num_bits()),
+                                    compiled, rng=rng)[0].classical_bits)
+                for _ in range(shots)
+            ],
+            dtype=bool,
+        )
+        assert np.allclose(frames.mean(axis=0), tableau.mean(axis=0), atol=0.08)
+        pf = (frames[:, :, None] ^ frames[:, None, :]).mean(axis=0)
+        pt = (tableau[:, :, None] ^ tableau[:, None, :]).mean(axis=0)
+        assert np.allclose(pf, pt, atol=0.08)
+
+
+def test_deterministic_circuits_and_detectors():
+    c = mc.Circuit()
+    # GHZ state: all parities deterministic, each bit random
+    c.push(mc.GateH(), 0)
+    c.push(mc.GateCX(), 0, 1)
+    c.push(mc.GateCX(), 1, 2)
+    for q in range(3):
+        c.push(mc.Measure(), q, q)
+    c.push(mc.Detector(2), 0, 1)
+    c.push(mc.Detector(2), 1, 2)
+    c.push(mc.ObservableInclude(1, [0]), 0)
+    c.push(mc.ObservableInclude(1, [0]), 2)
+
+    sampler = PauliFrameSampler(c)
+    assert (sampler.num_detectors, sampler.num_observables) == (2, 1)
+    bits = sampler.sample(2000, rng=np.random.default_rng(0))
+    assert (bits[:, 0] == bits[:, 1]).all() and (bits[:, 1] == bits[:, 2]).all()
+    assert 0.4 < bits[:, 0].mean() < 0.6
+    detectors, observables = sampler.sample_detectors(2000, rng=1)
+    assert detectors.shape == (2000, 2) and not detectors.any()
+    assert observables.shape == (2000, 1) and not observables.any()
+
+
+def test_detector_rates_under_noise():
+    # repetition code: an X error on data qubit 1 flips both detectors
+    p = 0.05
+    c = mc.Circuit()
+    c.push(mc.PauliX(p), 1)
+    c.push(mc.GateCX(), 0, 3)
+    c.push(mc.GateCX(), 1, 3)
+    c.push(mc.GateCX(), 1, 4)
+    c.push(mc.GateCX(), 2, 4)
+    c.push(mc.Measure(), 3, 0)
+    c.push(mc.Measure(), 4, 1)
+    c.push(mc.Detector(1), 0)
+    c.push(mc.Detector(1), 1)
+
+    detectors, _ = StabilizerBackend().sample_detectors(c, 200000, seed=3)
+    assert abs(detectors[:, 0].mean() - p) < 0.005
+    assert (detectors[:, 0] == detectors[:, 1]).all()
+
+
+def test_stabilizer_backend_execute():
+    c = mc.Circuit()
+    c.push(mc.GateX(), 0)
+    c.push(mc.Measure(), 0, 0)
+    c.push(mc.Reset(), 0)
+    c.push(mc.Measure(), 0, 1)
+    c.push(mc.GateH(), 1)
+    c.push(mc.Measure(), 1, 2)
+
+    res = StabilizerBackend().execute(c, nsamples=500, seed=2)
+    assert len(res.cstates) == 500
+    assert all(s[0] == 1 and s[1] == 0 for s in res.cstates)
+    assert 0.4 < np.mean([s[2] for s in res.cstates]) < 0.6
+
+    # no classical register: every qubit is reported
+    bell = mc.Circuit().push(mc.GateH(), 0).push(mc.GateCX(), 0, 1)
+    res = StabilizerBackend().execute(bell, nsamples=200, seed=2)
+    assert {repr(s) for s in res.cstates} <= {'bs"00"', 'bs"11"'}
+
+
+def test_stabilizer_rejects_non_clifford():
+    c = mc.Circuit().push(mc.GateT(), 0)
+    with pytest.raises(ValueError):
+        StabilizerProgram(c)
+    c = mc.Circuit().push(mc.AmplitudeDamping(0.1), 0)
+    with pytest.raises(ValueError):
+        StabilizerProgram(c)
+
+
+def test_custom_cliffords_do_not_share_tables():
+    s = mc.GateCustom(np.diag([1, 1j]))
+    x = mc.GateCustom(np.array([[0, 1], [1, 0]]))
+    backend = StabilizerBackend()
+
+    c = mc.Circuit().push(mc.GateH(), 0).push(s, 0).push(mc.Measure(), 0, 0)
+    backend.execute(c, nsamples=10, seed=1)
+
+    c = mc.Circuit().push(x, 0).push(mc.Measure(), 0, 0)
+    res = backend.execute(c, nsamples=50, seed=1)
+    assert all(r[0] == 1 for r in res.cstates)
+
+    # wrappers differ by their arguments, not by their type
+    c = mc.Circuit().push(mc.GateX(), 0).push(mc.GateCX(), 0, 1)
+    c.push(mc.Control(1, x), 0, 2).push(mc.Measure(), 1, 0).push(mc.Measure(), 2, 1)
+    res = backend.execute(c, nsamples=50, seed=1)
+    assert all(r[0] == 1 and r[1] == 1 for r in res.cstates)
+
+
+def test_stabilizer_rejects_classical_control():
+    c = mc.Circuit()
+    c.push(mc.Measure(), 0, 0)
+    c.push(mc.IfStatement(mc.GateX(), mc.BitString("1")), 0, 0)
+    with pytest.raises(ValueError, match="does not support"):
+        StabilizerBackend().execute(c, nsamples=3)
@@ -0,0 +1,124 @@
+import pytest
+from symengine import pi
+
+import mimiqcircuits as mc
+from mimiqcircuits.stim import dump, dumps, load, loads
+
+
+MEMORY = """\
+QUBIT_COORDS(1, 0) 1
+QUBIT_COORDS(3, 0) 3
+R 0 1 2 3 4
+TICK
+CX 0 1 2 3 2 1 4 3
+MR 1 3
+DETECTOR(1, 0) rec[-2]
+DETECTOR(3, 0) rec[-1]
+REPEAT {rounds} {{
+    X_ERROR(0.01) 0 2 4
+    DEPOLARIZE2(0.001) 0 1
+    TICK
+    CX 0 1 2 3 2 1 4 3
+    MR 1 3
+    SHIFT_COORDS(0, 1)
+    DETECTOR(1, 0) rec[-2] rec[-4]
+    DETECTOR(3, 0) rec[-1] rec[-3]
+}}
+M 0 2 4
+DETECTOR(1, 1) rec[-2] rec[-3] rec[-5]
+DETECTOR(3, 1) rec[-1] rec[-2] rec[-4]
+OBSERVABLE_INCLUDE(0) rec[-1]
+"""
+
+
+def _unrolled(rounds):
+    head, rest = MEMORY.split("REPEAT {rounds} {{\n")
+    body, tail = rest.split("}}\n")
+    return head + body.replace("    ", "") * rounds + tail
+
+
+@pytest.mark.parametrize("rounds", [1, 2, 5, 6])
+def test_stim_roundtrip_memory_experiment(rounds):
+    text = MEMORY.format(rounds=rounds)
+    c = loads(text)
+    assert any(isinstance(inst.operation, mc.Repeat) for inst in c)
+    assert dumps(c) == text
+
+    # the REPEAT block reads the previous round exactly like the unrolled one
+    expected = mc.detector_error_model(loads(_unrolled(rounds)))
+    assert str(mc.detector_error_model(c)) == str(expected)
+
+
+def test_stim_loads_operations():
+    c = loads(
+        """
+        # comment
+        cnot 0 1  # aliases are accepted
+        SQRT_X_DAG 2
+        Z_ERROR(0.125) 0 1
+        DEPOLARIZE1(0.5) 2
+        MY 0
+        RX 1
+        OBSERVABLE_INCLUDE(3) rec[-1]
+        TICK
+        """
+    )
+    ops = [inst.operation for inst in c]
+    assert [type(op) for op in ops] == [
+        mc.GateCX,
+        mc.GateSXDG,
+        mc.PauliZ,
+        mc.PauliZ,
+        type(mc.Depolarizing1(0.5)),
+        mc.MeasureY,
+        mc.ResetX,
+        mc.ObservableInclude,
+        mc.Tick,
+    ]
+    assert ops[7].notes == [3]
+    assert c.num_bits() == 1
+
+
+def test_stim_dumps_decomposes_and_repeats():
+    c = mc.Circuit()
+    c.push(mc.GateRZ(pi / 2), 0)
+    c.push(mc.GateDCX(), 0, 1)
+    c.push(mc.Repeat(3, mc.GateH()), 1)
+    c.push(mc.Barrier(2), 0, 1)
+    c.push(mc.Measure(), 0, 0)
+    assert dumps(c) == "S 0\nCX 0 1 1 0\nREPEAT 3 {\n    H 1\n}\nM 0\n"
+
+    with pytest.raises(ValueError, match="cannot be written in Stim"):
+        dumps(mc.Circuit().push(mc.GateT(), 0))
+
+
+def test_stim_repeat_without_measurements_reads_earlier_record():
+    # a body that measures nothing reads the same record in every iteration
+    c = loads("M 0\nREPEAT 3 {\n    DETECTOR rec[-1]\n}")
+    assert dumps(c) == "M 0\nREPEAT 3 {\n    DETECTOR rec[-1]\n}\n"
+    # the writer halves repeated bodies into this shape
+    text = "M 0\nREPEAT 1 {\n    DETECTOR rec[-1]\n    DETECTOR rec[-1]\n}\n"
+    assert dumps(loads(dumps(loads(text)))) == dumps(loads(text))
+
+
+def test_stim_errors():
+    with pytest.raises(ValueError, match="line 1: unsupported instruction MPP"):
+        loads("MPP X0*X1")
+    with pytest.raises(ValueError, match="unterminated"):
+        loads("REPEAT 2 {\nH 0\n")
+    # reading two iterations back cannot be kept in classical bits
+    with pytest.raises(ValueError, match="line 5: rec\\[-3\\]"):
+        loads("M 0\nM 0\nREPEAT 3 {\n    M 0\n    DETECTOR rec[-3]\n}")
+
+    c = mc.Circuit()
+    c.push(mc.Detector(1), 0)
+    with pytest.raises(ValueError, match="before any measurement"):
+        dumps(c)
+
+
+def test_stim_load_dump_file(tmp_path):
+    text = MEMORY.format(rounds=4)
+    path = tmp_path / "memory.stim"
+    dump(loads(text), str(path))
+    assert path.read_text() == text
+    assert dumps(load(str(path))) == text